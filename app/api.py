@@ -0,0 +1,420 @@
+"""
+Async HTTP API over ingest → pipeline → storage, for programmatic use and for running the
+Streamlit UI as a thin client (API_URL).
+
+    python -m app.api                          # http://127.0.0.1:8080, docs at /docs
+    python -m app.api --workers 4 --host 0.0.0.0
+
+- POST /jobs: multipart upload (files + title/text/meeting_id/mode fields), streamed part by part
+  straight into the job directory, never held in memory; answers 202 with the job id
+- GET /jobs/{id}, GET /meetings, GET /meetings/{id}, /meetings/{id}/transcript,
+  /meetings/{id}/related, /meetings/{id}/export?format=md|json, GET /search, action items
+- Limits: API_MAX_UPLOAD_MB per request body, API_MAX_FILES per job, API_MAX_TEXT_MB per form field
+- Backpressure: 429 once API_MAX_QUEUED_JOBS jobs are queued or running (all processes),
+  503 when API_MAX_CONCURRENT_UPLOADS uploads are already being received (per process) and
+  none finishes within a couple of seconds; both with Retry-After
+- Worker processes (--workers) share the SQLite DB (WAL, busy timeout) and the job table: each
+  runs JOB_WORKERS job threads, and jobs are claimed atomically, so any process may run any job
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import asyncio
+import argparse
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
+from pydantic import BaseModel
+from python_multipart.multipart import MultipartParser, parse_options_header
+
+from app.core import jobs, metrics, storage
+
+load_dotenv()
+
+_RETRY_AFTER_SECONDS = 5
+_UPLOAD_SLOT_WAIT_SECONDS = 2  # an upload waits this long for a free slot before a 503
+
+
+def _limits() -> Dict[str, int]:
+    return {
+        "upload_bytes": int(float(os.getenv("API_MAX_UPLOAD_MB", "500")) * 1024 * 1024),
+        "files": int(os.getenv("API_MAX_FILES", "20")),
+        "field_bytes": int(float(os.getenv("API_MAX_TEXT_MB", "10")) * 1024 * 1024),
+        "queued_jobs": int(os.getenv("API_MAX_QUEUED_JOBS", "100")),
+        "uploads": int(os.getenv("API_MAX_CONCURRENT_UPLOADS", "8")),
+    }
+
+
+def _reject(status: int, reason: str, detail: str) -> HTTPException:
+    metrics.inc("api_rejections_total", reason=reason)
+    headers = {"Retry-After": str(_RETRY_AFTER_SECONDS)} if status in (429, 503) else None
+    return HTTPException(status, detail, headers=headers)
+
+
+# --- Streaming multipart upload ---
+class _UploadWriter:
+    """
+    Callbacks for python_multipart's MultipartParser: file parts are written to the job
+    directory as their bytes arrive, other fields are collected (up to field_bytes each).
+    """
+
+    def __init__(self, job_dir: str, limits: Dict[str, int]):
+        self.job_dir = job_dir
+        self.limits = limits
+        self.fields: Dict[str, str] = {}
+        self.files: List[str] = []
+        self._headers: Dict[bytes, bytes] = {}
+        self._header_field = b""
+        self._header_value = b""
+        self._name = ""
+        self._file = None
+        self._buf: Optional[bytearray] = None
+
+    def callbacks(self) -> Dict[str, Any]:
+        return {
+            "on_part_begin": self._part_begin,
+            "on_header_field": self._header_field_data,
+            "on_header_value": self._header_value_data,
+            "on_header_end": self._header_end,
+            "on_headers_finished": self._headers_finished,
+            "on_part_data": self._part_data,
+            "on_part_end": self._part_end,
+        }
+
+    def _part_begin(self):
+        self._headers, self._header_field, self._header_value = {}, b"", b""
+
+    def _header_field_data(self, data: bytes, start: int, end: int):
+        self._header_field += data[start:end]
+
+    def _header_value_data(self, data: bytes, start: int, end: int):
+        self._header_value += data[start:end]
+
+    def _header_end(self):
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field, self._header_value = b"", b""
+
+    def _headers_finished(self):
+        _, params = parse_options_header(self._headers.get(b"content-disposition", b""))
+        self._name = params.get(b"name", b"").decode("utf-8", "replace")
+        filename = params.get(b"filename")
+        if filename is None:
+            self._buf = bytearray()
+            return
+        if len(self.files) >= self.limits["files"]:
+            raise _reject(413, "too_many_files", f"At most {self.limits['files']} files per job")
+        name = os.path.basename(filename.decode("utf-8", "replace").replace("\\", "/")) or f"upload-{len(self.files)}"
+        self._file = open(jobs.upload_path(self.job_dir, len(self.files), name), "wb")
+        self.files.append(name)
+
+    def _part_data(self, data: bytes, start: int, end: int):
+        if self._file is not None:
+            self._file.write(data[start:end])
+            return
+        self._buf += data[start:end]
+        if len(self._buf) > self.limits["field_bytes"]:
+            raise _reject(413, "field_too_large", f"Field {self._name!r} is larger than API_MAX_TEXT_MB")
+
+    def _part_end(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        elif self._buf is not None:
+            self.fields[self._name] = self._buf.decode("utf-8", "replace")
+            self._buf = None
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+_FORM_TYPES = (b"multipart/form-data", b"application/x-www-form-urlencoded", b"application/json")
+
+
+async def _small_body_fields(request: Request, ctype: bytes, limit: int) -> Dict[str, str]:
+    """Fields of a text-only submission (urlencoded form or JSON object), read up to `limit` bytes."""
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > limit:
+            raise _reject(413, "field_too_large", "Request body is larger than API_MAX_TEXT_MB")
+    if ctype == b"application/json":
+        try:
+            data = json.loads(body or b"{}")
+        except ValueError:
+            raise HTTPException(400, "Invalid JSON body") from None
+        if not isinstance(data, dict):
+            raise HTTPException(400, "Expected a JSON object")
+        return {k: "" if v is None else str(v) for k, v in data.items()}
+    return {k: v[-1] for k, v in parse_qs(body.decode("utf-8", "replace")).items()}
+
+
+def _job_fields(fields: Dict[str, str], n_files: int) -> Dict[str, Any]:
+    """Validated enqueue_job arguments from the form fields."""
+    text = fields.get("text", "")
+    if not n_files and not text.strip():
+        raise HTTPException(400, "Upload at least one file or send transcript text")
+    meeting_id = fields.get("meeting_id", "").strip()
+    if meeting_id and not meeting_id.isdigit():
+        raise HTTPException(400, "meeting_id must be an integer")
+    mode = fields.get("mode", "append").strip() or "append"
+    if mode not in jobs.UPDATE_MODES:
+        raise HTTPException(400, f"mode must be one of {', '.join(jobs.UPDATE_MODES)}")
+    if meeting_id and not storage.get_meeting(int(meeting_id)):
+        raise HTTPException(404, f"Meeting {meeting_id} not found")
+    return {
+        "title": (fields.get("title") or "").strip() or "Untitled Meeting",
+        "text_input": text,
+        "meeting_id": int(meeting_id) if meeting_id else None,
+        "mode": mode,
+    }
+
+
+# --- App ---
+_uploads: Optional[asyncio.Semaphore] = None
+
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    global _uploads
+    _uploads = asyncio.Semaphore(_limits()["uploads"])
+    storage.init_db()
+    jobs.start_workers()
+    yield
+
+
+app = FastAPI(title="AI Meeting Summarizer API", lifespan=_lifespan)
+
+
+class _Metrics:
+    """ASGI middleware: api_request_seconds{route} and api_requests_total{route,status}."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        start = time.perf_counter()
+        status = [500]
+
+        async def send_status(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_status)
+        finally:
+            route = getattr(scope.get("route"), "path", "unmatched")
+            metrics.observe("api_request_seconds", time.perf_counter() - start, route=route)
+            metrics.inc("api_requests_total", route=route, status=status[0])
+
+
+app.add_middleware(_Metrics)
+
+
+@app.post("/jobs", status_code=202)
+async def create_job(request: Request):
+    """
+    Queue a meeting (new, or an update of `meeting_id`) from streamed multipart uploads and/or
+    text. Text-only jobs may also be sent as an urlencoded form or a JSON object.
+    """
+    limits = _limits()
+    length = request.headers.get("content-length")
+    if length and length.isdigit() and int(length) > limits["upload_bytes"]:
+        raise _reject(413, "too_large", "Request body is larger than API_MAX_UPLOAD_MB")
+    ctype, params = parse_options_header(request.headers.get("content-type", ""))
+    if ctype not in _FORM_TYPES or (ctype == _FORM_TYPES[0] and not params.get(b"boundary")):
+        raise _reject(415, "unsupported", "Expected a multipart/form-data, urlencoded or JSON body")
+    if await run_in_threadpool(jobs.queue_depth) >= limits["queued_jobs"]:
+        raise _reject(429, "queue_full", "Too many jobs queued; retry later")
+    try:
+        await asyncio.wait_for(_uploads.acquire(), _UPLOAD_SLOT_WAIT_SECONDS)
+    except asyncio.TimeoutError:
+        raise _reject(503, "busy", "Too many uploads in progress; retry later") from None
+
+    try:
+        job_id, job_dir = await run_in_threadpool(jobs.new_job)
+        writer = _UploadWriter(job_dir, limits)
+        received = 0
+        try:
+            if ctype == _FORM_TYPES[0]:
+                parser = MultipartParser(params[b"boundary"], writer.callbacks())
+                async for chunk in request.stream():
+                    received += len(chunk)
+                    if received > limits["upload_bytes"]:
+                        raise _reject(413, "too_large", "Request body is larger than API_MAX_UPLOAD_MB")
+                    if chunk:
+                        await run_in_threadpool(parser.write, chunk)
+                parser.finalize()
+                writer.close()
+            else:
+                writer.fields = await _small_body_fields(request, ctype, limits["field_bytes"])
+            fields = await run_in_threadpool(_job_fields, writer.fields, len(writer.files))
+            await run_in_threadpool(jobs.enqueue_job, job_id, **fields)
+        except BaseException:
+            writer.close()
+            shutil.rmtree(job_dir, ignore_errors=True)
+            raise
+    finally:
+        _uploads.release()
+    metrics.inc("api_upload_bytes_total", received)
+    return JSONResponse(
+        {"job_id": job_id, "status_url": f"/jobs/{job_id}", "files": writer.files},
+        status_code=202,
+        headers={"Location": f"/jobs/{job_id}"},
+    )
+
+
+@app.get("/jobs/{job_id}")
+def read_job(job_id: str):
+    job = jobs.get_job(job_id)
+    if not job:
+        raise HTTPException(404, "Job not found")
+    return job
+
+
+@app.get("/meetings")
+def list_meetings(
+    limit: int = Query(50, ge=1, le=500),
+    before_created_at: Optional[str] = None,
+    before_id: Optional[int] = None,
+):
+    """Newest first; pass the last row's created_at/id as before_* for the next page."""
+    before = (before_created_at, before_id) if before_created_at and before_id is not None else None
+    return storage.list_meetings(limit=limit, before=before)
+
+
+def _meeting_or_404(meeting_id: int, with_transcript: bool = False) -> Dict[str, Any]:
+    meeting = storage.get_meeting(meeting_id, with_transcript=with_transcript)
+    if not meeting:
+        raise HTTPException(404, "Meeting not found")
+    return meeting
+
+
+@app.get("/meetings/{meeting_id}")
+def read_meeting(meeting_id: int, transcript: bool = False):
+    return _meeting_or_404(meeting_id, with_transcript=transcript)
+
+
+@app.get("/meetings/{meeting_id}/transcript", response_class=PlainTextResponse)
+def read_transcript(meeting_id: int):
+    _meeting_or_404(meeting_id)
+    return storage.get_transcript(meeting_id)
+
+
+@app.get("/meetings/{meeting_id}/related")
+def related(meeting_id: int, limit: int = Query(5, ge=1, le=50)):
+    m = _meeting_or_404(meeting_id)
+    return storage.related_meetings(f"{m['title']}\n{m['summary']}", limit=limit, exclude_meeting_id=meeting_id)
+
+
+def meeting_markdown(m: Dict[str, Any]) -> str:
+    """A saved meeting as a Markdown document."""
+    lines = [f"# {m['title']}", "", f"_{m['created_at']}_", "", "## Summary", "", m["summary"] or "—", ""]
+    for header, key in (("Key Decisions", "decisions"), ("Important Dates", "important_dates"), ("Other Notes", "other_notes")):
+        if m.get(key):
+            lines += [f"## {header}", ""] + [f"- {v}" for v in m[key]] + [""]
+    lines += ["## Action Items", ""]
+    items = m.get("action_items") or []
+    if items:
+        lines += ["| Assignee | Task | Due | Status |", "|---|---|---|---|"]
+        for a in items:
+            cells = [a.get("assignee") or "—", a.get("task") or "—", a.get("due_date") or "—", a.get("status") or "open"]
+            lines.append("| " + " | ".join(str(c).replace("|", "\\|") for c in cells) + " |")
+    else:
+        lines.append("None.")
+    if m.get("transcript"):
+        lines += ["", "## Transcript", "", "```", m["transcript"], "```"]
+    return "\n".join(lines) + "\n"
+
+
+@app.get("/meetings/{meeting_id}/export")
+def export_meeting(
+    meeting_id: int,
+    format: str = Query("md", pattern="^(md|json)$"),
+    transcript: bool = True,
+):
+    """Download a meeting as Markdown or JSON (with the transcript unless transcript=false)."""
+    m = _meeting_or_404(meeting_id, with_transcript=transcript)
+    headers = {"Content-Disposition": f'attachment; filename="meeting-{meeting_id}.{format}"'}
+    if format == "json":
+        return JSONResponse(m, headers=headers)
+    return Response(meeting_markdown(m), media_type="text/markdown; charset=utf-8", headers=headers)
+
+
+@app.get("/search")
+def search(
+    q: str = Query(..., min_length=1, max_length=500),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    semantic: bool = False,
+):
+    """Ranked keyword search; semantic=true searches by meaning instead (no offset)."""
+    if semantic:
+        return storage.related_meetings(q, limit=limit)
+    return storage.search_meetings(q, limit=limit, offset=offset)
+
+
+@app.get("/action-items")
+def action_items(assignee: Optional[str] = None, overdue: bool = False):
+    if overdue:
+        return [i for i in storage.overdue_action_items() if assignee is None or i["assignee"] == assignee]
+    return storage.list_action_items(assignee=assignee)
+
+
+@app.get("/assignees")
+def assignees():
+    return storage.list_assignees()
+
+
+class StatusUpdate(BaseModel):
+    status: str
+
+
+@app.patch("/action-items/{item_id}")
+def update_action_item(item_id: int, body: StatusUpdate):
+    if body.status not in storage.ACTION_ITEM_STATUSES:
+        raise HTTPException(400, f"status must be one of {', '.join(storage.ACTION_ITEM_STATUSES)}")
+    if not storage.set_action_item_status(item_id, body.status):
+        raise HTTPException(404, "Action item not found")
+    return {"id": item_id, "status": body.status}
+
+
+@app.get("/health")
+def health():
+    return {"status": "ok", "queue_depth": jobs.queue_depth(), "pid": os.getpid()}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def read_metrics():
+    """Prometheus text for the process that answers (each worker process keeps its own metrics)."""
+    return metrics.to_prometheus()
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--host", default=os.getenv("API_HOST", "127.0.0.1"))
+    ap.add_argument("--port", type=int, default=int(os.getenv("API_PORT", "8080")))
+    ap.add_argument("--workers", type=int, default=int(os.getenv("API_WORKERS", "1")), help="server processes")
+    args = ap.parse_args(argv)
+
+    import uvicorn
+
+    uvicorn.run("app.api:app", host=args.host, port=args.port, workers=args.workers)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
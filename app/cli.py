@@ -0,0 +1,238 @@
+"""
+Headless batch mode: summarize whole directories (or a manifest) of transcripts without the UI.
+
+    python -m app.cli archive/                          # every supported file, saved to the DB
+    python -m app.cli archive/ --recursive --workers 8
+    python -m app.cli --manifest backfill.jsonl --jsonl out.jsonl
+    python -m app.cli --compact-db                      # maintenance: shrink the DB (see storage.compact_db)
+    python -m app.cli --rebuild-semantic-index          # maintenance: re-embed all meetings (see semantic.py)
+
+- Reuses ingest → pipeline → storage; never imports Streamlit, so startup stays fast
+- Each file becomes one meeting (title = manifest "title" or the file name)
+- Manifest: one path per line, or JSON lines {"path", "title"?, "created_at"?}
+- Resumable: content hashes of finished files are appended to a checkpoint file and skipped
+  on the next run (failed files and LLM error fallbacks are not checkpointed, so they retry)
+- At most --workers files are in flight; LLM and OCR/whisper concurrency keep their own limits
+"""
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+
+from app.core.storage import DB_PATH, compact_db, init_db, rebuild_semantic_index, save_meeting_result
+from app.core.ingest import AUDIO_EXTENSIONS, LocalUpload, extract_uploads, shutdown_pools
+from app.core.pipeline import summarize_and_extract, initial_segments, is_error_result
+from app.core import metrics, resources
+
+SUPPORTED_EXTENSIONS = (".txt", ".pdf", ".docx") + AUDIO_EXTENSIONS
+DEFAULT_CHECKPOINT = os.path.join(os.path.dirname(DB_PATH), "batch_checkpoint.jsonl")
+
+
+def file_hash(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def collect_inputs(paths: List[str], manifest: Optional[str], recursive: bool) -> List[Dict[str, Any]]:
+    """Expand directories and manifest lines into [{"path", "title", "created_at"}], sorted per directory."""
+    items: List[Dict[str, Any]] = []
+    for p in paths:
+        if os.path.isdir(p):
+            walker = os.walk(p) if recursive else [(p, [], os.listdir(p))]
+            for root, _, names in walker:
+                for name in sorted(names):
+                    if name.lower().endswith(SUPPORTED_EXTENSIONS):
+                        items.append({"path": os.path.join(root, name)})
+        else:
+            items.append({"path": p})
+    if manifest:
+        base = os.path.dirname(os.path.abspath(manifest))
+        with open(manifest, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                entry = json.loads(line) if line.startswith("{") else {"path": line}
+                entry["path"] = os.path.join(base, os.path.expanduser(entry["path"]))
+                items.append(entry)
+    return items
+
+
+def load_checkpoint(path: str) -> Set[str]:
+    done: Set[str] = set()
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    done.add(json.loads(line)["hash"])
+                except (ValueError, KeyError):
+                    continue  # a line cut off by a crash
+    return done
+
+
+class _Sink:
+    """Serializes checkpoint and JSONL appends from the worker threads; each line is flushed."""
+
+    def __init__(self, checkpoint: str, jsonl: Optional[str]):
+        os.makedirs(os.path.dirname(os.path.abspath(checkpoint)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._checkpoint = open(checkpoint, "a", encoding="utf-8")
+        self._jsonl = open(jsonl, "a", encoding="utf-8") if jsonl else None
+
+    def write(self, record: Dict[str, Any], result: Optional[Dict[str, Any]]):
+        with self._lock:
+            if self._jsonl is not None and result is not None:
+                self._jsonl.write(json.dumps(result, ensure_ascii=False) + "\n")
+                self._jsonl.flush()
+            self._checkpoint.write(json.dumps(record) + "\n")
+            self._checkpoint.flush()
+
+    def close(self):
+        self._checkpoint.close()
+        if self._jsonl is not None:
+            self._jsonl.close()
+
+
+def process_file(item: Dict[str, Any], to_db: bool) -> Dict[str, Any]:
+    """Ingest → summarize → save (or serialize) one file. Returns the result as a JSON-ready dict."""
+    path = item["path"]
+    title = item.get("title") or os.path.splitext(os.path.basename(path))[0]
+    extracted = extract_uploads([LocalUpload(path)])[0]
+    if extracted["error"]:
+        raise RuntimeError(extracted["error"])
+    if not extracted["text"].strip():
+        raise RuntimeError("no text extracted")
+
+    result = summarize_and_extract(title=title, transcript=extracted["text"])
+    if is_error_result(result):
+        raise RuntimeError(result.summary)
+    if item.get("created_at"):
+        result.created_at = item["created_at"]
+
+    out = result.model_dump(mode="json")
+    out["source"] = path
+    if to_db:
+        out["meeting_id"] = save_meeting_result(result, initial_segments(result.transcript, result))
+    return out
+
+
+def run_batch(
+    items: List[Dict[str, Any]],
+    workers: int,
+    checkpoint: str,
+    jsonl: Optional[str] = None,
+    force: bool = False,
+) -> Dict[str, int]:
+    """Process `items` with bounded parallelism; prints one progress line per file."""
+    to_db = jsonl is None
+    if to_db:
+        init_db()
+    done_hashes = set() if force else load_checkpoint(checkpoint)
+
+    # Hash up front so resumed runs report an accurate total and skip without extracting anything
+    todo, skipped, seen = [], 0, set()
+    for item in items:
+        if not os.path.isfile(item["path"]):
+            print(f"⚠️ Not found: {item['path']}")
+            continue
+        item["hash"] = file_hash(item["path"])
+        if item["hash"] in done_hashes or item["hash"] in seen:
+            skipped += 1
+            continue
+        seen.add(item["hash"])
+        todo.append(item)
+    print(f"📦 {len(todo)} file(s) to process, {skipped} already done")
+
+    stats = {"done": 0, "failed": 0, "skipped": skipped}
+    total_bytes = 0
+    sink = _Sink(checkpoint, jsonl)
+    start = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="batch") as pool:
+            futures = {pool.submit(process_file, item, to_db): item for item in todo}
+            for n, fut in enumerate(as_completed(futures), start=1):
+                item = futures[fut]
+                name = os.path.basename(item["path"])
+                try:
+                    out = fut.result()
+                except Exception as e:
+                    stats["failed"] += 1
+                    metrics.inc("batch_files_total", status="failed")
+                    print(f"⚠️ [{n}/{len(todo)}] {name}: {e}")
+                    continue
+                stats["done"] += 1
+                total_bytes += os.path.getsize(item["path"])
+                metrics.inc("batch_files_total", status="done")
+                record = {
+                    "hash": item["hash"],
+                    "path": item["path"],
+                    "meeting_id": out.get("meeting_id"),
+                    "at": datetime.utcnow().isoformat(),
+                }
+                sink.write(record, None if to_db else out)
+                elapsed = time.perf_counter() - start
+                print(
+                    f"✅ [{n}/{len(todo)}] {name} — {stats['done'] / elapsed:.2f} files/s, "
+                    f"{total_bytes / elapsed / 1e6:.2f} MB/s"
+                )
+    finally:
+        sink.close()
+        shutdown_pools()
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"🏁 {stats['done']} done, {stats['failed']} failed, {stats['skipped']} skipped "
+        f"in {elapsed:.1f}s ({stats['done'] / elapsed if elapsed else 0:.2f} files/s)"
+    )
+    return stats
+
+
+def main(argv=None) -> int:
+    load_dotenv()
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("paths", nargs="*", help="files or directories to summarize")
+    ap.add_argument("--manifest", help="file listing inputs (paths or JSON lines)")
+    ap.add_argument("--recursive", "-r", action="store_true", help="descend into subdirectories")
+    ap.add_argument("--workers", type=int, default=int(os.getenv("BATCH_WORKERS", "4")),
+                    help="files processed at once (default: BATCH_WORKERS or 4)")
+    ap.add_argument("--jsonl", help="append results to this JSONL file instead of saving them to the DB")
+    ap.add_argument("--checkpoint", help="checkpoint file (default: <jsonl>.checkpoint, or data/batch_checkpoint.jsonl)")
+    ap.add_argument("--force", action="store_true", help="ignore the checkpoint and process every file")
+    ap.add_argument("--compact-db", action="store_true",
+                    help="drop unused transcript blobs, recompress them with TRANSCRIPT_CODEC, VACUUM, and exit")
+    ap.add_argument("--rebuild-semantic-index", action="store_true",
+                    help="re-embed every meeting into a fresh semantic index, and exit")
+    args = ap.parse_args(argv)
+
+    if args.compact_db:
+        compact_db()
+        return 0
+    if args.rebuild_semantic_index:
+        rebuild_semantic_index()
+        return 0
+    if not args.paths and not args.manifest:
+        ap.error("give at least one path or --manifest")
+    items = collect_inputs(args.paths, args.manifest, args.recursive)
+    resources.warm_up_from_env()
+    checkpoint = args.checkpoint or (args.jsonl + ".checkpoint" if args.jsonl else DEFAULT_CHECKPOINT)
+    stats = run_batch(items, args.workers, checkpoint, jsonl=args.jsonl, force=args.force)
+    if os.getenv("METRICS_JSON_PATH"):
+        metrics.dump_json()
+    return 1 if stats["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
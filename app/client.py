@@ -0,0 +1,118 @@
+"""
+HTTP client for the API (app/api.py) with the same function names as app.core.storage / jobs,
+so the Streamlit page can run as a thin client: with API_URL set, app/main.py imports these
+instead and never opens the DB, loads models or starts job workers itself.
+"""
+import os
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple, Union
+
+import httpx
+
+# Mirrors app.core.jobs.STAGES (importing jobs would pull in the whole pipeline).
+STAGES = ["ingest", "summarize", "save"]
+
+_client: Optional[httpx.Client] = None
+
+
+def _http() -> httpx.Client:
+    global _client
+    if _client is None:
+        _client = httpx.Client(
+            base_url=os.getenv("API_URL", "http://127.0.0.1:8080").rstrip("/"),
+            timeout=float(os.getenv("API_TIMEOUT", "60")),
+        )
+    return _client
+
+
+def _get(path: str, **params) -> Any:
+    resp = _http().get(path, params={k: v for k, v in params.items() if v is not None})
+    resp.raise_for_status()
+    return resp.json()
+
+
+def _get_or_empty(path: str, **params) -> Any:
+    """Like _get, but {} for a 404 (storage.get_meeting / jobs.get_job return {} for unknown ids)."""
+    resp = _http().get(path, params={k: v for k, v in params.items() if v is not None})
+    if resp.status_code == 404:
+        return {}
+    resp.raise_for_status()
+    return resp.json()
+
+
+def list_meetings(limit: int = 50, before: Optional[Tuple[str, int]] = None) -> List[Dict[str, Any]]:
+    before_created_at, before_id = before if before else (None, None)
+    return _get("/meetings", limit=limit, before_created_at=before_created_at, before_id=before_id)
+
+
+def get_meeting(meeting_id: int, with_transcript: bool = False) -> Dict[str, Any]:
+    return _get_or_empty(f"/meetings/{meeting_id}", transcript=str(with_transcript).lower())
+
+
+def get_transcript(meeting_id: int) -> str:
+    resp = _http().get(f"/meetings/{meeting_id}/transcript")
+    return resp.text if resp.status_code == 200 else ""
+
+
+def search_meetings(query: str, limit: int = 20, offset: int = 0) -> List[Dict[str, Any]]:
+    return _get("/search", q=query, limit=limit, offset=offset)
+
+
+def related_meetings(text: str, limit: int = 10, exclude_meeting_id: Optional[int] = None) -> List[Dict[str, Any]]:
+    if exclude_meeting_id is not None:
+        return _get(f"/meetings/{exclude_meeting_id}/related", limit=limit)
+    return _get("/search", q=text[:500], limit=limit, semantic="true")
+
+
+def list_action_items(assignee: Optional[str] = None) -> List[Dict[str, Any]]:
+    return _get("/action-items", assignee=assignee)
+
+
+def overdue_action_items() -> List[Dict[str, Any]]:
+    return _get("/action-items", overdue="true")
+
+
+def list_assignees() -> List[Dict[str, Any]]:
+    return _get("/assignees")
+
+
+def set_action_item_status(item_id: int, status: str) -> bool:
+    resp = _http().patch(f"/action-items/{item_id}", json={"status": status})
+    if resp.status_code == 404:
+        return False
+    resp.raise_for_status()
+    return True
+
+
+def export_meeting(meeting_id: int, fmt: str = "md") -> bytes:
+    resp = _http().get(f"/meetings/{meeting_id}/export", params={"format": fmt})
+    resp.raise_for_status()
+    return resp.content
+
+
+def submit_job(
+    title: str,
+    files: List[Tuple[str, Union[bytes, BinaryIO]]],
+    text_input: str = "",
+    meeting_id: Optional[int] = None,
+    mode: str = "append",
+) -> str:
+    """
+    POST /jobs as a streamed multipart body. Raises RuntimeError with the server's message when
+    the job is refused (limits, backpressure: 413/429/503) or invalid.
+    """
+    data = {"title": title, "text": text_input, "mode": mode}
+    if meeting_id is not None:
+        data["meeting_id"] = str(meeting_id)
+    resp = _http().post("/jobs", data=data, files=[("files", (name, f)) for name, f in files] or None)
+    if resp.status_code != 202:
+        try:
+            detail = resp.json().get("detail")
+        except ValueError:
+            detail = resp.text
+        retry = resp.headers.get("retry-after")
+        raise RuntimeError(f"{detail} (HTTP {resp.status_code})" + (f", retry in {retry}s" if retry else ""))
+    return resp.json()["job_id"]
+
+
+def get_job(job_id: str) -> Dict[str, Any]:
+    return _get_or_empty(f"/jobs/{job_id}")
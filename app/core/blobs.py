@@ -0,0 +1,128 @@
+import os
+import zlib
+import hashlib
+import sqlite3
+from typing import Optional, Tuple
+
+from . import metrics, resources
+
+# Content-addressed, compressed text blobs (meeting transcripts) in the `transcript_blobs` table:
+# - key = sha256 of the UTF-8 text, so the same transcript saved twice is stored once
+# - codec per blob (zstd | zlib | none), so blobs written with different settings stay readable
+# - TRANSCRIPT_CODEC picks the codec for new blobs; "auto" = zstd when the `zstandard`
+#   package is installed, else zlib (stdlib)
+CODECS = ("zstd", "zlib", "none")
+_ZSTD_LEVEL = 9
+_ZLIB_LEVEL = 9
+
+
+def _zstd():
+    return resources.optional_import("zstandard")
+
+
+def codec() -> str:
+    """Codec for new blobs (TRANSCRIPT_CODEC, default auto)."""
+    name = os.getenv("TRANSCRIPT_CODEC", "auto").strip().lower()
+    if name == "auto":
+        return "zstd" if _zstd() is not None else "zlib"
+    if name not in CODECS:
+        raise ValueError(f"TRANSCRIPT_CODEC must be one of auto, {', '.join(CODECS)} (got {name!r})")
+    if name == "zstd" and _zstd() is None:
+        print("⚠️ TRANSCRIPT_CODEC=zstd but the zstandard package is not installed; using zlib")
+        return "zlib"
+    return name
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def compress(text: str, name: Optional[str] = None) -> Tuple[str, bytes]:
+    """Text → (codec, bytes) with `name` or the configured codec."""
+    name = name or codec()
+    raw = text.encode("utf-8")
+    if name == "zstd":
+        return name, _zstd().ZstdCompressor(level=_ZSTD_LEVEL).compress(raw)
+    if name == "zlib":
+        return name, zlib.compress(raw, _ZLIB_LEVEL)
+    return "none", raw
+
+
+def decompress(name: str, data: bytes) -> str:
+    if name == "zstd":
+        zstd = _zstd()
+        if zstd is None:
+            raise RuntimeError("This transcript is zstd-compressed; install the zstandard package to read it")
+        raw = zstd.ZstdDecompressor().decompress(data)
+    elif name == "zlib":
+        raw = zlib.decompress(data)
+    else:
+        raw = data
+    return raw.decode("utf-8")
+
+
+def put(con: sqlite3.Connection, text: str) -> Optional[str]:
+    """Store `text` (if not stored yet) and return its hash; None for an empty text. Call inside a transaction."""
+    if not text:
+        return None
+    key = content_hash(text)
+    if con.execute("SELECT 1 FROM transcript_blobs WHERE hash = ?", (key,)).fetchone():
+        metrics.inc("transcript_blobs_total", dedup="true")
+        return key
+    name, data = compress(text)
+    con.execute(
+        "INSERT INTO transcript_blobs (hash, codec, size, data) VALUES (?, ?, ?, ?)",
+        (key, name, len(text.encode("utf-8")), data),
+    )
+    metrics.inc("transcript_blobs_total", dedup="false")
+    metrics.inc("transcript_bytes_total", len(text.encode("utf-8")), form="raw")
+    metrics.inc("transcript_bytes_total", len(data), form="stored")
+    return key
+
+
+def get(con: sqlite3.Connection, key: Optional[str]) -> str:
+    """Text of a blob ("" for no hash or a missing blob)."""
+    if not key:
+        return ""
+    row = con.execute("SELECT codec, data FROM transcript_blobs WHERE hash = ?", (key,)).fetchone()
+    return decompress(row[0], row[1]) if row else ""
+
+
+def release(con: sqlite3.Connection, key: Optional[str]):
+    """Delete a blob once no meeting refers to it any more. Call inside a transaction."""
+    if key:
+        con.execute(
+            "DELETE FROM transcript_blobs WHERE hash = ? "
+            "AND NOT EXISTS (SELECT 1 FROM meeting_transcripts WHERE hash = ?)",
+            (key, key),
+        )
+
+
+def collect_garbage(con: sqlite3.Connection) -> int:
+    """Delete every blob no meeting refers to; returns how many. Call inside a transaction."""
+    return con.execute(
+        "DELETE FROM transcript_blobs WHERE hash NOT IN "
+        "(SELECT hash FROM meeting_transcripts WHERE hash IS NOT NULL)"
+    ).rowcount
+
+
+def recompress(con: sqlite3.Connection, batch: int = 200) -> int:
+    """
+    Rewrite blobs stored with another codec than the configured one (e.g. zlib → zstd after
+    installing zstandard); returns how many. Commits every `batch` blobs.
+    """
+    target = codec()
+    done = 0
+    while True:
+        rows = con.execute(
+            "SELECT hash, codec, data FROM transcript_blobs WHERE codec != ? LIMIT ?", (target, batch)
+        ).fetchall()
+        if not rows:
+            return done
+        with con:
+            for key, name, data in rows:
+                con.execute(
+                    "UPDATE transcript_blobs SET codec = ?, data = ? WHERE hash = ?",
+                    (*compress(decompress(name, data), target), key),
+                )
+        done += len(rows)
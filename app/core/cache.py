@@ -0,0 +1,222 @@
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+from contextlib import contextmanager
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from .storage import DB_PATH
+from . import metrics
+
+CACHE_DB_PATH = os.path.join(os.path.dirname(DB_PATH), "llm_cache.db")
+
+
+def normalize_transcript(transcript: str) -> str:
+    """Whitespace-insensitive form of a transcript, so re-uploads of the same text hash equally."""
+    return " ".join(transcript.split())
+
+
+def prompt_version(*prompts: str) -> str:
+    """Short content hash of the prompt text; editing a prompt invalidates old entries."""
+    return hashlib.sha256("\x00".join(prompts).encode("utf-8")).hexdigest()[:16]
+
+
+def cache_key(transcript: str, prompt_ver: str, model: str, params: Dict[str, Any]) -> str:
+    """Content address for a summarization request."""
+    h = hashlib.sha256()
+    h.update(normalize_transcript(transcript).encode("utf-8"))
+    h.update(b"\x00" + prompt_ver.encode("utf-8"))
+    h.update(b"\x00" + model.encode("utf-8"))
+    h.update(b"\x00" + json.dumps(params, sort_keys=True).encode("utf-8"))
+    return h.hexdigest()
+
+
+class ResultCache:
+    """
+    Persistent SQLite cache for LLM summary results:
+    - TTL expiry and an entry cap (least-recently-used rows are evicted first)
+    - hit/miss/coalesced counters for this process
+    - in-flight coalescing: concurrent identical requests share one upstream call
+    """
+
+    def __init__(self, path: str = CACHE_DB_PATH, ttl_seconds: float = 7 * 24 * 3600, max_entries: int = 5000):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self._connect() as con:
+            con.execute("PRAGMA journal_mode=WAL")
+            con.execute(
+                """
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL,
+                    hit_count INTEGER NOT NULL DEFAULT 0
+                )
+                """
+            )
+            con.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_last_access ON llm_cache(last_access)")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """A connection for one operation: committed (or rolled back) and closed on exit."""
+        con = sqlite3.connect(self.path, timeout=10)
+        try:
+            with con:
+                yield con
+        finally:
+            con.close()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._connect() as con:
+            row = con.execute(
+                "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row and now - row[1] <= self.ttl_seconds:
+                con.execute(
+                    "UPDATE llm_cache SET last_access = ?, hit_count = hit_count + 1 WHERE key = ?",
+                    (now, key),
+                )
+                return json.loads(row[0])
+        return None
+
+    def put(self, key: str, value: Dict[str, Any]):
+        now = time.time()
+        with self._connect() as con:
+            con.execute(
+                """
+                INSERT OR REPLACE INTO llm_cache (key, value, created_at, last_access, hit_count)
+                VALUES (?, ?, ?, ?, 0)
+                """,
+                (key, json.dumps(value), now, now),
+            )
+            self._evict(con, now)
+
+    def _evict(self, con: sqlite3.Connection, now: float):
+        con.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,))
+        con.execute(
+            """
+            DELETE FROM llm_cache WHERE key IN (
+                SELECT key FROM llm_cache ORDER BY last_access DESC LIMIT -1 OFFSET ?
+            )
+            """,
+            (self.max_entries,),
+        )
+
+    def claim(self, key: str) -> Tuple[Optional[Dict[str, Any]], Optional[Future], bool]:
+        """
+        Look `key` up and count it as a hit, miss or coalesced request. Returns:
+        - (value, None, False) on a hit
+        - (None, future, False) while another caller computes it: wait on the future
+        - (None, future, True) when this caller must compute it and then call settle()
+        """
+        value = self.get(key)
+        if value is not None:
+            with self._lock:
+                self.hits += 1
+            metrics.inc("cache_lookups_total", result="hit")
+            return value, None, False
+
+        with self._lock:
+            pending = self._inflight.get(key)
+            owner = pending is None
+            if owner:
+                pending = Future()
+                self._inflight[key] = pending
+                self.misses += 1
+            else:
+                self.coalesced += 1
+        metrics.inc("cache_lookups_total", result="miss" if owner else "coalesced")
+        return None, pending, owner
+
+    def settle(
+        self,
+        key: str,
+        pending: Future,
+        value: Optional[Dict[str, Any]] = None,
+        error: Optional[BaseException] = None,
+        cacheable: Callable[[Dict[str, Any]], bool] = lambda v: True,
+    ):
+        """Store the value of a claimed key (unless `error`) and hand it to the callers waiting on it."""
+        try:
+            if error is not None:
+                pending.set_exception(error)
+                return
+            if cacheable(value):
+                self.put(key, value)
+            pending.set_result(value)
+        except BaseException as e:
+            if not pending.done():
+                pending.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Dict[str, Any]],
+        cacheable: Callable[[Dict[str, Any]], bool] = lambda v: True,
+    ) -> Dict[str, Any]:
+        """
+        Return the cached value for `key`, or run `compute` once and store it.
+        Callers arriving while the same key is being computed wait for that result.
+        """
+        value, pending, owner = self.claim(key)
+        if value is not None:
+            return value
+        if not owner:
+            return pending.result()
+        try:
+            value = compute()
+        except BaseException as e:
+            self.settle(key, pending, error=e)
+            raise
+        self.settle(key, pending, value, cacheable=cacheable)
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        with self._connect() as con:
+            entries = con.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "entries": entries,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+    def clear(self):
+        with self._connect() as con:
+            con.execute("DELETE FROM llm_cache")
+
+
+_cache: Optional[ResultCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> Optional[ResultCache]:
+    """Process-wide result cache, or None when disabled via LLM_CACHE_ENABLED=0."""
+    global _cache
+    if os.getenv("LLM_CACHE_ENABLED", "1") == "0":
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResultCache(
+                ttl_seconds=float(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600))),
+                max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000")),
+            )
+        return _cache
@@ -0,0 +1,115 @@
+import re
+import zlib
+import hashlib
+from typing import List
+
+# Rough chars-per-token ratio for English transcripts (Llama tokenizers land ~3.5–4.5).
+CHARS_PER_TOKEN = 4
+
+# "Alice:", "Speaker 2:", "Mary Ann Lee:" — up to four capitalised words followed by a colon.
+_SPEAKER_RE = re.compile(r"(?:^|(?<=\s))[A-Z][\w'\-]*(?: [A-Z0-9][\w'\-]*){0,3}:\s")
+_FILE_HEADER_RE = re.compile(r"(?=^# File: )", re.MULTILINE)
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate used for chunk budgeting."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _split_on_speakers(line: str) -> List[str]:
+    """Split one line wherever a speaker label starts."""
+    starts = [m.start() for m in _SPEAKER_RE.finditer(line)]
+    if not starts or starts[0] != 0:
+        starts.insert(0, 0)
+    bounds = starts + [len(line)]
+    return [line[a:b].strip() for a, b in zip(bounds, bounds[1:])]
+
+
+def _split_turns(text: str) -> List[str]:
+    """
+    Split a transcript into speaker turns / segments.
+    Tries file headers, then line breaks, then inline "Name:" labels.
+    """
+    turns = []
+    for block in _FILE_HEADER_RE.split(text):
+        for line in block.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            turns.extend(t for t in _split_on_speakers(line) if t)
+    return turns
+
+
+def _split_oversized(turn: str, max_tokens: int) -> List[str]:
+    """Break a single turn that exceeds the budget on sentence, then word, boundaries."""
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    pieces, current = [], ""
+    for sentence in _SENTENCE_RE.split(turn):
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(" ", 0, max_chars)
+            cut = cut if cut > 0 else max_chars
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.append(sentence[:cut].strip())
+            sentence = sentence[cut:].strip()
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            pieces.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}".strip()
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def split_transcript(text: str, max_tokens: int) -> List[str]:
+    """
+    Pack speaker turns into chunks of at most ~max_tokens each.
+    Turns are never split unless a single turn is larger than the budget.
+    """
+    chunks, current, current_tokens = [], [], 0
+    for turn in _split_turns(text):
+        parts = [turn] if estimate_tokens(turn) <= max_tokens else _split_oversized(turn, max_tokens)
+        for part in parts:
+            n = estimate_tokens(part) + 1
+            if current and current_tokens + n > max_tokens:
+                chunks.append("\n".join(current))
+                current, current_tokens = [], 0
+            current.append(part)
+            current_tokens += n
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+def segment_transcript(text: str, target_tokens: int) -> List[str]:
+    """
+    Split a transcript into content-defined segments for incremental re-summarization.
+    A segment ends after a turn whose content hash hits 1-in-4 once it holds 3/4 of the target,
+    or before it would exceed 2×target. Boundaries depend only on nearby turns, so appending
+    or editing text changes the segments around the edit and leaves the rest (and their hashes) intact.
+    """
+    min_tokens, max_tokens = target_tokens * 3 // 4, target_tokens * 2
+    segments, current, current_tokens = [], [], 0
+    for turn in _split_turns(text):
+        parts = [turn] if estimate_tokens(turn) <= max_tokens else _split_oversized(turn, max_tokens)
+        for part in parts:
+            n = estimate_tokens(part) + 1
+            if current and current_tokens + n > max_tokens:
+                segments.append("\n".join(current))
+                current, current_tokens = [], 0
+            current.append(part)
+            current_tokens += n
+            if current_tokens >= min_tokens and zlib.crc32(part.encode("utf-8")) % 4 == 0:
+                segments.append("\n".join(current))
+                current, current_tokens = [], 0
+    if current:
+        segments.append("\n".join(current))
+    return segments
+
+
+def segment_hash(segment: str) -> str:
+    """Whitespace-insensitive content hash of a segment."""
+    return hashlib.sha256(" ".join(segment.split()).encode("utf-8")).hexdigest()
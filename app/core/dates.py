@@ -0,0 +1,115 @@
+import re
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+MONTHS = {
+    m: i + 1
+    for i, names in enumerate([
+        ("jan", "january"), ("feb", "february"), ("mar", "march"), ("apr", "april"),
+        ("may",), ("jun", "june"), ("jul", "july"), ("aug", "august"),
+        ("sep", "sept", "september"), ("oct", "october"), ("nov", "november"), ("dec", "december"),
+    ])
+    for m in names
+}
+
+_ISO_RE = re.compile(r"\b(\d{4})-(\d{1,2})-(\d{1,2})\b")
+_SLASH_RE = re.compile(r"\b(\d{1,2})/(\d{1,2})(?:/(\d{2,4}))?\b")
+_MONTH_DAY_RE = re.compile(r"\b([a-z]{3,9})\.?\s+(\d{1,2})(?:st|nd|rd|th)?(?:,?\s+(\d{4}))?\b")
+_DAY_MONTH_RE = re.compile(r"\b(\d{1,2})(?:st|nd|rd|th)?\s+(?:of\s+)?([a-z]{3,9})\.?(?:,?\s+(\d{4}))?\b")
+_IN_RE = re.compile(r"\bin\s+(\d+|a|one|two|three)\s+(day|week|month)s?\b")
+_NUMBER_WORDS = {"a": 1, "one": 1, "two": 2, "three": 3}
+
+
+def _safe_date(y: int, m: int, d: int) -> Optional[date]:
+    try:
+        return date(y, m, d)
+    except ValueError:
+        return None
+
+
+def _with_year(m: int, d: int, year: Optional[str], ref: date) -> Optional[date]:
+    """A month/day without a year means its next occurrence on or after the reference date."""
+    if year:
+        y = int(year)
+        return _safe_date(y + 2000 if y < 100 else y, m, d)
+    candidate = _safe_date(ref.year, m, d)
+    if candidate and candidate < ref:
+        candidate = _safe_date(ref.year + 1, m, d)
+    return candidate
+
+
+def _end_of_month(d: date) -> date:
+    first_next = date(d.year + (d.month == 12), d.month % 12 + 1, 1)
+    return first_next - timedelta(days=1)
+
+
+def parse_due_date(text: Optional[str], reference: Optional[date] = None) -> Optional[str]:
+    """
+    Best-effort conversion of an action item's due date to ISO "YYYY-MM-DD".
+    Relative phrases ("Friday", "next week", "in 2 days") resolve against `reference`
+    (normally the meeting date). Returns None when the text has no recognizable date.
+    """
+    if not text:
+        return None
+    s = text.strip().lower()
+    if not s or s in {"—", "-", "n/a", "none", "tbd", "unknown"}:
+        return None
+    ref = reference or date.today()
+
+    m = _ISO_RE.search(s)
+    if m:
+        d = _safe_date(int(m.group(1)), int(m.group(2)), int(m.group(3)))
+        return d.isoformat() if d else None
+
+    m = _SLASH_RE.search(s)
+    if m:
+        # US-style month/day, matching the transcripts we see
+        d = _with_year(int(m.group(1)), int(m.group(2)), m.group(3), ref)
+        if d:
+            return d.isoformat()
+
+    for regex, month_group, day_group in ((_MONTH_DAY_RE, 1, 2), (_DAY_MONTH_RE, 2, 1)):
+        for m in regex.finditer(s):
+            month = MONTHS.get(m.group(month_group))
+            if month:
+                d = _with_year(month, int(m.group(day_group)), m.group(3), ref)
+                if d:
+                    return d.isoformat()
+
+    if re.search(r"\b(today|eod|end of day|tonight)\b", s):
+        return ref.isoformat()
+    if "tomorrow" in s:
+        return (ref + timedelta(days=1)).isoformat()
+    if re.search(r"\b(end of (the )?week|eow)\b", s):
+        return (ref + timedelta(days=(4 - ref.weekday()) % 7)).isoformat()
+    if re.search(r"\b(end of (the )?month|eom)\b", s):
+        return _end_of_month(ref).isoformat()
+    if "next month" in s:
+        return _end_of_month(_end_of_month(ref) + timedelta(days=1)).isoformat()
+
+    m = _IN_RE.search(s)
+    if m:
+        n = _NUMBER_WORDS.get(m.group(1)) or int(m.group(1))
+        days = {"day": 1, "week": 7, "month": 30}[m.group(2)] * n
+        return (ref + timedelta(days=days)).isoformat()
+
+    for i, name in enumerate(WEEKDAYS):
+        if re.search(rf"\b{name[:3]}(?:{name[3:]})?\b", s):
+            ahead = (i - ref.weekday()) % 7 or 7
+            if re.search(rf"\bnext\s+{name[:3]}", s) and ahead < 7:
+                ahead += 7
+            return (ref + timedelta(days=ahead)).isoformat()
+
+    if "next week" in s:
+        # Monday of next week
+        return (ref + timedelta(days=7 - ref.weekday())).isoformat()
+    return None
+
+
+def reference_date(created_at: Optional[str]) -> date:
+    """Meeting date from a stored created_at ISO timestamp (today if missing/invalid)."""
+    try:
+        return datetime.fromisoformat(created_at).date()
+    except (TypeError, ValueError):
+        return date.today()
@@ -0,0 +1,228 @@
+import os
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from . import metrics
+
+# CPU-only speaker diarization for transcribed audio, in NumPy:
+# - embed(): a spectral speaker embedding per speech segment (MFCC and pitch statistics of voiced frames),
+#   computed where the audio is (the whisper workers), so samples never travel back
+# - Diarizer: online clustering in windows of DIARIZE_WINDOW_SECONDS; only per-speaker running
+#   sums and the current window are kept, so memory doesn't grow with the recording's length
+# - embeddings are standardized with running statistics of the recording and compared by cosine
+#   similarity (≥ DIARIZE_THRESHOLD: same speaker)
+# - at most DIARIZE_MAX_SPEAKERS speakers; segments too short to embed keep the previous speaker
+SAMPLE_RATE = 16000
+_WIN = 400          # 25 ms frames
+_HOP = 160          # 10 ms hop
+_N_FFT = 512
+_N_MELS = 40
+_N_MFCC = 20
+_MAX_EMBED_SECONDS = 10.0
+_MIN_LAG = SAMPLE_RATE // 400
+_MAX_LAG = SAMPLE_RATE // 70
+
+
+def settings() -> Dict[str, Any]:
+    return {
+        "enabled": os.getenv("DIARIZE", "1") != "0",
+        "max_speakers": max(1, int(os.getenv("DIARIZE_MAX_SPEAKERS", "8"))),
+        "threshold": float(os.getenv("DIARIZE_THRESHOLD", "0.3")),
+        "window_seconds": float(os.getenv("DIARIZE_WINDOW_SECONDS", "60")),
+        "min_segment_seconds": float(os.getenv("DIARIZE_MIN_SEGMENT_SECONDS", "0.8")),
+    }
+
+
+@lru_cache(maxsize=1)
+def _mel_filterbank() -> np.ndarray:
+    def hz_to_mel(f):
+        return 2595.0 * np.log10(1.0 + f / 700.0)
+
+    mels = np.linspace(hz_to_mel(60.0), hz_to_mel(SAMPLE_RATE / 2 - 400), _N_MELS + 2)
+    hz = 700.0 * (10 ** (mels / 2595.0) - 1.0)
+    bins = np.floor((_N_FFT + 1) * hz / SAMPLE_RATE).astype(int)
+    fb = np.zeros((_N_MELS, _N_FFT // 2 + 1), dtype=np.float32)
+    for m in range(1, _N_MELS + 1):
+        left, center, right = bins[m - 1], bins[m], bins[m + 1]
+        if center > left:
+            fb[m - 1, left:center] = (np.arange(left, center) - left) / (center - left)
+        if right > center:
+            fb[m - 1, center:right] = (right - np.arange(center, right)) / (right - center)
+    return fb
+
+
+@lru_cache(maxsize=1)
+def _dct_matrix() -> np.ndarray:
+    n = np.arange(_N_MELS)
+    k = np.arange(_N_MFCC)[:, None]
+    return (np.cos(np.pi * k * (2 * n + 1) / (2 * _N_MELS)) * np.sqrt(2.0 / _N_MELS)).astype(np.float32)
+
+
+def embed(samples: np.ndarray) -> Optional[np.ndarray]:
+    """
+    Speaker embedding of one speech segment (16 kHz mono float32): mean and standard deviation
+    of MFCCs 1–19 and of the log pitch over its voiced frames (the quietest 30% are dropped as pauses).
+    Long segments use their middle _MAX_EMBED_SECONDS. None if the segment is too short.
+    """
+    max_len = int(_MAX_EMBED_SECONDS * SAMPLE_RATE)
+    if len(samples) > max_len:
+        start = (len(samples) - max_len) // 2
+        samples = samples[start:start + max_len]
+    if len(samples) < _WIN + 10 * _HOP:
+        return None
+    frames = np.lib.stride_tricks.sliding_window_view(np.asarray(samples, dtype=np.float32), _WIN)[::_HOP]
+    frames = frames * np.hanning(_WIN).astype(np.float32)
+    power = np.abs(np.fft.rfft(frames, n=_N_FFT)) ** 2
+    logmel = np.log(power @ _mel_filterbank().T + 1e-8)
+    energy = logmel.mean(axis=1)
+    is_voiced = energy >= np.percentile(energy, 30)
+    mfcc = logmel[is_voiced] @ _dct_matrix().T
+    # pitch: autocorrelation peak (inverse FFT of the power spectrum) in the 70–400 Hz lag range
+    autocorr = np.fft.irfft(power[is_voiced], n=_N_FFT)[:, _MIN_LAG:_MAX_LAG]
+    log_f0 = np.log(SAMPLE_RATE / (_MIN_LAG + autocorr.argmax(axis=1)))
+    return np.concatenate([
+        mfcc[:, 1:].mean(axis=0), mfcc[:, 1:].std(axis=0), [log_f0.mean(), log_f0.std()],
+    ]).astype(np.float32)
+
+
+def _unit(x: np.ndarray) -> np.ndarray:
+    return x / np.maximum(np.linalg.norm(x, axis=-1, keepdims=True), 1e-8)
+
+
+def _agglomerate(z: np.ndarray, threshold: float) -> np.ndarray:
+    """Average-linkage clustering of unit vectors by cosine similarity; returns a cluster id per row."""
+    labels = np.arange(len(z))
+    sums = z.copy()
+    counts = np.ones(len(z))
+    active = np.ones(len(z), dtype=bool)
+    while active.sum() > 1:
+        idx = np.flatnonzero(active)
+        centroids = _unit(sums[idx] / counts[idx, None])
+        sim = centroids @ centroids.T
+        np.fill_diagonal(sim, -np.inf)
+        a, b = np.unravel_index(np.argmax(sim), sim.shape)
+        if sim[a, b] < threshold:
+            break
+        keep, drop = idx[a], idx[b]
+        sums[keep] += sums[drop]
+        counts[keep] += counts[drop]
+        active[drop] = False
+        labels[labels == drop] = keep
+    return labels
+
+
+class Diarizer:
+    """
+    Streaming speaker labelling. feed() segments ({"start", "end", "text", "embedding"?}) in order;
+    labelled segments (with "speaker": 1, 2, ...) come back once their window is complete,
+    flush() returns the rest.
+    """
+
+    def __init__(
+        self,
+        max_speakers: int = 8,
+        threshold: float = 0.3,
+        window_seconds: float = 60.0,
+        min_segment_seconds: float = 0.8,
+    ):
+        self.max_speakers = max_speakers
+        self.threshold = threshold
+        self.window_seconds = window_seconds
+        self.min_segment_seconds = min_segment_seconds
+        self._window: List[Dict[str, Any]] = []
+        self._sums: List[np.ndarray] = []      # raw embedding sum per speaker
+        self._counts: List[int] = []
+        self._n = 0                            # running mean/variance of all embeddings (Welford)
+        self._mean: Optional[np.ndarray] = None
+        self._m2: Optional[np.ndarray] = None
+        self._last_speaker = 1
+
+    def _update_stats(self, x: np.ndarray):
+        for row in x:
+            self._n += 1
+            if self._mean is None:
+                self._mean, self._m2 = row.astype(np.float64), np.zeros_like(row, dtype=np.float64)
+                continue
+            delta = row - self._mean
+            self._mean += delta / self._n
+            self._m2 += delta * (row - self._mean)
+
+    def _standardize(self, x: np.ndarray) -> np.ndarray:
+        std = np.sqrt(self._m2 / max(1, self._n - 1)) if self._n > 1 else np.ones_like(self._mean)
+        return _unit((x - self._mean) / np.maximum(std, 1e-3))
+
+    def _assign(self, z: np.ndarray, raw: np.ndarray) -> List[int]:
+        """Cluster one window, then match each cluster to its closest known speaker or add a new one."""
+        _, local = np.unique(_agglomerate(z, self.threshold), return_inverse=True)
+        centroids = _unit(np.stack([z[local == c].mean(axis=0) for c in range(local.max() + 1)]))
+        if self._sums:
+            known = self._standardize(np.stack([s / n for s, n in zip(self._sums, self._counts)]))
+        else:
+            known = np.zeros((0, z.shape[1]))
+        speaker_of: Dict[int, int] = {}
+        for ci, centroid in enumerate(centroids):
+            sim = known @ centroid
+            if len(sim) and sim.max() >= self.threshold:
+                speaker_of[ci] = int(np.argmax(sim))
+            elif len(self._sums) < self.max_speakers:
+                self._sums.append(np.zeros(raw.shape[1]))
+                self._counts.append(0)
+                known = np.vstack([known, centroids[ci]])
+                speaker_of[ci] = len(self._sums) - 1
+                metrics.inc("diarize_speakers_total")
+            else:  # speaker budget used up: closest known speaker
+                speaker_of[ci] = int(np.argmax(sim))
+        out = []
+        for row, ci in zip(raw, local):
+            si = speaker_of[int(ci)]
+            self._sums[si] = self._sums[si] + row
+            self._counts[si] += 1
+            out.append(si + 1)
+        return out
+
+    def _process_window(self) -> List[Dict[str, Any]]:
+        segs, self._window = self._window, []
+        usable = [
+            i for i, s in enumerate(segs)
+            if s.get("embedding") is not None and s["end"] - s["start"] >= self.min_segment_seconds
+        ]
+        speakers: Dict[int, int] = {}
+        if usable:
+            with metrics.timer("diarize_window_seconds"):
+                raw = np.stack([np.asarray(segs[i]["embedding"], dtype=np.float64) for i in usable])
+                self._update_stats(raw)
+                speakers = dict(zip(usable, self._assign(self._standardize(raw), raw)))
+        out = []
+        for i, seg in enumerate(segs):
+            self._last_speaker = speakers.get(i, self._last_speaker)
+            seg = {k: v for k, v in seg.items() if k != "embedding"}
+            seg["speaker"] = self._last_speaker
+            out.append(seg)
+        return out
+
+    def feed(self, seg: Dict[str, Any]) -> List[Dict[str, Any]]:
+        self._window.append(seg)
+        if seg["end"] - self._window[0]["start"] >= self.window_seconds:
+            return self._process_window()
+        return []
+
+    def flush(self) -> List[Dict[str, Any]]:
+        return self._process_window() if self._window else []
+
+
+def diarize(segments: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """Label a stream of segments with speakers (see Diarizer), using the DIARIZE_* settings."""
+    cfg = settings()
+    diarizer = Diarizer(cfg["max_speakers"], cfg["threshold"], cfg["window_seconds"], cfg["min_segment_seconds"])
+    for seg in segments:
+        yield from diarizer.feed(seg)
+    yield from diarizer.flush()
+
+
+def format_timestamp(seconds: float) -> str:
+    """[mm:ss], or [h:mm:ss] from one hour on."""
+    s = int(seconds)
+    h, m, s = s // 3600, s % 3600 // 60, s % 60
+    return f"[{h}:{m:02d}:{s:02d}]" if h else f"[{m:02d}:{s:02d}]"
@@ -1,112 +1,400 @@
-import streamlit as st
-from typing import List
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 from io import BytesIO
+import os
 import tempfile
-import chardet
-from pypdf import PdfReader
-from docx import Document
-import tempfile
-import streamlit as st
+import threading
+import importlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import time
+
+from . import metrics, preprocess, resources, whisper_models
+
+
+# --- Heavy dependencies, loaded per format on first use (see resources.py) ---
+def _load_ocr():
+    """(convert_from_path, pytesseract), or None when the OCR tools are not installed."""
+    pdf2image, pytesseract = resources.optional_import("pdf2image"), resources.optional_import("pytesseract")
+    if pdf2image is None or pytesseract is None:
+        return None
+    return pdf2image.convert_from_path, pytesseract
+
+
+resources.register("chardet", lambda: importlib.import_module("chardet"))
+resources.register("pypdf", lambda: importlib.import_module("pypdf").PdfReader)
+resources.register("docx", lambda: importlib.import_module("docx").Document)
+resources.register("ocr", _load_ocr)
+
+
+# --- Shared process pool for CPU-bound work (OCR, large PDF parsing) ---
+_process_pool = None
+_process_pool_lock = threading.Lock()
+_thread_pool = None
+_audio_files = None
+
+
+def _process_workers() -> int:
+    return int(os.getenv("INGEST_PROCESS_WORKERS", "0")) or os.cpu_count() or 1
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """
+    Lazily create one process pool per server process, sized to the cores.
+    Uses 'spawn' so workers don't inherit the parent's threads/locks (Streamlit, LLM loop).
+    """
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(
+                max_workers=_process_workers(),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _process_pool
 
 
-# --- OCR imports (lazy) ---
-try:
-    from pdf2image import convert_from_bytes
-    import pytesseract
-except Exception as e:
-    convert_from_bytes = None
-    pytesseract = None
+AUDIO_EXTENSIONS = (".mp3", ".wav", ".m4a")
 
 
 # --- Utility functions ---
+class LocalUpload:
+    """A file on disk exposing the parts of Streamlit's UploadedFile used here (name, getvalue)."""
+
+    def __init__(self, path: str, name: Optional[str] = None):
+        self.path = path
+        self.name = name or os.path.basename(path)
+
+    def getvalue(self) -> bytes:
+        with open(self.path, "rb") as f:
+            return f.read()
+
+
 def _to_bytes(uploaded_file) -> bytes:
     """Convert a Streamlit UploadedFile to bytes."""
     return uploaded_file.getvalue()
 
 
 def _clean(text: str) -> str:
-    """Clean extracted text by normalizing spaces."""
-    return " ".join(text.replace("\r", " ").replace("\xa0", " ").split())
+    """Clean extracted text by normalizing spaces; line breaks (speaker turns) are kept, blank lines dropped."""
+    lines = text.replace("\r\n", "\n").replace("\r", "\n").replace("\xa0", " ").split("\n")
+    return "\n".join(" ".join(line.split()) for line in lines if line.strip())
 
 
 # --- Extractors for each file type ---
 def _extract_txt(file_bytes: bytes) -> str:
     """Extract text from plain text files."""
-    enc = chardet.detect(file_bytes).get("encoding") or "utf-8"
+    enc = resources.get("chardet").detect(file_bytes).get("encoding") or "utf-8"
     try:
         return file_bytes.decode(enc, errors="ignore")
     except Exception:
         return file_bytes.decode("utf-8", errors="ignore")
 
 
-def _extract_pdf(file_bytes: bytes) -> str:
+def _pdf_page_count(reader) -> int:
     """
-    Extract text from a PDF. Falls back to OCR if text is empty (for scanned PDFs).
+    Page count from the page tree root's /Count: only the xref and a few objects are read,
+    while len(reader.pages) would walk and flatten the whole page tree.
     """
-    buf = BytesIO(file_bytes)
-    reader = PdfReader(buf)
-    parts = []
-    for page in reader.pages:
+    try:
+        count = int(reader.trailer["/Root"]["/Pages"]["/Count"])
+        if count > 0:
+            return count
+    except Exception:
+        pass
+    return len(reader.pages)  # missing or broken /Count
+
+
+def _pdf_page_texts(path: str, start: int, stop: int) -> List[str]:
+    """Extract text for pages [start, stop) of the PDF at `path` (runs in a worker process)."""
+    return _reader_page_texts(resources.get("pypdf")(path), start, stop)
+
+
+def _reader_page_texts(reader, start: int, stop: int) -> List[str]:
+    """Text of pages [start, stop) from an open PdfReader; unreadable pages are empty."""
+    texts = []
+    for i in range(start, stop):
         try:
-            txt = page.extract_text() or ""
-            parts.append(txt)
+            texts.append(reader.pages[i].extract_text() or "")
         except Exception:
-            parts.append("")
-    text = "\n".join(parts)
+            texts.append("")
+    return texts
 
-    # OCR fallback only if no text and OCR tools are available
-    if not text.strip() and convert_from_bytes and pytesseract:
-        try:
-            images = convert_from_bytes(file_bytes)
-            ocr_text = [pytesseract.image_to_string(img, lang="eng") for img in images]
-            text = "\n".join(ocr_text)
-        except Exception as e:
-            print("⚠️ OCR failed:", e)
-    return text
+
+def _ocr_pdf_page(path: str, page_number: int, dpi: int, lang: str) -> str:
+    """
+    Rasterize and OCR a single (1-based) PDF page (runs in a worker process).
+    Only one page image is ever held in memory per worker.
+    """
+    try:
+        convert_from_path, pytesseract = resources.get("ocr")
+        images = convert_from_path(path, dpi=dpi, first_page=page_number, last_page=page_number)
+        text = "\n".join(pytesseract.image_to_string(img, lang=lang) for img in images)
+        for img in images:
+            img.close()
+        return text
+    except Exception as e:
+        print(f"⚠️ OCR failed on page {page_number}:", e)
+        return ""
+
+
+def _extract_pdf(file_bytes: bytes) -> str:
+    """
+    Extract text from a PDF, page by page.
+    - Large PDFs are parsed in page ranges across the process pool
+    - Pages with (almost) no extractable text are OCR'd individually (for scanned/mixed PDFs),
+      one page per task, so memory stays bounded regardless of page count
+    """
+    min_chars = int(os.getenv("OCR_MIN_PAGE_CHARS", "20"))
+    parallel_min_pages = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "40"))
+    dpi = int(os.getenv("OCR_DPI", "200"))
+    lang = os.getenv("OCR_LANG", "eng")
+
+    # Workers open the PDF by path, so bytes are written once instead of pickled per task.
+    with tempfile.NamedTemporaryFile(suffix=".pdf") as tmp:
+        tmp.write(file_bytes)
+        tmp.flush()
+
+        # Opened from the temp file; small PDFs are extracted with this same reader, large ones
+        # are only counted here and parsed in the workers
+        reader = resources.get("pypdf")(tmp.name)
+        n_pages = _pdf_page_count(reader)
+        if n_pages >= parallel_min_pages:
+            # ~2 ranges per worker keeps the pool busy without re-parsing the PDF too often
+            step = max(1, n_pages // (_process_workers() * 2))
+            ranges = [(start, min(start + step, n_pages)) for start in range(0, n_pages, step)]
+            pool = _get_process_pool()
+            futures = [pool.submit(_pdf_page_texts, tmp.name, a, b) for a, b in ranges]
+            texts = [t for f in futures for t in f.result()]
+        else:
+            texts = _reader_page_texts(reader, 0, n_pages)
+        del reader  # parsed objects are not needed during OCR
+
+        # Per-page OCR fallback only when OCR tools are available
+        needs_ocr = [i for i, t in enumerate(texts) if len(t.strip()) < min_chars]
+        if needs_ocr and resources.get("ocr"):
+            metrics.inc("ocr_pages_total", len(needs_ocr))
+            with metrics.timer("ocr_seconds"):
+                if len(needs_ocr) == 1:
+                    ocr_texts = [_ocr_pdf_page(tmp.name, needs_ocr[0] + 1, dpi, lang)]
+                else:
+                    pool = _get_process_pool()
+                    futures = [pool.submit(_ocr_pdf_page, tmp.name, i + 1, dpi, lang) for i in needs_ocr]
+                    ocr_texts = [f.result() for f in futures]
+            for i, ocr_text in zip(needs_ocr, ocr_texts):
+                if len(ocr_text.strip()) > len(texts[i].strip()):
+                    texts[i] = ocr_text
+
+    if preprocess.enabled():
+        texts = preprocess.strip_page_boilerplate(texts)
+    return "\n".join(texts)
 
 
 def _extract_docx(file_bytes: bytes) -> str:
     """Extract text from a Word document."""
     buf = BytesIO(file_bytes)
-    doc = Document(buf)
+    doc = resources.get("docx")(buf)
     return "\n".join([p.text for p in doc.paragraphs])
 
 
-@st.cache_resource(show_spinner=False)
-def _load_whisper_model():
+whisper_models.register_models()
+
+# --- Audio: chunked, parallel, streaming transcription ---
+AUDIO_SAMPLE_RATE = 16000
+
+
+def _audio_workers() -> int:
+    return int(os.getenv("AUDIO_TRANSCRIBE_WORKERS", "0")) or max(1, min(4, (os.cpu_count() or 2) // 2))
+
+
+def _init_audio_worker(cpu_threads: int):
     """
-    Load and cache the faster-whisper model so it's reused across runs.
-    The model is loaded once and stays in memory for later audio uploads.
+    Audio pool initializer: each worker registers its own model replicas (threads split
+    between workers) in its process-local registry and loads the primary one up front.
     """
-    from faster_whisper import WhisperModel
-    print("🎧 Loading Whisper model (base)...")
-    return WhisperModel("base", device="cpu", compute_type="int8")  # use 'tiny' for faster
+    whisper_models.register_models(cpu_threads, idle_ttl=0, num_workers=1)
+    # an exception here would break the whole pool; a failed preload just loads on first use
+    resources.warm_up([whisper_models.PRIMARY])
 
-def _transcribe_audio(file_bytes: bytes, filename: str) -> str:
+
+def _audio_worker_ready() -> bool:
+    return resources.is_loaded(whisper_models.PRIMARY)
+
+
+def _start_audio_pool() -> ProcessPoolExecutor:
     """
-    Transcribe audio using faster-whisper (cached model).
+    Separate pool for whisper: each worker holds its own model replica (AUDIO_TRANSCRIBE_WORKERS
+    replicas in total). Workers are started right away so their models load in the background.
     """
-    print(f"🎙️ Transcribing audio file: {filename}")
-    with tempfile.NamedTemporaryFile(delete=False, suffix=filename) as tmp:
-        tmp.write(file_bytes)
-        tmp_path = tmp.name
+    workers = _audio_workers()
+    threads = whisper_models.settings()["cpu_threads"] or max(1, (os.cpu_count() or 1) // workers)
+    pool = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_audio_worker,
+        initargs=(threads,),
+    )
+    for _ in range(workers):
+        pool.submit(_audio_worker_ready)
+    return pool
+
+
+# The pool is a resource too: PRELOAD_RESOURCES=whisper_pool starts it at startup, and it is
+# shut down (freeing every replica) after WHISPER_IDLE_TTL_SECONDS without long recordings.
+resources.register(
+    "whisper_pool",
+    _start_audio_pool,
+    lambda pool: pool.shutdown(wait=True, cancel_futures=True),
+    idle_ttl=whisper_models.settings()["idle_ttl"],
+)
 
-    model = _load_whisper_model()
-    segments, info = model.transcribe(tmp_path, beam_size=1)
 
-    transcript_lines = []
-    speaker_id = 1
-    last_end = 0.0
+def warm_up_audio_pool() -> int:
+    """Start the whisper worker processes and wait until their replicas are loaded; returns how many are ready."""
+    pool = resources.get("whisper_pool")
+    futures = [pool.submit(_audio_worker_ready) for _ in range(_audio_workers())]
+    return sum(f.result() for f in futures)
 
-    for seg in segments:
-        # alternate speakers when there's a gap >2s
-        if seg.start - last_end > 2.0:
-            speaker_id = 1 if speaker_id == 2 else 2
-        transcript_lines.append(f"Speaker {speaker_id}: {seg.text.strip()}")
-        last_end = seg.end
 
+def unload_models():
+    """Free the in-process whisper models and stop the worker processes holding replicas."""
+    for name in (whisper_models.PRIMARY, whisper_models.FAST, "whisper_pool"):
+        resources.unload(name)
+
+
+def shutdown_pools():
+    """Stop the ingest thread pool and the OCR/PDF and whisper process pools (e.g. before a short-lived process exits)."""
+    global _process_pool, _thread_pool
+    with _process_pool_lock:
+        for pool in (_thread_pool, _process_pool):
+            if pool is not None:
+                pool.shutdown(wait=True, cancel_futures=True)
+        _process_pool = _thread_pool = None
+    resources.unload("whisper_pool")
+
+
+def _segment(seg, samples, offset: float, embed: bool) -> Dict[str, Any]:
+    """Whisper segment → dict; with `embed`, adds the speaker embedding of its audio (samples start at `offset`)."""
+    out = {"start": seg.start + offset, "end": seg.end + offset, "text": seg.text.strip()}
+    if embed:
+        from . import diarize
+        out["embedding"] = diarize.embed(
+            samples[int(seg.start * AUDIO_SAMPLE_RATE):int(seg.end * AUDIO_SAMPLE_RATE)]
+        )
+    return out
+
+
+def _transcribe_chunk(samples, offset: float, model_key: str, beam_size: int, embed: bool = False) -> List[Dict[str, Any]]:
+    """Transcribe one audio chunk in a worker process; models are loaded once per worker."""
+    with whisper_models.model(model_key) as model:
+        segments, _ = model.transcribe(samples, beam_size=beam_size)
+        return [_segment(seg, samples, offset, embed) for seg in segments]
+
+
+def _split_audio(audio, max_chunk_seconds: float) -> List[Tuple[int, int]]:
+    """
+    Split decoded audio into [start, end) sample ranges of at most max_chunk_seconds,
+    cutting in the middle of VAD-detected silences (hard cut only if there is none).
+    """
+    total = len(audio)
+    max_len = int(max_chunk_seconds * AUDIO_SAMPLE_RATE)
+    if total <= max_len:
+        return [(0, total)]
+
+    try:
+        from faster_whisper.vad import get_speech_timestamps, VadOptions
+        speech = get_speech_timestamps(audio, VadOptions(min_silence_duration_ms=500))
+    except Exception as e:
+        print("⚠️ VAD failed, using fixed-length chunks:", e)
+        speech = []
+    gaps = [(a["end"] + b["start"]) // 2 for a, b in zip(speech, speech[1:])]
+
+    bounds = [0]
+    i = 0
+    while total - bounds[-1] > max_len:
+        limit = bounds[-1] + max_len
+        best = None
+        while i < len(gaps) and gaps[i] <= limit:
+            # don't cut so early that chunks become tiny
+            if gaps[i] > bounds[-1] + max_len // 2:
+                best = gaps[i]
+            i += 1
+        bounds.append(best or limit)
+    bounds.append(total)
+    return list(zip(bounds, bounds[1:]))
+
+
+def iter_transcribe_audio(
+    file_bytes: bytes,
+    filename: str,
+    progress: Optional[Callable[[float, float], None]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Transcribe audio and yield segments ({"start", "end", "text"}) in order as they are ready.
+    - Decodes straight from memory (no temp file)
+    - Long audio is split on silence and the chunks are transcribed in parallel worker processes
+    - With DIARIZE on, each segment also carries its speaker "embedding" (see diarize.embed),
+      computed next to the audio so the samples never travel back from the workers
+    - `progress(done_seconds, total_seconds)` is called as chunks complete
+    """
+    from faster_whisper.audio import decode_audio
+
+    print(f"🎙️ Transcribing audio file: {filename}")
+    start = time.perf_counter()
+    audio = decode_audio(BytesIO(file_bytes), sampling_rate=AUDIO_SAMPLE_RATE)
+    total_seconds = len(audio) / AUDIO_SAMPLE_RATE
+    metrics.inc("audio_seconds_total", total_seconds)
+    ranges = _split_audio(audio, float(os.getenv("AUDIO_CHUNK_SECONDS", "300")))
+
+    with whisper_models.track():
+        model_key = whisper_models.choose_model(total_seconds)
+        beam_size = whisper_models.beam_size()
+        from . import diarize
+        embed = diarize.settings()["enabled"]
+        if len(ranges) == 1:
+            # Short audio: stream segments straight from the cached in-process model
+            with whisper_models.model(model_key) as model:
+                segments, info = model.transcribe(audio, beam_size=beam_size)
+                for seg in segments:
+                    yield _segment(seg, audio, 0.0, embed)
+                    if progress:
+                        progress(min(seg.end, total_seconds), total_seconds)
+        else:
+            print(f"🎙️ {total_seconds:.0f}s of audio split into {len(ranges)} chunks")
+            with resources.use("whisper_pool") as pool:
+                futures = [
+                    pool.submit(_transcribe_chunk, audio[a:b], a / AUDIO_SAMPLE_RATE, model_key, beam_size, embed)
+                    for a, b in ranges
+                ]
+                del audio
+                for (a, b), future in zip(ranges, futures):
+                    yield from future.result()
+                    if progress:
+                        progress(b / AUDIO_SAMPLE_RATE, total_seconds)
+
+    metrics.observe("transcribe_seconds", time.perf_counter() - start)
     print(f"✅ Transcription complete ({filename})")
-    return "\n".join(transcript_lines)
+
+
+def iter_transcript_lines(segments: Iterator[Dict[str, Any]]) -> Iterator[str]:
+    """
+    Yield transcript lines "Speaker N: [mm:ss] text" with speakers from the diarization stage
+    (app.core.diarize); the segment start time stays in the line so summaries can cite it.
+    With DIARIZE=0: "[mm:ss] text", no speaker labels.
+    """
+    from . import diarize
+
+    if not diarize.settings()["enabled"]:
+        for seg in segments:
+            yield f"{diarize.format_timestamp(seg['start'])} {seg['text']}"
+        return
+    for seg in diarize.diarize(segments):
+        yield f"Speaker {seg['speaker']}: {diarize.format_timestamp(seg['start'])} {seg['text']}"
+
+
+def _transcribe_audio(file_bytes: bytes, filename: str) -> str:
+    """
+    Transcribe audio using faster-whisper (see iter_transcribe_audio).
+    """
+    return "\n".join(iter_transcript_lines(iter_transcribe_audio(file_bytes, filename)))
 
 # --- Main public functions ---
 def extract_text_from_upload(uploaded_file) -> str:
@@ -116,28 +404,144 @@ def extract_text_from_upload(uploaded_file) -> str:
     """
     name = (uploaded_file.name or "").lower()
     b = _to_bytes(uploaded_file)
+    file_type = os.path.splitext(name)[1].lstrip(".") or "other"
+    metrics.inc("ingest_files_total", type=file_type)
+    metrics.inc("ingest_bytes_total", len(b), type=file_type)
 
-    if name.endswith(".txt"):
-        raw = _extract_txt(b)
-    elif name.endswith(".pdf"):
-        raw = _extract_pdf(b)
-    elif name.endswith(".docx"):
-        raw = _extract_docx(b)
-    elif name.endswith((".mp3", ".wav", ".m4a")):
-        raw = _transcribe_audio(b, name)
-    else:
-        # Safe fallback
-        raw = _extract_txt(b)
+    with metrics.timer("ingest_seconds", type=file_type):
+        if name.endswith(".txt"):
+            raw = _extract_txt(b)
+        elif name.endswith(".pdf"):
+            raw = _extract_pdf(b)
+        elif name.endswith(".docx"):
+            raw = _extract_docx(b)
+        elif name.endswith(AUDIO_EXTENSIONS):
+            raw = _transcribe_audio(b, name)
+        else:
+            # Safe fallback
+            raw = _extract_txt(b)
 
     return _clean(raw)
 
 
-def extract_texts_from_uploads(files: List) -> str:
+# --- Concurrent multi-file ingest ---
+
+def _get_thread_pool() -> ThreadPoolExecutor:
+    """
+    Threads drive one file each: text/DOCX/PDF parsing runs in the thread, while OCR pages and
+    long-audio chunks are fanned out from there to the process pools above.
+    """
+    global _thread_pool, _audio_files
+    with _process_pool_lock:
+        if _thread_pool is None:
+            workers = int(os.getenv("INGEST_THREAD_WORKERS", "0")) or min(8, (os.cpu_count() or 1) + 2)
+            _thread_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ingest")
+            # whisper already uses every core for one file; more files at once just thrash
+            _audio_files = threading.Semaphore(max(1, int(os.getenv("INGEST_AUDIO_FILES", "1"))))
+        return _thread_pool
+
+
+class _MemoryBudget:
+    """
+    Caps the estimated bytes held by in-flight extractions.
+    A file larger than the whole budget still runs, but only once nothing else is in flight.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.used = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, n: int):
+        with self._cond:
+            self._cond.wait_for(lambda: self.used == 0 or self.used + n <= self.limit)
+            self.used += n
+
+    def release(self, n: int):
+        with self._cond:
+            self.used -= n
+            self._cond.notify_all()
+
+
+def _upload_size(f) -> int:
+    if isinstance(f, LocalUpload):
+        return os.path.getsize(f.path)
+    size = getattr(f, "size", None)  # Streamlit's UploadedFile
+    return size if isinstance(size, int) else len(f.getvalue())
+
+
+def _memory_cost(f) -> int:
+    """Rough peak memory of extracting `f`: decoded audio is several times the compressed file."""
+    size = _upload_size(f)
+    return size * 4 if (f.name or "").lower().endswith(AUDIO_EXTENSIONS) else size
+
+
+def extract_uploads(
+    files: List,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Extract several uploads concurrently.
+    - Returns one {"name", "text", "error", "seconds"} dict per file, in input order
+    - A failing file records its error instead of failing the batch
+    - In-flight work is bounded by INGEST_THREAD_WORKERS, INGEST_AUDIO_FILES and
+      INGEST_MEMORY_BUDGET_MB (estimated bytes held by running extractions)
+    - `progress(done, total)` is called as files finish
+    """
+    pool = _get_thread_pool()
+    budget = _MemoryBudget(int(float(os.getenv("INGEST_MEMORY_BUDGET_MB", "1024")) * 1024 * 1024))
+    done_count = [0]
+    lock = threading.Lock()
+
+    def run(f) -> Dict[str, Any]:
+        cost = _memory_cost(f)
+        is_audio = (f.name or "").lower().endswith(AUDIO_EXTENSIONS)
+        start = time.perf_counter()
+        budget.acquire(cost)
+        try:
+            if is_audio:
+                with whisper_models.track():  # waiting for an audio slot counts towards the queue depth
+                    _audio_files.acquire()
+                try:
+                    text = extract_text_from_upload(f)
+                finally:
+                    _audio_files.release()
+            else:
+                text = extract_text_from_upload(f)
+            result = {"name": f.name, "text": text, "error": None}
+        except Exception as e:
+            print(f"⚠️ Could not extract {f.name}:", e)
+            metrics.inc("ingest_errors_total")
+            result = {"name": f.name, "text": "", "error": f"{type(e).__name__}: {e}"}
+        finally:
+            budget.release(cost)
+        result["seconds"] = round(time.perf_counter() - start, 3)
+        if progress:
+            with lock:
+                done_count[0] += 1
+                progress(done_count[0], len(files))
+        return result
+
+    # Biggest files first so one large recording doesn't start last and set the total time
+    order = sorted(range(len(files)), key=lambda i: -_memory_cost(files[i]))
+    futures = {i: pool.submit(run, files[i]) for i in order}
+    return [futures[i].result() for i in range(len(files))]
+
+
+def extract_texts_from_uploads(
+    files: List,
+    progress: Optional[Callable[[int, int], None]] = None,
+    errors: Optional[List[str]] = None,
+) -> str:
     """
-    Handle multiple uploads — concatenate them in a readable way.
+    Handle multiple uploads — extract them concurrently and concatenate in upload order.
+    Files that fail are left out (and appended to `errors` when given); if every file
+    fails, a RuntimeError is raised.
     """
-    parts = []
-    for f in files:
-        text = extract_text_from_upload(f)
-        parts.append(f"# File: {f.name}\n{text}")
-    return "\n\n".join(parts)
+    results = extract_uploads(files, progress=progress)
+    failed = [f"{r['name']} ({r['error']})" for r in results if r["error"]]
+    if errors is not None:
+        errors.extend(failed)
+    if failed and len(failed) == len(results):
+        raise RuntimeError("Could not extract any file: " + "; ".join(failed))
+    return "\n\n".join(f"# File: {r['name']}\n{r['text']}" for r in results if not r["error"])
@@ -0,0 +1,407 @@
+import os
+import json
+import time
+import uuid
+import shutil
+import threading
+from datetime import datetime
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple, Union
+
+from .storage import (
+    DB_PATH, init_db, get_connection, save_meeting_result, get_meeting,
+    get_segment_partials, update_meeting_result,
+)
+from .ingest import (
+    AUDIO_EXTENSIONS, LocalUpload, extract_text_from_upload, extract_texts_from_uploads,
+    iter_transcribe_audio, iter_transcript_lines,
+)
+from .pipeline import (
+    summarize_and_extract_stream, build_result, IncrementalSummarizer,
+    summarize_segments, initial_segments,
+)
+from . import metrics
+
+JOBS_DIR = os.path.join(os.path.dirname(DB_PATH), "jobs")
+
+# Stages a job goes through, in order (shown as per-stage progress in the UI).
+STAGES = ["ingest", "summarize", "save"]
+
+# How a job's text updates an existing meeting (submit_job(..., meeting_id=...)).
+UPDATE_MODES = ("append", "replace")
+
+
+def _now() -> str:
+    return datetime.utcnow().isoformat()
+
+
+def init_jobs():
+    """The jobs table itself is created by the storage migrations."""
+    init_db()
+    os.makedirs(JOBS_DIR, exist_ok=True)
+
+
+def new_job() -> Tuple[str, str]:
+    """A fresh job id and its upload directory (data/jobs/<id>/); the job is queued by enqueue_job."""
+    job_id = uuid.uuid4().hex
+    job_dir = os.path.join(JOBS_DIR, job_id)
+    os.makedirs(job_dir, exist_ok=True)
+    return job_id, job_dir
+
+
+def upload_path(job_dir: str, index: int, name: str) -> str:
+    """Where upload number `index` is kept; the prefix keeps upload order, basename guards against path tricks."""
+    return os.path.join(job_dir, f"{index:03d}_{os.path.basename(name)}")
+
+
+def enqueue_job(
+    job_id: str,
+    title: str,
+    text_input: str = "",
+    meeting_id: Optional[int] = None,
+    mode: str = "append",
+):
+    """Queue a job whose uploads (if any) are already in its directory."""
+    if mode not in UPDATE_MODES:
+        raise ValueError(f"Unknown update mode {mode!r}; expected one of {UPDATE_MODES}")
+    now = _now()
+    with get_connection() as con:
+        con.execute(
+            """
+            INSERT INTO jobs (
+                id, title, text_input, status, stage, progress, partial,
+                target_meeting_id, update_mode, created_at, updated_at
+            )
+            VALUES (?, ?, ?, 'queued', 'queued', 0, '{}', ?, ?, ?, ?)
+            """,
+            (job_id, title, text_input, meeting_id, mode if meeting_id else None, now, now),
+        )
+    _wakeup.set()
+
+
+def submit_job(
+    title: str,
+    files: List[Tuple[str, Union[bytes, BinaryIO]]],
+    text_input: str = "",
+    meeting_id: Optional[int] = None,
+    mode: str = "append",
+) -> str:
+    """
+    Persist a meeting submission and queue it for the worker pool.
+    Uploaded files (bytes or binary file objects, copied in blocks) are written under
+    data/jobs/<id>/ so the job survives a restart. `text_input` alone is the transcript; next to
+    uploads it is appended after their extracted text.
+    With `meeting_id`, the text is appended to (mode="append") or replaces (mode="replace")
+    that meeting's transcript, and only changed segments are re-summarized.
+    """
+    if mode not in UPDATE_MODES:
+        raise ValueError(f"Unknown update mode {mode!r}; expected one of {UPDATE_MODES}")
+    job_id, job_dir = new_job()
+    for i, (name, data) in enumerate(files):
+        with open(upload_path(job_dir, i, name), "wb") as f:
+            if isinstance(data, (bytes, bytearray)):
+                f.write(data)
+            else:
+                shutil.copyfileobj(data, f)
+    enqueue_job(job_id, title, text_input, meeting_id, mode)
+    return job_id
+
+
+def queue_depth() -> int:
+    """Jobs queued or running, across all server processes sharing the DB."""
+    with get_connection() as con:
+        return con.execute("SELECT COUNT(*) FROM jobs WHERE status IN ('queued', 'running')").fetchone()[0]
+
+
+def get_job(job_id: str) -> Dict[str, Any]:
+    with get_connection() as con:
+        row = con.execute(
+            """
+            SELECT id, title, status, stage, progress, partial, meeting_id, error, created_at, updated_at,
+                   target_meeting_id, update_mode
+            FROM jobs WHERE id = ?
+            """,
+            (job_id,),
+        ).fetchone()
+    if not row:
+        return {}
+    return {
+        "id": row[0],
+        "title": row[1],
+        "status": row[2],
+        "stage": row[3],
+        "progress": row[4] or 0.0,
+        "partial": json.loads(row[5]) if row[5] else {},
+        "meeting_id": row[6],
+        "error": row[7],
+        "created_at": row[8],
+        "updated_at": row[9],
+        "target_meeting_id": row[10],
+        "update_mode": row[11],
+    }
+
+
+def _update(job_id: str, **fields):
+    if "partial" in fields:
+        fields["partial"] = json.dumps(fields["partial"])
+    fields["updated_at"] = _now()
+    cols = ", ".join(f"{k} = ?" for k in fields)
+    with metrics.timer("db_write_seconds", op="job_update"), get_connection() as con:
+        con.execute(f"UPDATE jobs SET {cols} WHERE id = ?", (*fields.values(), job_id))
+
+
+def _claim_next() -> Optional[str]:
+    """
+    Atomically move the oldest queued job to 'running'; safe across threads and processes.
+    The claim takes a lease (owner token + heartbeat) that _heartbeat_loop keeps fresh.
+    """
+    with get_connection() as con:
+        while True:
+            row = con.execute(
+                "SELECT id FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1"
+            ).fetchone()
+            if not row:
+                return None
+            owner, now = uuid.uuid4().hex, _now()
+            cur = con.execute(
+                "UPDATE jobs SET status = 'running', owner = ?, heartbeat_at = ?, updated_at = ?, "
+                "attempts = attempts + 1 WHERE id = ? AND status = 'queued'",
+                (owner, now, now, row[0]),
+            )
+            con.commit()
+            if cur.rowcount == 1:
+                with _leases_lock:
+                    _leases[row[0]] = owner
+                return row[0]
+
+
+def _release(job_id: str):
+    with _leases_lock:
+        _leases.pop(job_id, None)
+
+
+def _heartbeat_loop():
+    """Refresh the lease of every job this process is running, whether or not it reports progress."""
+    interval = float(os.getenv("JOB_HEARTBEAT_SECONDS", "15"))
+    while True:
+        time.sleep(interval)
+        with _leases_lock:
+            leases = list(_leases.items())
+        if not leases:
+            continue
+        try:
+            now = _now()
+            with get_connection() as con:
+                con.executemany(
+                    "UPDATE jobs SET heartbeat_at = ? WHERE id = ? AND owner = ? AND status = 'running'",
+                    [(now, job_id, owner) for job_id, owner in leases],
+                )
+        except Exception as e:
+            print("⚠️ Job heartbeat failed:", e)
+
+
+def _requeue_stale():
+    """
+    Jobs whose owner died (no heartbeat for JOB_STALE_SECONDS) go back in the queue, or fail
+    once they have been started JOB_MAX_ATTEMPTS times (e.g. a file that crashes the process).
+    """
+    stale_s = float(os.getenv("JOB_STALE_SECONDS", "120"))
+    max_attempts = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+    cutoff = datetime.utcfromtimestamp(time.time() - stale_s).isoformat()
+    stale_where = "status = 'running' AND COALESCE(heartbeat_at, updated_at) < ?"
+    requeued, failed = 0, []
+    with get_connection() as con:
+        rows = con.execute(f"SELECT id, attempts FROM jobs WHERE {stale_where}", (cutoff,)).fetchall()
+        for job_id, attempts in rows:
+            if attempts >= max_attempts:
+                cur = con.execute(
+                    f"UPDATE jobs SET status = 'failed', owner = NULL, error = ?, updated_at = ? "
+                    f"WHERE id = ? AND {stale_where}",
+                    (f"Worker stopped responding; gave up after {attempts} attempts", _now(), job_id, cutoff),
+                )
+                if cur.rowcount:
+                    failed.append(job_id)
+            else:
+                cur = con.execute(
+                    f"UPDATE jobs SET status = 'queued', stage = 'queued', progress = 0, owner = NULL "
+                    f"WHERE id = ? AND {stale_where}",
+                    (job_id, cutoff),
+                )
+                requeued += cur.rowcount
+    for job_id in failed:
+        shutil.rmtree(os.path.join(JOBS_DIR, job_id), ignore_errors=True)
+    if requeued:
+        print(f"♻️ Re-queued {requeued} interrupted job(s)")
+    if failed:
+        metrics.inc("jobs_total", len(failed), status="failed")
+        print(f"⚠️ Gave up on {len(failed)} job(s) after {max_attempts} attempts")
+
+
+class _JobReporter:
+    """Throttled progress/partial-result writes for one running job."""
+
+    def __init__(self, job_id: str, interval: float = 0.5):
+        self.job_id = job_id
+        self.interval = interval
+        self.partial: Dict[str, Any] = {}
+        self._last = 0.0
+
+    def stage(self, stage: str, progress: float = 0.0):
+        self._last = time.monotonic()
+        _update(self.job_id, stage=stage, progress=progress, partial=self.partial)
+
+    def progress(self, stage: str, progress: float):
+        now = time.monotonic()
+        if now - self._last >= self.interval:
+            self._last = now
+            _update(self.job_id, stage=stage, progress=progress, partial=self.partial)
+
+
+def _run_job(job_id: str):
+    job = get_job(job_id)
+    job_dir = os.path.join(JOBS_DIR, job_id)
+    title = job["title"] or "Untitled Meeting"
+    rep = _JobReporter(job_id)
+
+    with get_connection() as con:
+        text_input = con.execute("SELECT text_input FROM jobs WHERE id = ?", (job_id,)).fetchone()[0] or ""
+    uploads = [LocalUpload(os.path.join(job_dir, n), n[4:]) for n in sorted(os.listdir(job_dir))] if os.path.isdir(job_dir) else []
+
+    # --- Stage 1: ingest (OCR / whisper run in the ingest process pools) ---
+    rep.stage("ingest")
+    summarizer = None
+    ingest_errors: List[str] = []
+    if uploads:
+        if len(uploads) == 1 and uploads[0].name.lower().endswith(AUDIO_EXTENSIONS) and not job["target_meeting_id"]:
+            # A single long recording starts summarizing before transcription ends
+            summarizer = IncrementalSummarizer()
+            segments = iter_transcribe_audio(
+                uploads[0].getvalue(),
+                uploads[0].name.lower(),
+                progress=lambda done, total: rep.progress("ingest", done / total if total else 1.0),
+            )
+            for line in iter_transcript_lines(segments):
+                summarizer.add(line)
+                rep.partial["transcript_tail"] = "\n".join(summarizer.lines[-15:])
+            for line in text_input.strip().splitlines():
+                summarizer.add(line)
+            transcript = summarizer.transcript
+        elif len(uploads) == 1:
+            transcript = extract_text_from_upload(uploads[0])
+        else:
+            # Mixed batches (documents and recordings) are extracted concurrently, in upload order
+            transcript = extract_texts_from_uploads(
+                uploads,
+                progress=lambda done, total: rep.progress("ingest", done / total),
+                errors=ingest_errors,
+            )
+        if summarizer is None and text_input.strip():
+            # Text typed next to the uploads (e.g. notes) follows the extracted transcript
+            transcript = "\n".join(t for t in (transcript, text_input.strip()) if t)
+    else:
+        transcript = text_input.strip()
+    rep.partial.pop("transcript_tail", None)
+    error = f"Skipped {len(ingest_errors)} file(s): " + "; ".join(ingest_errors) if ingest_errors else None
+
+    if job["target_meeting_id"]:
+        meeting_id = _run_update(job, transcript, rep)
+        _update(job_id, status="done", stage="done", progress=1.0, meeting_id=meeting_id, partial={}, error=error)
+        shutil.rmtree(job_dir, ignore_errors=True)
+        return
+
+    # --- Stage 2: summarize (I/O-bound LLM calls, progressive partial results) ---
+    rep.stage("summarize")
+    early_data = summarizer.finish() if summarizer else None
+    if early_data is not None:
+        events = [("result", "", build_result(title, transcript, early_data))]
+    else:
+        events = summarize_and_extract_stream(title=title, transcript=transcript)
+
+    result = None
+    for kind, key, value in events:
+        if kind == "result":
+            result = value
+        elif kind == "item":
+            rep.partial.setdefault(key, []).append(value)
+        else:
+            rep.partial[key] = value
+        rep.progress("summarize", 0.5)
+
+    # --- Stage 3: save ---
+    rep.stage("save")
+    meeting_id = save_meeting_result(result, initial_segments(transcript, result))
+    _update(job_id, status="done", stage="done", progress=1.0, meeting_id=meeting_id, partial={}, error=error)
+    shutil.rmtree(job_dir, ignore_errors=True)
+
+
+def _run_update(job: Dict[str, Any], text: str, rep: _JobReporter) -> int:
+    """Summarize/save stages for a job that appends to or replaces an existing meeting's transcript."""
+    meeting_id = job["target_meeting_id"]
+    existing = get_meeting(meeting_id, with_transcript=True)
+    if not existing:
+        raise ValueError(f"Meeting {meeting_id} no longer exists")
+    if job["update_mode"] == "replace":
+        transcript = text
+    else:
+        transcript = "\n".join(t for t in (existing["transcript"], text) if t)
+
+    # Only new or edited segments go to the LLM; the rest reuse their stored partial results
+    rep.stage("summarize")
+    data, segments = summarize_segments(transcript, get_segment_partials(meeting_id))
+    result = build_result(existing["title"], transcript, data)
+    result.created_at = existing["created_at"]
+
+    rep.stage("save")
+    update_meeting_result(meeting_id, result, segments)
+    return meeting_id
+
+
+def _worker_loop():
+    last_requeue = time.monotonic()
+    while True:
+        job_id = _claim_next()
+        if job_id is None:
+            if time.monotonic() - last_requeue > 60:
+                _requeue_stale()
+                last_requeue = time.monotonic()
+            _wakeup.wait(timeout=2.0)
+            _wakeup.clear()
+            continue
+        print(f"🛠️ Job {job_id} started")
+        try:
+            with metrics.timer("job_seconds"):
+                _run_job(job_id)
+            metrics.inc("jobs_total", status="done")
+            print(f"✅ Job {job_id} done")
+        except Exception as e:
+            metrics.inc("jobs_total", status="failed")
+            print(f"⚠️ Job {job_id} failed:", e)
+            _update(job_id, status="failed", error=str(e))
+            shutil.rmtree(os.path.join(JOBS_DIR, job_id), ignore_errors=True)
+        finally:
+            _release(job_id)
+
+
+_wakeup = threading.Event()
+_leases: Dict[str, str] = {}  # job id -> owner token, for the jobs this process is running
+_leases_lock = threading.Lock()
+_started = False
+_start_lock = threading.Lock()
+
+
+def start_workers():
+    """
+    Start the job worker threads once per process (safe to call on every Streamlit rerun).
+    Threads orchestrate jobs and wait on LLM I/O; whisper/OCR work is fanned out to process pools.
+    """
+    global _started
+    with _start_lock:
+        if _started:
+            return
+        init_jobs()
+        _requeue_stale()
+        workers = int(os.getenv("JOB_WORKERS", "2"))
+        for i in range(workers):
+            threading.Thread(target=_worker_loop, name=f"job-worker-{i}", daemon=True).start()
+        if workers:
+            threading.Thread(target=_heartbeat_loop, name="job-heartbeat", daemon=True).start()
+        _started = True
@@ -1,82 +1,566 @@
 import os
-import re
-import requests
 import json
-from typing import Dict, Any
+import time
+import random
+import asyncio
+import concurrent.futures
+import queue
+import threading
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator, Dict, Any, Iterator, Optional, Sequence
 
-def call_llm_json(prompt: str) -> Dict[str, Any]:
-    provider = os.getenv("LLM_PROVIDER", "cerebras").lower()
+import httpx
 
-    if provider == "cerebras":
-        api_key = os.getenv("CEREBRAS_API_KEY")
+from . import metrics
+from .chunking import CHARS_PER_TOKEN, estimate_tokens
+from .parse import extract_json
+from .prompt import SYSTEM_PROMPT, SCHEMA_HINT, REASK_PROMPT
+from .models import SUMMARY_FIELDS, response_schema, invalid_fields, field_is_valid
+from .providers import Provider, MockProvider, HedgedProvider, content_of
+
+# Sampling params sent with every request (also part of the result-cache key).
+SAMPLING_PARAMS = {"temperature": 0.3, "max_tokens": 600}
+
+# Summaries produced when no model output was available; these must never be cached.
+API_ERROR_PREFIX = "API Error:"
+NO_RESPONSE_SUMMARY = "No LLM provider configured."
+
+# 408/409/425/429 and transient 5xx are worth retrying; other 4xx are caller errors.
+RETRY_STATUSES = {408, 409, 425, 429, 500, 502, 503, 504}
+
+
+def _empty_result(summary: str) -> Dict[str, Any]:
+    return {
+        "summary": summary,
+        "decisions": [],
+        "action_items": [],
+        "important_dates": [],
+        "other_notes": [],
+    }
+
+
+def _retry_after_seconds(resp: httpx.Response) -> Optional[float]:
+    """Read the server's requested wait (Retry-After seconds or HTTP date, or retry-after-ms)."""
+    ms = resp.headers.get("retry-after-ms")
+    if ms:
+        try:
+            return float(ms) / 1000.0
+        except ValueError:
+            pass
+    value = resp.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class LLMClient:
+    """
+    Async client for an OpenAI-style `/chat/completions` endpoint:
+    - One persistent httpx.AsyncClient (keep-alive connection pool, no per-call TLS handshake)
+    - A semaphore capping in-flight requests
+    - Exponential backoff with full jitter on 429/5xx/network errors, honouring Retry-After
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: Optional[str] = None,
+        max_in_flight: int = 8,
+        max_retries: int = 4,
+        timeout: float = 60.0,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_retries = max(0, max_retries)
+        self.timeout = timeout
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._client: Optional[httpx.AsyncClient] = None
+        self._sem = asyncio.Semaphore(self.max_in_flight)
+
+    def _http(self) -> httpx.AsyncClient:
+        if self._client is None:
+            headers = {"Content-Type": "application/json"}
+            if self.api_key:
+                headers["Authorization"] = f"Bearer {self.api_key}"
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=headers,
+                timeout=httpx.Timeout(self.timeout, connect=10.0),
+                limits=httpx.Limits(
+                    max_connections=self.max_in_flight,
+                    max_keepalive_connections=self.max_in_flight,
+                ),
+            )
+        return self._client
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    async def chat(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """POST a chat completion and return the decoded JSON body, retrying transient failures."""
+        async with self._sem:
+            attempt = 0
+            while True:
+                try:
+                    resp = await self._http().post("/chat/completions", json=payload)
+                except (httpx.TimeoutException, httpx.TransportError) as e:
+                    if attempt >= self.max_retries:
+                        raise
+                    delay = self._backoff(attempt)
+                    metrics.inc("llm_retries_total", reason="network")
+                    print(f"⚠️ LLM network error ({e!r}), retry {attempt + 1} in {delay:.1f}s")
+                else:
+                    if resp.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                        resp.raise_for_status()
+                        return resp.json()
+                    retry_after = _retry_after_seconds(resp)
+                    delay = min(retry_after, self.backoff_max) if retry_after is not None else self._backoff(attempt)
+                    metrics.inc("llm_retries_total", reason=str(resp.status_code))
+                    print(f"⚠️ LLM HTTP {resp.status_code}, retry {attempt + 1} in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    async def stream_chat(self, payload: Dict[str, Any]) -> AsyncIterator[str]:
+        """
+        POST a `stream: true` chat completion and yield content deltas from the SSE body.
+        Transient failures are retried only until the first delta has been yielded.
+        """
+        payload = dict(payload, stream=True)
+        async with self._sem:
+            attempt = 0
+            yielded = False
+            while True:
+                try:
+                    async with self._http().stream("POST", "/chat/completions", json=payload) as resp:
+                        if resp.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                            resp.raise_for_status()
+                            async for line in resp.aiter_lines():
+                                if not line.startswith("data:"):
+                                    continue
+                                data = line[5:].strip()
+                                if data == "[DONE]":
+                                    return
+                                try:
+                                    choice = (json.loads(data).get("choices") or [{}])[0]
+                                except ValueError:
+                                    continue
+                                delta = (choice.get("delta") or {}).get("content") or choice.get("text") or ""
+                                if delta:
+                                    yielded = True
+                                    yield delta
+                            return
+                        retry_after = _retry_after_seconds(resp)
+                        delay = min(retry_after, self.backoff_max) if retry_after is not None else self._backoff(attempt)
+                        metrics.inc("llm_retries_total", reason=str(resp.status_code))
+                        print(f"⚠️ LLM HTTP {resp.status_code}, retry {attempt + 1} in {delay:.1f}s")
+                except (httpx.TimeoutException, httpx.TransportError) as e:
+                    if yielded or attempt >= self.max_retries:
+                        raise
+                    delay = self._backoff(attempt)
+                    metrics.inc("llm_retries_total", reason="network")
+                    print(f"⚠️ LLM network error ({e!r}), retry {attempt + 1} in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+# --- Background event loop so sync callers (Streamlit, pipeline) can share one pool ---
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+_clients: Dict[tuple, LLMClient] = {}
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="llm-loop", daemon=True).start()
+        return _loop
+
+
+def submit(coro) -> "concurrent.futures.Future":
+    """Schedule a coroutine on the shared LLM event loop without waiting for it."""
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop())
+
+
+def run_sync(coro):
+    """Run a coroutine on the shared LLM event loop and block for its result."""
+    return submit(coro).result()
+
+
+def get_client(base_url: Optional[str] = None, api_key: Optional[str] = None) -> LLMClient:
+    """Process-wide client per endpoint (default: Cerebras), reused across calls and reruns."""
+    if base_url is None:
         base_url = os.getenv("CEREBRAS_API_BASE", "https://api.cerebras.ai/v1")
+        api_key = os.getenv("CEREBRAS_API_KEY")
+    key = (base_url, api_key)
+    with _loop_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = LLMClient(
+                base_url,
+                api_key,
+                max_in_flight=int(os.getenv("LLM_MAX_IN_FLIGHT", "8")),
+                max_retries=int(os.getenv("LLM_MAX_RETRIES", "4")),
+                timeout=float(os.getenv("LLM_TIMEOUT", "60")),
+                backoff_base=float(os.getenv("LLM_BACKOFF_BASE", "0.5")),
+                backoff_max=float(os.getenv("LLM_BACKOFF_MAX", "30")),
+            )
+            _clients[key] = client
+        return client
+
+
+def _count_error(e: Exception):
+    metrics.inc("llm_errors_total", kind="http" if isinstance(e, httpx.HTTPStatusError) else "network")
+
+
+def _response_format_mode() -> str:
+    """LLM_RESPONSE_FORMAT: json_schema (default), json_object or none."""
+    mode = os.getenv("LLM_RESPONSE_FORMAT", "json_schema").lower()
+    return mode if mode in ("json_schema", "json_object") else "none"
 
-        headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json"
-        }
 
-        url = f"{base_url}/chat/completions"
-        payload = {
-            "model": os.getenv("CEREBRAS_MODEL", "llama3.1-8b"),
-            "messages": [
-                {
-                    "role": "system",
-                    "content": """You are a meeting summarizer.
-Return ONLY valid JSON with this structure:
-{
-  "summary": "string",
-  "decisions": ["decision 1", "decision 2"],
-  "action_items": [{"assignee": "string", "task": "string", "due_date": "string"}],
-  "important_dates": ["list of dates"],
-  "other_notes": ["list of notes"]
-}
-Do not include any explanations, comments, or text outside the JSON."""
-                },
-                {"role": "user", "content": prompt}
-            ],
-            "temperature": 0.3,
-            "max_tokens": 600
+def _schema_hint(schema: Dict[str, Any]) -> str:
+    return SCHEMA_HINT.format(schema=json.dumps(schema, separators=(",", ":")))
+
+
+def _build_payload(prompt: str, fields: Sequence[str] = SUMMARY_FIELDS, system: str = SYSTEM_PROMPT) -> Dict[str, Any]:
+    """
+    One system message + the user prompt. The answer schema (from models.MeetingResult) goes in
+    `response_format` when structured output is enabled, otherwise it is spelled out in the
+    system message. The provider fills in its model name.
+    """
+    mode = _response_format_mode()
+    schema = response_schema(fields)
+    if mode != "json_schema":
+        system += _schema_hint(schema)
+    payload = {
+        "messages": [
+            {"role": "system", "content": system},
+            {"role": "user", "content": prompt}
+        ],
+        **SAMPLING_PARAMS,
+    }
+    if mode == "json_schema":
+        payload["response_format"] = {
+            "type": "json_schema",
+            "json_schema": {"name": "meeting_summary", "strict": True, "schema": schema},
         }
+    elif mode == "json_object":
+        payload["response_format"] = {"type": "json_object"}
+    return payload
+
+
+def _without_response_format(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """The same request for endpoints without structured output: the schema moves into the system message."""
+    payload = dict(payload)
+    schema = ((payload.pop("response_format", None) or {}).get("json_schema") or {}).get("schema")
+    if schema is not None:
+        system, *rest = payload["messages"]
+        payload["messages"] = [dict(system, content=system["content"] + _schema_hint(schema)), *rest]
+    return payload
 
+
+def _prompt_tokens(payload: Dict[str, Any]) -> Dict[str, int]:
+    """Estimated prompt tokens per part of the request (system, schema, user)."""
+    system, user = (m["content"] for m in payload["messages"])
+    fmt = payload.get("response_format")
+    return {
+        "system": estimate_tokens(system),
+        "schema": estimate_tokens(json.dumps(fmt, separators=(",", ":"))) if fmt else 0,
+        "user": estimate_tokens(user),
+    }
+
+
+def _count_prompt_tokens(payload: Dict[str, Any], kind: str, reported: Optional[int] = None):
+    parts = _prompt_tokens(payload)
+    for part, n in parts.items():
+        if n:
+            metrics.inc("llm_prompt_tokens_total", n, kind=kind, part=part)
+    metrics.inc("llm_tokens_total", reported or sum(parts.values()), direction="in")
+
+
+class HTTPProvider(Provider):
+    """
+    An OpenAI-compatible `/chat/completions` endpoint: Cerebras, or a local server
+    (vLLM, llama.cpp, Ollama, ...). If the endpoint answers 400/422 to a request carrying
+    `response_format` and accepts it without, the schema is sent in the prompt from then on.
+    """
+
+    def __init__(self, name: str, client: LLMClient, model: str):
+        self.name = name
+        self.client = client
+        self.model = model
+        self.structured_output = True
+
+    def _prepare(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        payload = dict(payload, model=self.model)
+        return payload if self.structured_output else _without_response_format(payload)
+
+    def _format_rejected(self, e: httpx.HTTPStatusError, payload: Dict[str, Any]) -> bool:
+        return e.response.status_code in (400, 422) and "response_format" in payload
+
+    def _disable_structured_output(self, e: httpx.HTTPStatusError):
+        self.structured_output = False
+        metrics.inc("llm_response_format_fallbacks_total")
+        print(f"⚠️ {self.name} rejected response_format (HTTP {e.response.status_code}); schema goes in the prompt instead")
+
+    async def chat(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        payload = self._prepare(payload)
+        try:
+            return await self.client.chat(payload)
+        except httpx.HTTPStatusError as e:
+            if not self._format_rejected(e, payload):
+                raise
+            data = await self.client.chat(_without_response_format(payload))
+            self._disable_structured_output(e)
+            return data
+
+    async def stream(self, payload: Dict[str, Any]) -> AsyncIterator[str]:
+        payload = self._prepare(payload)
+        agen = self.client.stream_chat(payload)
         try:
-            resp = requests.post(url, headers=headers, json=payload, timeout=60)
-            resp.raise_for_status()
-            data = resp.json()
-        except requests.exceptions.RequestException as e:
-            print("⚠️ Cerebras API Error:", str(e))
-            return {"summary": f"API Error: {e}", "decisions": [], "action_items": [], "important_dates": [], "other_notes": []}
+            # Rejections surface before the first delta, so the request can still be retried
+            first = await agen.__anext__()
+        except httpx.HTTPStatusError as e:
+            if not self._format_rejected(e, payload):
+                raise
+            agen = self.client.stream_chat(_without_response_format(payload))
+            try:
+                first = await agen.__anext__()
+            except StopAsyncIteration:
+                return
+            self._disable_structured_output(e)
+        except StopAsyncIteration:
+            return
+        yield first
+        async for delta in agen:
+            yield delta
+
+
+_providers: Dict[tuple, Optional[Provider]] = {}
+
+
+def _make_provider(name: str) -> Optional[Provider]:
+    if name == "cerebras":
+        return HTTPProvider("cerebras", get_client(), os.getenv("CEREBRAS_MODEL", "llama3.1-8b"))
+    if name in ("openai", "local"):
+        client = get_client(os.getenv("OPENAI_API_BASE", "http://localhost:8000/v1"), os.getenv("OPENAI_API_KEY"))
+        return HTTPProvider("openai", client, os.getenv("OPENAI_MODEL", "llama3.1-8b"))
+    if name == "mock":
+        return MockProvider(latency=float(os.getenv("LLM_MOCK_LATENCY_MS", "0")) / 1000.0)
+    return None
+
+
+def _provider_config() -> tuple:
+    names = ("LLM_PROVIDER", "LLM_FALLBACK_PROVIDER", "LLM_HEDGE_AFTER_MS", "LLM_HEDGE_QUANTILE",
+             "LLM_HEDGE_MIN_MS", "LLM_HEDGE_INITIAL_MS", "LLM_MOCK_LATENCY_MS",
+             "CEREBRAS_API_BASE", "CEREBRAS_API_KEY", "CEREBRAS_MODEL",
+             "OPENAI_API_BASE", "OPENAI_API_KEY", "OPENAI_MODEL")
+    return tuple(os.getenv(n, "") for n in names)
+
+
+def get_provider() -> Optional[Provider]:
+    """
+    The configured backend (None for an unknown LLM_PROVIDER):
+    - LLM_PROVIDER: cerebras | openai (any OpenAI-compatible endpoint, e.g. a local server) | mock
+    - LLM_FALLBACK_PROVIDER: optional second backend for hedging and failover
+    - LLM_HEDGE_AFTER_MS: hedge after this delay; empty = the primary's recent p95
+      (LLM_HEDGE_QUANTILE), `off` = failover only
+    """
+    key = _provider_config()
+    with _loop_lock:
+        if key in _providers:
+            return _providers[key]
+    primary = _make_provider(os.getenv("LLM_PROVIDER", "cerebras").lower())
+    fallback_name = os.getenv("LLM_FALLBACK_PROVIDER", "").lower()
+    backup = _make_provider(fallback_name) if fallback_name else None
+    if fallback_name and backup is None:
+        print(f"⚠️ Unknown LLM_FALLBACK_PROVIDER {fallback_name!r}, no hedging/failover")
+    provider = primary
+    if primary is not None and backup is not None:
+        hedge_after = os.getenv("LLM_HEDGE_AFTER_MS", "").strip().lower()
+        provider = HedgedProvider(
+            primary,
+            backup,
+            hedge_after=float(hedge_after) / 1000.0 if hedge_after not in ("", "off") else None,
+            quantile=float(os.getenv("LLM_HEDGE_QUANTILE", "0.95")),
+            min_delay=float(os.getenv("LLM_HEDGE_MIN_MS", "250")) / 1000.0,
+            initial_delay=float(os.getenv("LLM_HEDGE_INITIAL_MS", "5000")) / 1000.0,
+            hedging=hedge_after != "off",
+        )
+    with _loop_lock:
+        return _providers.setdefault(key, provider)
 
-        print("🟢 RAW Cerebras Response:", json.dumps(data, indent=2))
 
-        content = ""
+def model_id() -> str:
+    """provider:model of the primary backend (part of the result-cache key)."""
+    name = os.getenv("LLM_PROVIDER", "cerebras").lower()
+    model = {
+        "cerebras": os.getenv("CEREBRAS_MODEL", "llama3.1-8b"),
+        "openai": os.getenv("OPENAI_MODEL", "llama3.1-8b"),
+        "local": os.getenv("OPENAI_MODEL", "llama3.1-8b"),
+        "mock": "extractive",
+    }.get(name, "")
+    return f"{name}:{model}"
+
+
+async def _complete(prompt: str, fields: Sequence[str], kind: str, system: str = SYSTEM_PROMPT) -> str:
+    """One chat completion for `fields`; returns the message content."""
+    payload = _build_payload(prompt, fields, system)
+    with metrics.timer("llm_request_seconds", mode="chat"):
+        data = await get_provider().chat(payload)
+    metrics.sample_debug("llm_response", data)
+    usage = data.get("usage") or {}
+    content = content_of(data)
+    _count_prompt_tokens(payload, kind, usage.get("prompt_tokens"))
+    metrics.inc("llm_tokens_total", usage.get("completion_tokens") or estimate_tokens(content), direction="out")
+    return content
+
+
+async def afill_missing_fields(
+    prompt: str,
+    data: Dict[str, Any],
+    fields: Sequence[str] = SUMMARY_FIELDS,
+    system: str = SYSTEM_PROMPT,
+) -> Dict[str, Any]:
+    """
+    Targeted re-ask: request only the fields of `data` that are missing or invalid (schema and
+    output limited to them), up to LLM_REASK_MAX times. Only valid values are merged in.
+    """
+    for _ in range(int(os.getenv("LLM_REASK_MAX", "1"))):
+        missing = invalid_fields(data, fields)
+        if not missing:
+            break
+        for field in missing:
+            metrics.inc("llm_reask_fields_total", field=field)
         try:
-            content = data["choices"][0]["message"]["content"]
-        except Exception:
-            content = data.get("choices", [{}])[0].get("text", "")
+            content = await _complete(REASK_PROMPT.format(fields=", ".join(missing)) + prompt, missing, "reask", system)
+        except (httpx.HTTPError, ValueError) as e:
+            _count_error(e)
+            print("⚠️ LLM API Error (re-ask):", str(e))
+            break
+        patch, _ = extract_json(content)
+        if patch:
+            data = dict(data, **{f: patch[f] for f in missing if f in patch and field_is_valid(f, patch[f])})
+    return data
+
+
+async def afinish_json(
+    prompt: str,
+    content: str,
+    fields: Sequence[str] = SUMMARY_FIELDS,
+    stage: str = "llm",
+    system: str = SYSTEM_PROMPT,
+) -> Dict[str, Any]:
+    """Parse a model answer, re-ask for missing/invalid fields, and fall back to the raw text as the summary."""
+    parsed, path = extract_json(content)
+    if path != "direct":
+        metrics.inc("parse_fallbacks_total", stage=stage, path=path)
+    data = await afill_missing_fields(prompt, parsed or {}, fields, system)
+    if parsed is None and len(invalid_fields(data, fields)) == len(fields):
+        return _empty_result(content.strip() or "⚠️ Model returned no summary.")
+    return data
+
+
+async def acall_llm_json(
+    prompt: str,
+    fields: Sequence[str] = SUMMARY_FIELDS,
+    kind: str = "summary",
+    system: str = SYSTEM_PROMPT,
+) -> Dict[str, Any]:
+    """
+    Ask for `fields` (default: the full summary) and return the parsed answer.
+    `kind` labels the prompt-token metrics (summary, reduce, reask).
+    """
+    if get_provider() is None:
+        return _empty_result(NO_RESPONSE_SUMMARY)
+    try:
+        content = await _complete(prompt, fields, kind, system)
+    except (httpx.HTTPError, ValueError) as e:
+        _count_error(e)
+        print("⚠️ LLM API Error:", str(e))
+        return _empty_result(f"{API_ERROR_PREFIX} {e}")
+    return await afinish_json(prompt, content, fields, system=system)
+
+
+def call_llm_json(
+    prompt: str,
+    fields: Sequence[str] = SUMMARY_FIELDS,
+    kind: str = "summary",
+    system: str = SYSTEM_PROMPT,
+) -> Dict[str, Any]:
+    """Synchronous wrapper around acall_llm_json for existing call sites."""
+    return run_sync(acall_llm_json(prompt, fields, kind, system))
+
 
+def finish_json(prompt: str, content: str, stage: str = "stream") -> Dict[str, Any]:
+    """Synchronous afinish_json, for answers that were streamed."""
+    return run_sync(afinish_json(prompt, content, stage=stage))
+
+
+async def astream_llm_text(prompt: str) -> AsyncIterator[str]:
+    """Stream raw model output for the summary prompt, delta by delta."""
+    provider = get_provider()
+    if provider is None:
+        yield json.dumps(_empty_result(NO_RESPONSE_SUMMARY))
+        return
+    payload = _build_payload(prompt)
+    yielded = False
+    out_chars = 0
+    start = time.perf_counter()
+    try:
+        async for delta in provider.stream(payload):
+            if not yielded:
+                metrics.observe("llm_first_token_seconds", time.perf_counter() - start)
+            yielded = True
+            out_chars += len(delta)
+            yield delta
+        metrics.observe("llm_request_seconds", time.perf_counter() - start, mode="stream")
+        _count_prompt_tokens(payload, "summary")
+        metrics.inc("llm_tokens_total", -(-out_chars // CHARS_PER_TOKEN), direction="out")
+    except httpx.HTTPError as e:
+        _count_error(e)
+        print("⚠️ LLM API Error:", str(e))
+        if not yielded:
+            yield json.dumps(_empty_result(f"{API_ERROR_PREFIX} {e}"))
+
+
+def stream_llm_text(prompt: str) -> Iterator[str]:
+    """Synchronous iterator over astream_llm_text, driven by the shared LLM event loop."""
+    q: "queue.Queue" = queue.Queue()
+    done = object()
+
+    async def pump():
         try:
-            return json.loads(content)
-        except Exception:
-            match = re.search(r"\{.*\}", content, re.DOTALL)
-            if match:
-                try:
-                    return json.loads(match.group(0))
-                except Exception:
-                    pass
-
-            return {
-                "summary": content.strip() or "⚠️ Model returned no summary.",
-                "decisions": [],
-                "action_items": [],
-                "important_dates": [],
-                "other_notes": []
-            }
+            async for delta in astream_llm_text(prompt):
+                q.put(delta)
+        except BaseException as e:
+            q.put(e)
+        finally:
+            q.put(done)
 
-    return {
-        "summary": "No Cerebras response.",
-        "decisions": [],
-        "action_items": [],
-        "important_dates": [],
-        "other_notes": []
-    }
+    asyncio.run_coroutine_threadsafe(pump(), _get_loop())
+    while True:
+        item = q.get()
+        if item is done:
+            return
+        if isinstance(item, BaseException):
+            raise item
+        yield item
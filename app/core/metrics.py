@@ -0,0 +1,275 @@
+import os
+import json
+import time
+import random
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Histogram buckets (seconds) shared by all timers.
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+# Metric names used across the app (kept here so dashboards have one reference):
+#   ingest_seconds{type}               extraction time per file type
+#   ingest_files_total{type}           files extracted
+#   ingest_bytes_total{type}           bytes read
+#   ocr_pages_total                    PDF pages sent to OCR
+#   ocr_seconds                        wall time of the OCR phase for one PDF
+#   audio_seconds_total                seconds of audio transcribed
+#   transcribe_seconds                 wall time per audio file
+#   whisper_model_selected_total{model} recordings per Whisper model (primary vs fast under load)
+#   diarize_window_seconds             speaker clustering time per DIARIZE_WINDOW_SECONDS window
+#   diarize_speakers_total             speakers found across all recordings
+#   preprocess_seconds                 prompt-side transcript preprocessing
+#   preprocess_tokens_total{stage}     transcript tokens before / after preprocessing (after / before = compression ratio)
+#   llm_request_seconds{mode}          LLM request latency (mode = chat | stream)
+#   llm_first_token_seconds            time to first streamed delta
+#   llm_tokens_total{direction}        prompt ("in") / completion ("out") tokens
+#   llm_prompt_tokens_total{kind,part} estimated prompt tokens (kind = summary | reduce | reask, part = system | schema | user)
+#   llm_reask_fields_total{field}      fields re-requested because they were missing or invalid
+#   llm_response_format_fallbacks_total endpoints that rejected `response_format` (schema moved into the prompt)
+#   llm_errors_total{kind}             failed requests after retries (http | network)
+#   llm_retries_total{reason}          retried attempts
+#   llm_hedges_total{reason}           requests also sent to the fallback provider (slow | error)
+#   llm_hedge_winner_total{provider}   which provider answered a hedged request
+#   parse_fallbacks_total{stage,path}  responses that were not plain JSON (path = extracted | repaired | failed)
+#   summarize_seconds{mode}            end-to-end summarization (single | chunked | stream)
+#   summarize_step_seconds{step}       map / reduce / parse steps
+#   summarize_chunks_total{early}      chunks sent in map-reduce mode (early = during transcription)
+#   summarize_first_token_seconds      streaming: time until the first model output
+#   cache_lookups_total{result}        result cache hit | miss | coalesced
+#   segments_total{reused}             transcript segments on meeting updates (reused = partial kept)
+#   db_write_seconds{op}               SQLite write transactions
+#   transcript_blobs_total{dedup}      transcripts saved (dedup = true: identical text already stored)
+#   transcript_bytes_total{form}       transcript bytes written (form = raw | stored, i.e. after compression)
+#   transcript_load_seconds            reading + decompressing a transcript on demand
+#   semantic_index_seconds             embedding + appending one meeting to the semantic index
+#   semantic_index_items_total{kind}   items embedded (summary | decision | action_item)
+#   semantic_search_seconds            top-k queries against the semantic index
+#   resource_load_seconds{resource}    lazy loads in the resource registry (modules, models)
+#   resource_evictions_total{resource} resources unloaded after their idle TTL
+#   job_seconds, jobs_total{status}    background job runs
+#   batch_files_total{status}          CLI batch runs (done | failed)
+#   api_request_seconds{route}         HTTP API request latency per route template
+#   api_requests_total{route,status}   HTTP API responses
+#   api_rejections_total{reason}       submissions refused (too_large | too_many_files | field_too_large | unsupported | queue_full | busy)
+#   api_upload_bytes_total             bytes streamed to disk by POST /jobs
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Dict[str, Any]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class _Histogram:
+    __slots__ = ("count", "sum", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.buckets = [0] * len(BUCKETS)
+
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                self.buckets[i] += 1
+                break
+
+    def quantile(self, q: float) -> float:
+        """Approximate quantile from the bucket counts (upper bound of the bucket)."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for bound, n in zip(BUCKETS, self.buckets):
+            seen += n
+            if seen >= target:
+                return min(bound, self.max)
+        return self.max
+
+
+class Registry:
+    """
+    Process-local counters and latency histograms.
+    Cheap enough for hot paths: one lock and a dict lookup per update.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters: Dict[Tuple[str, Labels], float] = {}
+        self.histograms: Dict[Tuple[str, Labels], _Histogram] = {}
+
+    def inc(self, name: str, value: float = 1, **labels):
+        key = (name, _labels(labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, seconds: float, **labels):
+        key = (name, _labels(labels))
+        with self._lock:
+            hist = self.histograms.get(key)
+            if hist is None:
+                hist = self.histograms[key] = _Histogram()
+            hist.observe(seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-friendly view: counters plus count/sum/p50/p95/max per timer."""
+        def name_of(name: str, labels: Labels) -> str:
+            return name + ("{" + ",".join(f"{k}={v}" for k, v in labels) + "}" if labels else "")
+
+        with self._lock:
+            return {
+                "counters": {name_of(n, l): v for (n, l), v in sorted(self.counters.items())},
+                "timers": {
+                    name_of(n, l): {
+                        "count": h.count,
+                        "sum": round(h.sum, 6),
+                        "p50": round(h.quantile(0.5), 6),
+                        "p95": round(h.quantile(0.95), 6),
+                        "max": round(h.max, 6),
+                    }
+                    for (n, l), h in sorted(self.histograms.items())
+                },
+            }
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition format (counters and histograms)."""
+        def fmt(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+            items = list(labels) + ([extra] if extra else [])
+            return "{" + ",".join(f'{k}="{v}"' for k, v in items) + "}" if items else ""
+
+        lines: List[str] = []
+        with self._lock:
+            seen = set()
+            for (name, labels), value in sorted(self.counters.items()):
+                if name not in seen:
+                    lines.append(f"# TYPE {name} counter")
+                    seen.add(name)
+                lines.append(f"{name}{fmt(labels)} {value}")
+            for (name, labels), h in sorted(self.histograms.items()):
+                if name not in seen:
+                    lines.append(f"# TYPE {name} histogram")
+                    seen.add(name)
+                cumulative = 0
+                for bound, n in zip(BUCKETS, h.buckets):
+                    cumulative += n
+                    lines.append(f"{name}_bucket{fmt(labels, ('le', str(bound)))} {cumulative}")
+                lines.append(f"{name}_bucket{fmt(labels, ('le', '+Inf'))} {h.count}")
+                lines.append(f"{name}_sum{fmt(labels)} {h.sum}")
+                lines.append(f"{name}_count{fmt(labels)} {h.count}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+
+REGISTRY = Registry()
+
+
+def inc(name: str, value: float = 1, **labels):
+    REGISTRY.inc(name, value, **labels)
+
+
+def observe(name: str, seconds: float, **labels):
+    REGISTRY.observe(name, seconds, **labels)
+
+
+@contextmanager
+def timer(name: str, **labels) -> Iterator[Dict[str, Any]]:
+    """
+    Time a block with the monotonic high-resolution clock and record it under `name`.
+    Yields a dict whose labels the block may extend before it exits (e.g. mode="chunked").
+    """
+    extra: Dict[str, Any] = {}
+    start = time.perf_counter()
+    try:
+        yield extra
+    finally:
+        REGISTRY.observe(name, time.perf_counter() - start, **labels, **extra)
+
+
+def snapshot() -> Dict[str, Any]:
+    return REGISTRY.snapshot()
+
+
+def to_prometheus() -> str:
+    return REGISTRY.to_prometheus()
+
+
+def dump_json(path: Optional[str] = None) -> str:
+    """Serialize the snapshot; also write it to `path` (or METRICS_JSON_PATH) when given."""
+    text = json.dumps(snapshot(), indent=2)
+    path = path or os.getenv("METRICS_JSON_PATH")
+    if path:
+        with open(path, "w") as f:
+            f.write(text)
+    return text
+
+
+# --- Sampled debug payloads (raw LLM responses, prompts) ---
+def sample_debug(kind: str, payload: Any, max_chars: int = 2000):
+    """
+    Print a debug payload for a sampled fraction of calls (METRICS_DEBUG_SAMPLE_RATE, default 0),
+    truncated to max_chars, instead of logging every transcript and response in full.
+    """
+    rate = float(os.getenv("METRICS_DEBUG_SAMPLE_RATE", "0"))
+    if rate <= 0 or random.random() >= rate:
+        return
+    text = payload if isinstance(payload, str) else json.dumps(payload, default=str)
+    if len(text) > max_chars:
+        text = text[:max_chars] + f"… [{len(text) - max_chars} more chars]"
+    print(f"🔬 [{kind}] {text}")
+
+
+# --- Optional HTTP endpoint: /metrics (Prometheus text) and /metrics.json ---
+_server_started = False
+_server_lock = threading.Lock()
+
+
+def start_http_server(port: int, host: str = "127.0.0.1"):
+    """Serve metrics from a daemon thread (stdlib only); a no-op after the first call."""
+    global _server_started
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.startswith("/metrics.json"):
+                body, ctype = json.dumps(snapshot()).encode(), "application/json"
+            elif self.path.startswith("/metrics"):
+                body, ctype = to_prometheus().encode(), "text/plain; version=0.0.4"
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    with _server_lock:
+        if _server_started:
+            return
+        server = ThreadingHTTPServer((host, port), Handler)  # raises OSError if the port is taken
+        _server_started = True
+        threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+        print(f"📈 Metrics on http://{host}:{port}/metrics")
+
+
+def serve_from_env():
+    """Start the metrics endpoint if METRICS_PORT is set (host from METRICS_HOST)."""
+    port = os.getenv("METRICS_PORT")
+    if port:
+        try:
+            start_http_server(int(port), os.getenv("METRICS_HOST", "127.0.0.1"))
+        except OSError as e:
+            # another server process on this host already owns the port
+            print("⚠️ Metrics endpoint not started:", e)
@@ -1,5 +1,6 @@
-from pydantic import BaseModel, Field
-from typing import List, Optional
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError, field_validator
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from functools import lru_cache
 from datetime import datetime
 
 class ActionItem(BaseModel):
@@ -18,3 +19,112 @@ class MeetingResult(BaseModel):
     important_dates: List[str] = Field(default_factory=list)
     other_notes: List[str] = Field(default_factory=list)
 
+
+def _as_text(value: Any) -> str:
+    """Models sometimes return objects or numbers where a string belongs; flatten them."""
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, dict):
+        return "; ".join(_as_text(v) for v in value.values() if _as_text(v))
+    return str(value)
+
+
+class SummaryFields(BaseModel):
+    """
+    The structured fields the LLM returns, validated leniently in one pass:
+    - list fields accept a lone string and flatten non-string entries
+    - action items without a task are dropped; a missing assignee/due date gets a placeholder
+    """
+    summary: str = ""
+    decisions: List[str] = Field(default_factory=list)
+    action_items: List[ActionItem] = Field(default_factory=list)
+    important_dates: List[str] = Field(default_factory=list)
+    other_notes: List[str] = Field(default_factory=list)
+
+    @field_validator("summary", mode="before")
+    @classmethod
+    def _summary(cls, v):
+        return _as_text(v)
+
+    @field_validator("decisions", "important_dates", "other_notes", mode="before")
+    @classmethod
+    def _strings(cls, v):
+        if v is None:
+            return []
+        if not isinstance(v, list):
+            v = [v]
+        return [t for t in (_as_text(x) for x in v) if t]
+
+    @field_validator("action_items", mode="before")
+    @classmethod
+    def _action_items(cls, v):
+        if not isinstance(v, list):
+            return []
+        return [
+            {
+                "assignee": _as_text(ai.get("assignee")) or "Unassigned",
+                "task": _as_text(ai.get("task")),
+                "due_date": _as_text(ai.get("due_date")) or "—",
+            }
+            for ai in v
+            if isinstance(ai, dict) and _as_text(ai.get("task"))
+        ]
+
+
+# The MeetingResult fields the LLM fills in (everything else comes from the caller).
+SUMMARY_FIELDS: Tuple[str, ...] = ("summary", "decisions", "action_items", "important_dates", "other_notes")
+
+
+def _strict_schema(node: Any, defs: Dict[str, Any]) -> Any:
+    """Inline $refs, drop nullability and make every object closed with all properties required."""
+    if isinstance(node, list):
+        return [_strict_schema(n, defs) for n in node]
+    if not isinstance(node, dict):
+        return node
+    if "$ref" in node:
+        return _strict_schema(defs[node["$ref"].rsplit("/", 1)[-1]], defs)
+    variants = [v for v in node.get("anyOf", []) if v.get("type") != "null"]
+    if len(variants) == 1:  # Optional[X]: the prompt asks for placeholders instead of nulls
+        return _strict_schema(variants[0], defs)
+    out = {k: _strict_schema(v, defs) for k, v in node.items() if k not in ("title", "default", "$defs")}
+    if out.get("type") == "object" and "properties" in out:
+        out["required"] = list(out["properties"])
+        out["additionalProperties"] = False
+    return out
+
+
+@lru_cache(maxsize=None)
+def _response_schema(fields: Tuple[str, ...]) -> Dict[str, Any]:
+    full = MeetingResult.model_json_schema()
+    return _strict_schema(
+        {"type": "object", "properties": {f: full["properties"][f] for f in fields}},
+        full.get("$defs", {}),
+    )
+
+
+def response_schema(fields: Sequence[str] = SUMMARY_FIELDS) -> Dict[str, Any]:
+    """JSON schema for (a subset of) the LLM fields, derived from MeetingResult."""
+    return _response_schema(tuple(fields))
+
+
+@lru_cache(maxsize=None)
+def _field_adapter(field: str) -> TypeAdapter:
+    return TypeAdapter(MeetingResult.model_fields[field].annotation)
+
+
+def field_is_valid(field: str, value: Any) -> bool:
+    """True if `value` matches the MeetingResult type of `field` (a summary must also be non-empty)."""
+    try:
+        _field_adapter(field).validate_python(value)
+    except ValidationError:
+        return False
+    return field != "summary" or bool(value.strip())
+
+
+def invalid_fields(data: Any, fields: Sequence[str] = SUMMARY_FIELDS) -> List[str]:
+    """The requested fields that are missing from `data` or don't match the schema."""
+    if not isinstance(data, dict):
+        return list(fields)
+    return [f for f in fields if f not in data or not field_is_valid(f, data[f])]
@@ -1,15 +1,150 @@
 import json, re
-from typing import Dict, Any
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from . import metrics
+
+# How extract_json() got its object (also the `path` label of parse_fallbacks_total):
+#   direct     the whole text was valid JSON
+#   extracted  the first balanced {...} in surrounding prose / code fences
+#   repaired   a truncated object, cut back to its last complete value and closed
+#   failed     nothing usable
+PARSE_PATHS = ("direct", "extracted", "repaired", "failed")
+
+# Only these characters change the scanner's state; everything else is skipped by the regex engine.
+_STRUCTURAL = re.compile(r'[{}\[\]",:]')
+_STRING_SPECIAL = re.compile(r'["\\]')
+_DANGLING_ESCAPE = re.compile(r'(?<!\\)((?:\\\\)*)(?:\\u[dD][89abAB][0-9a-fA-F]{2})?(?:\\u[0-9a-fA-F]{0,3})?$')
+
+# A truncated answer whose first "{" doesn't lead anywhere is retried from the next few "{".
+_MAX_REPAIR_STARTS = 3
+
+_EMPTY = {"summary": "", "decisions": [], "action_items": []}
+
+
+class _Scan(NamedTuple):
+    end: int                  # index after the balancing "}", or -1 if the text ran out first
+    stack: Tuple[str, ...]    # containers still open at the end of the text
+    in_value_string: bool     # text ended inside a string that is a value (not an object key)
+    safe_end: int             # last cut point after which only complete values precede
+    safe_stack: Tuple[str, ...]
+
+
+def _scan(text: str, start: int) -> _Scan:
+    """
+    Walk one JSON object starting at text[start] == "{" in a single linear pass,
+    tracking strings/escapes and open containers. Records the last position where the
+    text can be cut and closed into valid JSON (after "{"/"[", a complete value, or before ",").
+    """
+    stack: List[str] = []
+    expect_key: List[bool] = []  # per container: the next string in this object is a key
+    safe_end, safe_stack = start, ()
+    i = start
+    while True:
+        m = _STRUCTURAL.search(text, i)
+        if m is None:
+            return _Scan(-1, tuple(stack), False, safe_end, safe_stack)
+        i = m.start()
+        c = text[i]
+        if c == '"':
+            is_key = bool(stack) and stack[-1] == "{" and expect_key[-1]
+            j = i + 1
+            while True:
+                s = _STRING_SPECIAL.search(text, j)
+                if s is None:
+                    return _Scan(-1, tuple(stack), not is_key, safe_end, safe_stack)
+                j = s.start()
+                if text[j] == "\\":
+                    j += 2
+                    continue
+                break
+            i = j + 1
+            if not is_key:
+                safe_end, safe_stack = i, tuple(stack)
+            continue
+        if c == "{" or c == "[":
+            stack.append(c)
+            expect_key.append(c == "{")
+            safe_end, safe_stack = i + 1, tuple(stack)
+        elif c == "}" or c == "]":
+            if stack:
+                stack.pop()
+                expect_key.pop()
+            if not stack:
+                return _Scan(i + 1, (), False, i + 1, ())
+            safe_end, safe_stack = i + 1, tuple(stack)
+        elif c == ",":
+            if stack:
+                safe_end, safe_stack = i, tuple(stack)
+                expect_key[-1] = stack[-1] == "{"
+        elif c == ":":
+            if stack:
+                expect_key[-1] = False
+        i += 1
+
+
+def _closers(stack: Tuple[str, ...]) -> str:
+    return "".join("}" if c == "{" else "]" for c in reversed(stack))
+
+
+def _loads_object(raw: str) -> Optional[Dict[str, Any]]:
+    try:
+        obj = json.loads(raw)
+    except ValueError:
+        return None
+    return obj if isinstance(obj, dict) else None
+
+
+def _repair(text: str, start: int, scan: _Scan) -> Optional[Dict[str, Any]]:
+    """Close a truncated object: keep a cut-off string value if possible, else cut back to the last complete value."""
+    if scan.in_value_string:
+        body = text[start:]
+        # drop a dangling escape ("\", "\u00") or half a surrogate pair the cut left behind
+        if (len(body) - len(body.rstrip("\\"))) % 2:
+            body = body[:-1]
+        body = _DANGLING_ESCAPE.sub(r"\1", body)  # keep escaped backslashes before it
+        obj = _loads_object(body + '"' + _closers(scan.stack))
+        if obj is not None:
+            return obj
+    return _loads_object(text[start:scan.safe_end].rstrip().rstrip(",") + _closers(scan.safe_stack))
+
+
+def extract_json(text: str) -> Tuple[Optional[Dict[str, Any]], str]:
+    """
+    Find the JSON object in raw model output in linear time. Returns (object or None, path);
+    see PARSE_PATHS for the possible paths.
+    """
+    obj = _loads_object(text)
+    if obj is not None:
+        return obj, "direct"
+
+    pos = text.find("{")
+    repair_starts = 0
+    while pos != -1:
+        scan = _scan(text, pos)
+        if scan.end != -1:
+            obj = _loads_object(text[pos:scan.end])
+            if obj is not None:
+                return obj, "extracted"
+            pos = text.find("{", scan.end)  # balanced but invalid (e.g. prose in braces): try the next one
+            continue
+        obj = _repair(text, pos, scan)
+        if obj:  # an empty {} salvaged from a non-empty answer is no better than failing
+            return obj, "repaired"
+        repair_starts += 1
+        if repair_starts >= _MAX_REPAIR_STARTS:
+            break
+        pos = text.find("{", pos + 1)
+    return None, "failed"
+
 
 def coerce_json(obj) -> Dict[str, Any]:
+    """Model output (dict or raw text) → dict; see extract_json for how raw text is recovered."""
     if isinstance(obj, dict):
         return obj
     if isinstance(obj, str):
-        try:
-            return json.loads(obj)
-        except Exception:
-            # Try to extract JSON object from text
-            m = re.search(r"\{.*\}", obj, re.DOTALL)
-            if m:
-                return json.loads(m.group(0))
-    return {"summary": "", "decisions": [], "action_items": []}
+        data, path = extract_json(obj)
+        if path != "direct":
+            metrics.inc("parse_fallbacks_total", stage="coerce", path=path)
+        if data is not None:
+            return data
+    return dict(_EMPTY)
+
@@ -1,66 +1,362 @@
+import os
+import json
+import asyncio
 from datetime import datetime
-from .prompt import SUMMARY_PROMPT
-from .llm import call_llm_json
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from .prompt import SYSTEM_PROMPT, SUMMARY_PROMPT, REDUCE_SYSTEM_PROMPT, REDUCE_PROMPT, REASK_PROMPT
+from .llm import (
+    call_llm_json, acall_llm_json, run_sync, submit, stream_llm_text, finish_json, model_id,
+    SAMPLING_PARAMS, API_ERROR_PREFIX, NO_RESPONSE_SUMMARY,
+)
+from .cache import get_cache, cache_key, prompt_version
 from .parse import coerce_json
-from .models import MeetingResult, ActionItem
+from .models import MeetingResult, SummaryFields, response_schema
+from .chunking import estimate_tokens, split_transcript, segment_transcript, segment_hash
+from .stream_parse import IncrementalJSONParser
+from . import metrics, preprocess
 import time
 
 
+def _chunk_settings():
+    """Chunked-mode knobs (env-configurable)."""
+    threshold = int(os.getenv("SUMMARY_CHUNK_THRESHOLD_TOKENS", "6000"))
+    chunk_tokens = int(os.getenv("SUMMARY_CHUNK_TOKENS", "3000"))
+    max_concurrency = int(os.getenv("SUMMARY_MAX_CONCURRENCY", "4"))
+    return threshold, chunk_tokens, max(1, max_concurrency)
 
-def summarize_and_extract(title: str, transcript: str) -> MeetingResult:
+
+def _norm(text: str) -> str:
+    """Normalize a string for duplicate detection."""
+    return " ".join(str(text).lower().replace(".", " ").split())
+
+
+def _dedupe(items: List[Any]) -> List[str]:
+    """Keep first occurrence of each string, comparing normalized text."""
+    seen, out = set(), []
+    for item in items:
+        if not isinstance(item, str) or not item.strip():
+            continue
+        key = _norm(item)
+        if key not in seen:
+            seen.add(key)
+            out.append(item.strip())
+    return out
+
+
+def _merge_action_items(items: List[Any]) -> List[Dict[str, Any]]:
+    """
+    Merge action items from several chunks.
+    Same task + assignee counts as a duplicate; a concrete due date wins over a placeholder.
+    """
+    merged: Dict[tuple, Dict[str, Any]] = {}
+    for ai in items:
+        if not (isinstance(ai, dict) and ai.get("task")):
+            continue
+        assignee = ai.get("assignee") or "Unassigned"
+        key = (_norm(assignee), _norm(ai["task"]))
+        existing = merged.get(key)
+        if existing is None:
+            merged[key] = dict(ai, assignee=assignee)
+        elif (existing.get("due_date") or "—") == "—" and (ai.get("due_date") or "—") != "—":
+            existing["due_date"] = ai["due_date"]
+    return list(merged.values())
+
+
+def _reduce(partials: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Reduce step: merge per-chunk results into one.
+    Lists are merged/deduplicated locally; only the summary text needs one more LLM call.
     """
-    Single-step optimized summarization:
-    - Sends the entire transcript to the LLM once (no chunk loop)
-    - Uses structured JSON prompt (from prompt.py)
-    - Returns a fully populated MeetingResult object
-    - Fast: 10–15s typical latency
-    """
-    t_start = time.time()
-    print("DEBUG transcript being sent to LLM (first 500 chars):", transcript[:500])
-    print(f"📏 Transcript length: {len(transcript)} characters")
-
-    # ✅ Build the complete structured prompt
-    t_prompt = time.time()
-    full_prompt = SUMMARY_PROMPT + transcript
-    print(f"⚙️ Prompt built in {time.time() - t_prompt:.2f}s")
-
-    # 🚀 Call LLM once
-    t_llm = time.time()
-    raw = call_llm_json(full_prompt)
-    print(f"🧠 LLM call finished in {time.time() - t_llm:.2f}s")
-
-    # Parse and extract
-    t_parse = time.time()
-    data = coerce_json(raw)
-    print(f"🧩 JSON parsed in {time.time() - t_parse:.2f}s")
-
-    # ✅ Extract structured fields safely
-    summary = data.get("summary", "").strip()
-    decisions = data.get("decisions") or []
-    action_items_raw = data.get("action_items") or []
-    important_dates = data.get("important_dates") or []
-    other_notes = data.get("other_notes") or []
-
-    # ✅ Normalize action items
-    action_items = []
-    for ai in action_items_raw:
-        if isinstance(ai, dict) and ai.get("task"):
-            action_items.append(
-                ActionItem(
-                    assignee=ai.get("assignee") or "Unassigned",
-                    task=ai.get("task"),
-                    due_date=ai.get("due_date") or "—",
-                )
+    summaries = [(p.get("summary") or "").strip() for p in partials]
+    summaries = [s for s in summaries if s]
+
+    if len(summaries) <= 1:
+        summary = summaries[0] if summaries else ""
+    else:
+        listing = "\n".join(f"{i}. {s}" for i, s in enumerate(summaries, start=1))
+        with metrics.timer("summarize_step_seconds", step="reduce"):
+            reduced = coerce_json(
+                call_llm_json(REDUCE_PROMPT + listing, fields=("summary",), kind="reduce", system=REDUCE_SYSTEM_PROMPT)
             )
+        summary = (reduced.get("summary") or "").strip() or " ".join(summaries)
+
+    def collect(field):
+        return [x for p in partials for x in (p.get(field) or [])]
+
+    return {
+        "summary": summary,
+        "decisions": _dedupe(collect("decisions")),
+        "action_items": _merge_action_items(collect("action_items")),
+        "important_dates": _dedupe(collect("important_dates")),
+        "other_notes": _dedupe(collect("other_notes")),
+    }
+
+
+def _summarize_chunked(transcript: str, chunk_tokens: int, max_concurrency: int) -> Dict[str, Any]:
+    """
+    Map-reduce summarization for long transcripts:
+    - Splits on speaker/segment boundaries into ~chunk_tokens pieces
+    - Summarizes chunks concurrently (bounded by max_concurrency)
+    - Merges the partial results with a single reduce step
+    """
+    chunks = split_transcript(transcript, chunk_tokens)
+    metrics.inc("summarize_chunks_total", len(chunks))
+    return _reduce(_map_chunks(chunks, max_concurrency))
+
+
+def _map_chunks(chunks: List[str], max_concurrency: int) -> List[Dict[str, Any]]:
+    """Map step: summarize chunks concurrently (bounded by max_concurrency), results in input order."""
+    async def map_chunks() -> List[Dict[str, Any]]:
+        sem = asyncio.Semaphore(max_concurrency)
+
+        async def summarize_chunk(chunk: str) -> Dict[str, Any]:
+            async with sem:
+                return coerce_json(await acall_llm_json(SUMMARY_PROMPT + chunk))
+
+        return await asyncio.gather(*(summarize_chunk(c) for c in chunks))
+
+    with metrics.timer("summarize_step_seconds", step="map"):
+        return run_sync(map_chunks())
+
+
+class IncrementalSummarizer:
+    """
+    Summarize a transcript while it is still being produced (e.g. live audio transcription).
+    Lines are buffered; once the transcript is known to be long enough for chunked mode,
+    each full chunk is sent to the LLM immediately so the map step overlaps transcription.
+    Short transcripts never start early: finish() returns None and callers use the normal path.
+    """
+
+    def __init__(self):
+        self.threshold, self.chunk_tokens, _ = _chunk_settings()
+        self.lines: List[str] = []
+        self._pending: List[str] = []
+        self._pending_tokens = 0
+        self._carry = ""  # preprocessed tail of the last flush, shorter than a chunk
+        self._total_tokens = 0
+        self._futures = []
+
+    @property
+    def transcript(self) -> str:
+        return "\n".join(self.lines)
+
+    @property
+    def chunked(self) -> bool:
+        return self._total_tokens > self.threshold
+
+    def add(self, line: str):
+        n = estimate_tokens(line) + 1
+        self.lines.append(line)
+        self._pending.append(line)
+        self._pending_tokens += n
+        self._total_tokens += n
+        if self.chunked and self._pending_tokens >= self.chunk_tokens:
+            self._flush()
+
+    def _flush(self, final: bool = False):
+        """
+        Send the buffered lines as chunks of at most chunk_tokens, split like the non-incremental
+        path (the first flush holds everything up to the threshold). Until `final`, a last chunk
+        that is not nearly full waits for more lines.
+        """
+        text = "\n".join(t for t in (self._carry, preprocess.for_prompt("\n".join(self._pending))) if t)
+        self._pending, self._pending_tokens = [], 0
+        chunks = split_transcript(text, self.chunk_tokens) if text else []
+        self._carry = ""
+        if not final and chunks and estimate_tokens(chunks[-1]) < self.chunk_tokens * 0.9:
+            self._carry = chunks.pop()
+
+        async def summarize_chunk(chunk: str) -> Dict[str, Any]:
+            return coerce_json(await acall_llm_json(SUMMARY_PROMPT + chunk))
+
+        for chunk in chunks:
+            self._futures.append(submit(summarize_chunk(chunk)))
+            metrics.inc("summarize_chunks_total", early="1")
+
+    def finish(self) -> Optional[Dict[str, Any]]:
+        """Summarize the remainder and reduce; None if the transcript stayed below the threshold."""
+        if not self.chunked:
+            return None
+        self._flush(final=True)
+        data = _reduce([f.result() for f in self._futures])
+        cache = get_cache()
+        if cache is not None and _is_cacheable(data):
+            text = preprocess.for_prompt(self.transcript, record=False)
+            cache.put(_result_cache_key(text, self.threshold, self.chunk_tokens), data)
+        return data
 
-    print(f"✅ Total summarize_and_extract() time: {time.time() - t_start:.2f}s")
 
+def summarize_segments(
+    transcript: str,
+    known: Dict[str, Dict[str, Any]],
+) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    Incremental summarization for appended/edited transcripts:
+    - Splits the preprocessed transcript into content-defined segments (see chunking.segment_transcript)
+    - Only segments whose hash is not in `known` ({hash: partial result}) go to the LLM
+    - All partials are merged with the usual reduce step
+    Returns (data, segments) where segments are {"hash", "tokens", "partial"} rows to store;
+    "partial" is None for results that must not be reused (API errors).
+    """
+    _, chunk_tokens, max_concurrency = _chunk_settings()
+    texts = segment_transcript(preprocess.for_prompt(transcript), chunk_tokens)
+    hashes = [segment_hash(t) for t in texts]
+    todo = {h: t for h, t in zip(hashes, texts) if h not in known}
+    metrics.inc("segments_total", len(texts) - len(todo), reused="1")
+    metrics.inc("segments_total", len(todo), reused="0")
+
+    fresh = dict(zip(todo, _map_chunks(list(todo.values()), max_concurrency))) if todo else {}
+    partials = [known.get(h) or fresh[h] for h in hashes]
+    data = partials[0] if len(partials) == 1 else _reduce(partials)
+    segments = [
+        {"hash": h, "tokens": estimate_tokens(t), "partial": p if _is_cacheable(p) else None}
+        for h, t, p in zip(hashes, texts, partials)
+    ]
+    return data, segments
+
+
+def initial_segments(transcript: str, result: MeetingResult) -> List[Dict[str, Any]]:
+    """
+    Segment rows for a freshly summarized meeting. A transcript that is a single segment
+    reuses its full result as the partial, so the first append only pays for the new text;
+    longer ones get their per-segment partials on the first incremental update.
+    """
+    _, chunk_tokens, _ = _chunk_settings()
+    texts = segment_transcript(preprocess.for_prompt(transcript, record=False), chunk_tokens)
+    partial = result.model_dump(include={"summary", "decisions", "action_items", "important_dates", "other_notes"})
+    if len(texts) == 1 and _is_cacheable(partial):
+        return [{"hash": segment_hash(texts[0]), "tokens": estimate_tokens(texts[0]), "partial": partial}]
+    return []
+
+
+def _is_cacheable(data: Dict[str, Any]) -> bool:
+    """Never cache fallbacks produced by API errors or a missing provider."""
+    summary = (data.get("summary") or "").strip()
+    return not (summary.startswith(API_ERROR_PREFIX) or summary == NO_RESPONSE_SUMMARY)
+
+
+def is_error_result(m: MeetingResult) -> bool:
+    """True when the summary is a placeholder for a failed LLM call rather than a real result."""
+    return not _is_cacheable({"summary": m.summary})
+
+
+def _summarize_data(transcript: str, threshold: int, chunk_tokens: int, max_concurrency: int) -> Dict[str, Any]:
+    """Run the LLM (single-shot or chunked) and return the parsed JSON fields."""
+    if estimate_tokens(transcript) > threshold:
+        return _summarize_chunked(transcript, chunk_tokens, max_concurrency)
+
+    # 🚀 Call LLM once (latency/tokens are recorded by llm.py)
+    raw = call_llm_json(SUMMARY_PROMPT + transcript)
+    with metrics.timer("summarize_step_seconds", step="parse"):
+        return coerce_json(raw)
+
+
+def _result_cache_key(text: str, threshold: int, chunk_tokens: int) -> str:
+    """Keyed on the prompt text: transcripts differing only in fillers or timestamps share a result."""
+    return cache_key(
+        text,
+        prompt_version(SYSTEM_PROMPT, SUMMARY_PROMPT, REDUCE_SYSTEM_PROMPT, REDUCE_PROMPT, REASK_PROMPT, json.dumps(response_schema())),
+        model_id(),
+        dict(SAMPLING_PARAMS, chunk_threshold=threshold, chunk_tokens=chunk_tokens, preprocess=preprocess.cache_tag()),
+    )
+
+
+def _cached_data(text: str, threshold: int, chunk_tokens: int, max_concurrency: int) -> Dict[str, Any]:
+    """_summarize_data behind the result cache."""
+    def compute() -> Dict[str, Any]:
+        return _summarize_data(text, threshold, chunk_tokens, max_concurrency)
+
+    cache = get_cache()
+    if cache is None:
+        return compute()
+    return cache.get_or_compute(_result_cache_key(text, threshold, chunk_tokens), compute, cacheable=_is_cacheable)
+
+
+def build_result(title: str, transcript: str, data: Dict[str, Any]) -> MeetingResult:
+    """Validate the parsed LLM JSON into a MeetingResult (one pydantic pass, see models.SummaryFields)."""
+    fields = SummaryFields.model_validate(data)
     return MeetingResult(
         title=title,
         transcript=transcript,
-        summary=summary,
-        decisions=decisions,
-        action_items=action_items,
-        important_dates=important_dates,
-        other_notes=other_notes,
+        summary=fields.summary,
+        decisions=fields.decisions,
+        action_items=fields.action_items,
+        important_dates=fields.important_dates,
+        other_notes=fields.other_notes,
     )
+
+
+def summarize_and_extract(title: str, transcript: str) -> MeetingResult:
+    """
+    Summarize a transcript and extract structured fields:
+    - Short transcripts go to the LLM in a single request
+    - Long transcripts (over SUMMARY_CHUNK_THRESHOLD_TOKENS) use chunked map-reduce,
+      so latency stays roughly flat as transcript length grows
+    - Uses structured JSON prompt (from prompt.py) over the preprocessed transcript (see preprocess.py)
+    - Identical requests are served from the result cache (see cache.py)
+    - Returns a fully populated MeetingResult object (with the transcript as given)
+    """
+    metrics.sample_debug("transcript", transcript, max_chars=500)
+    threshold, chunk_tokens, max_concurrency = _chunk_settings()
+    text = preprocess.for_prompt(transcript)
+    mode = "chunked" if estimate_tokens(text) > threshold else "single"
+
+    with metrics.timer("summarize_seconds", mode=mode):
+        data = _cached_data(text, threshold, chunk_tokens, max_concurrency)
+        return build_result(title, transcript, data)
+
+
+def summarize_and_extract_stream(title: str, transcript: str) -> Iterator[Tuple[str, str, Any]]:
+    """
+    Streaming variant of summarize_and_extract for progressive UIs.
+    Yields ("partial" | "field" | "item", key, value) events as the model output arrives
+    (see stream_parse.py), then ("result", "", MeetingResult) once everything is parsed.
+    Cache hits and chunked transcripts are not streamed; their fields are yielded at once.
+    """
+    t_start = time.perf_counter()
+    threshold, chunk_tokens, max_concurrency = _chunk_settings()
+    text = preprocess.for_prompt(transcript)
+    if estimate_tokens(text) > threshold:
+        with metrics.timer("summarize_seconds", mode="chunked"):
+            data = _cached_data(text, threshold, chunk_tokens, max_concurrency)
+        pending, owner = None, False
+    else:
+        # Same lookup accounting and in-flight coalescing as _cached_data: a second identical
+        # request waits for this stream's result instead of calling the LLM again
+        cache = get_cache()
+        key = _result_cache_key(text, threshold, chunk_tokens)
+        data, pending, owner = cache.claim(key) if cache is not None else (None, None, True)
+        if pending is not None and not owner:
+            data = pending.result()
+
+    if data is None:
+        try:
+            parser = IncrementalJSONParser()
+            parts = []
+            first = True
+            for delta in stream_llm_text(SUMMARY_PROMPT + text):
+                if first:
+                    metrics.observe("summarize_first_token_seconds", time.perf_counter() - t_start)
+                    first = False
+                parts.append(delta)
+                for event in parser.feed(delta):
+                    yield event
+            # Missing/invalid fields (e.g. a cut-off answer) are re-asked for individually
+            data = finish_json(SUMMARY_PROMPT + text, "".join(parts))
+        except GeneratorExit:
+            if pending is not None:
+                cache.settle(key, pending, error=RuntimeError("Summary stream was abandoned"))
+            raise
+        except BaseException as e:
+            if pending is not None:
+                cache.settle(key, pending, error=e)
+            raise
+        if pending is not None:
+            cache.settle(key, pending, data, cacheable=_is_cacheable)
+    else:
+        for field in ("summary", "decisions", "action_items", "important_dates", "other_notes"):
+            yield ("field", field, data.get(field))
+
+    result = build_result(title, transcript, data)
+    metrics.observe("summarize_seconds", time.perf_counter() - t_start, mode="stream")
+    yield ("result", "", result)
@@ -0,0 +1,209 @@
+import os
+import re
+import time
+from collections import Counter
+from typing import Callable, List, Optional, Tuple
+
+from . import metrics, resources
+from .chunking import estimate_tokens
+
+# Prompt-side transcript preprocessing: only the text sent to the LLM is rewritten, the stored
+# transcript stays verbatim (its [mm:ss] timestamps are what users cite). Per line:
+# - timestamps ([00:12], 00:01:02.500 --> 00:01:05.000 subtitle cues) are dropped, and turns run
+#   together on one line are split at their labels
+# - filler words (um, uh, mm-hmm, comma-delimited "you know"; a bare "mm" only as a whole turn,
+#   so units like "5 mm" stay) and ASR artifacts (stutters like "I I", phrases looped three or
+#   more times) are removed; turns left empty are dropped
+# - consecutive turns of the same speaker are merged under one label (up to _MAX_TURN_CHARS);
+#   a segment repeated with the same timestamp (transcribed twice) is kept once
+# Bump VERSION whenever the output changes: it is part of the result-cache key.
+VERSION = "3"
+
+_MAX_TURN_CHARS = 2000  # merged turns stay well below a chunk (see chunking._split_oversized)
+_LABEL_RE = re.compile(r"^([A-Z][\w'\-]*(?: [A-Z0-9][\w'\-]*){0,3}):\s*(.*)$")
+_INLINE_LABEL_RE = re.compile(r"(?<=[.!?])\s+(?=[A-Z][\w'\-]*(?: [A-Z0-9][\w'\-]*){0,3}:\s)")  # "... ship. Bob: ..."
+_FILE_HEADER_RE = re.compile(r"^# File: ")
+_TIMESTAMP_RE = re.compile(r"^[\[(]?\d{1,2}:\d{2}(?::\d{2})?(?:[.,]\d{1,3})?[\])]?\s+")
+_CUE_RE = re.compile(r"^\d{1,2}:\d{2}(?::\d{2})?(?:[.,]\d{1,3})?\s*-->")
+_FILLER = r"(?:uh-huh|mm-hmm|u+h+m*|u+m+|e+r+m+|h+m+|mhm|a+h+|you know|i mean)"
+_INSERTED_FILLER_RE = re.compile(r",\s*" + _FILLER + r"\s*,", re.I)  # "I'll, uh, handle it"
+_FILLER_RE = re.compile(r"(?<![\w'\-])" + _FILLER.replace("|you know|i mean", "") + r"(?![\w'\-])[,.]?\s*", re.I)
+_LEADING_HEDGE_RE = re.compile(r"(?:^|(?<=[.!?] ))(?:you know|i mean),\s*(\w)", re.I)
+_BARE_MM_RE = re.compile(r"^m{2,}[.,!?]*$", re.I)  # "Mm." backchannel; "mm" inside a turn is a unit
+_LOOP_RE = re.compile(r"\b((?:[\w'\-]++[,.!?]?+\s++){1,6}?)\1{2,}", re.I)
+_STUTTER_RE = re.compile(r"\b(?!had\b)([\w']{1,3}+)(?![\w'])(?:\s+\1\b)+", re.I)
+_SPACE_BEFORE_PUNCT_RE = re.compile(r"\s+([,.!?;:])")
+_DOUBLE_PUNCT_RE = re.compile(r"([,.!?;:]),+")
+_PAGE_EDGE_LINES = 2
+_MAX_BOILERPLATE_CHARS = 100
+
+
+def enabled() -> bool:
+    """PREPROCESS (default on): shrink transcripts before they are sent to the LLM."""
+    return os.getenv("PREPROCESS", "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+def cache_tag() -> str:
+    """Preprocessing part of the result-cache key."""
+    return VERSION if enabled() else "off"
+
+
+# --- Token counting ---
+def _load_tokenizer() -> Optional[Callable[[str], int]]:
+    """
+    Token counter for TOKENIZER: a tokenizer.json path or Hugging Face repo id (`tokenizers`
+    package), or `tiktoken:<encoding>`. None (unset, or the package/file is unavailable)
+    means the chars-per-token estimate is used.
+    """
+    spec = os.getenv("TOKENIZER", "").strip()
+    if not spec:
+        return None
+    try:
+        if spec.startswith("tiktoken:"):
+            tiktoken = resources.optional_import("tiktoken")
+            if tiktoken is None:
+                raise ImportError("the tiktoken package is not installed")
+            encoding = tiktoken.get_encoding(spec.split(":", 1)[1])
+            return lambda text: len(encoding.encode(text, disallowed_special=()))
+        tokenizers = resources.optional_import("tokenizers")
+        if tokenizers is None:
+            raise ImportError("the tokenizers package is not installed")
+        loader = tokenizers.Tokenizer.from_file if os.path.exists(spec) else tokenizers.Tokenizer.from_pretrained
+        tokenizer = loader(spec)
+        return lambda text: len(tokenizer.encode(text, add_special_tokens=False).ids)
+    except Exception as e:
+        print(f"⚠️ Could not load TOKENIZER={spec!r} ({e}); estimating tokens from characters")
+        return None
+
+
+resources.register("tokenizer", _load_tokenizer)
+
+
+def count_tokens(text: str) -> int:
+    """Prompt tokens of `text` with the model's tokenizer (TOKENIZER), else estimated."""
+    counter = resources.get("tokenizer")
+    return counter(text) if counter is not None else estimate_tokens(text)
+
+
+# --- PDF page boilerplate ---
+def _boilerplate_key(line: str) -> str:
+    """Page headers/footers differ only in their numbers ("Page 3 of 12")."""
+    return re.sub(r"\d+", "#", " ".join(line.lower().split()))
+
+
+def strip_page_boilerplate(pages: List[str]) -> List[str]:
+    """
+    Remove running headers/footers from extracted PDF pages: short lines among the first or
+    last two of a page that recur (numbers aside) on at least half of the pages (3 or more).
+    Speaker turns ("Alice: ...") are never taken for boilerplate.
+    """
+    if len(pages) < 3:
+        return pages
+    edges = []
+    for text in pages:
+        lines = [line for line in text.splitlines() if line.strip()]
+        edges.append({
+            _boilerplate_key(line) for line in lines[:_PAGE_EDGE_LINES] + lines[-_PAGE_EDGE_LINES:]
+            if len(line.strip()) <= _MAX_BOILERPLATE_CHARS and not _LABEL_RE.match(line.strip())
+        })
+    counts = Counter(key for keys in edges for key in keys)
+    boilerplate = {key for key, n in counts.items() if n >= max(3, len(pages) / 2)}
+    if not boilerplate:
+        return pages
+
+    out = []
+    for text in pages:
+        lines = text.splitlines()
+        nonblank = [i for i, line in enumerate(lines) if line.strip()]
+        edge = set(nonblank[:_PAGE_EDGE_LINES] + nonblank[-_PAGE_EDGE_LINES:])
+        out.append("\n".join(
+            line for i, line in enumerate(lines) if not (i in edge and _boilerplate_key(line) in boilerplate)
+        ))
+    return out
+
+
+# --- Transcript text ---
+def clean_text(text: str) -> str:
+    """Fillers, stutters and looped phrases out of one turn's text."""
+    if _BARE_MM_RE.match(text.strip()):
+        return ""
+    starts_upper = text[:1].isupper()
+    text = _INSERTED_FILLER_RE.sub(" ", text)
+    text = _FILLER_RE.sub("", _LEADING_HEDGE_RE.sub(lambda m: m.group(1).upper(), text))
+    text = _LOOP_RE.sub(r"\1", text + " ")
+    text = _STUTTER_RE.sub(r"\1", text)
+    text = _DOUBLE_PUNCT_RE.sub(r"\1", _SPACE_BEFORE_PUNCT_RE.sub(r"\1", " ".join(text.split())))
+    text = text.lstrip(",.;: ")
+    if starts_upper and text[:1].islower():
+        text = text[0].upper() + text[1:]
+    return text if any(c.isalnum() for c in text) else ""
+
+
+def _parse_line(line: str) -> Tuple[Optional[str], str, str]:
+    """(speaker or None, timestamp or "", text) with leading timestamps removed, before and after the label."""
+    stamp = _TIMESTAMP_RE.match(line)
+    line = line[stamp.end():] if stamp else line
+    m = _LABEL_RE.match(line)
+    if not m:
+        return None, stamp.group().strip() if stamp else "", line
+    text = m.group(2)
+    inner = _TIMESTAMP_RE.match(text)
+    if inner:
+        stamp, text = inner, text[inner.end():]
+    return m.group(1), stamp.group().strip() if stamp else "", text
+
+
+def _lines(transcript: str) -> List[str]:
+    """
+    Non-empty lines without subtitle cue headers (WEBVTT, cue numbers, `-->` timings); a line
+    holding several turns ("Alice: ... ship. Bob: ...") is split into one line per turn.
+    """
+    lines = [part.strip() for line in transcript.splitlines() for part in _INLINE_LABEL_RE.split(line)]
+    lines = [line for line in lines if line and line != "WEBVTT"]
+    return [
+        line for i, line in enumerate(lines)
+        if not _CUE_RE.match(line) and not (line.isdigit() and i + 1 < len(lines) and _CUE_RE.match(lines[i + 1]))
+    ]
+
+
+def preprocess(transcript: str) -> str:
+    """The transcript as it goes into a prompt (see the module comment)."""
+    turns: List[List[Optional[str]]] = []  # [speaker, text]; speaker None for unlabeled lines and file headers
+    previous: Tuple[Optional[str], str, str] = (None, "", "")
+    for line in _lines(transcript):
+        if _FILE_HEADER_RE.match(line):
+            turns.append([None, line])
+            previous = (None, "", "")
+            continue
+        speaker, stamp, text = _parse_line(line)
+        text = clean_text(text)
+        if not text:
+            continue
+        if stamp and (speaker, stamp, text) == previous:  # the same segment transcribed twice
+            continue
+        previous = (speaker, stamp, text)
+        last = turns[-1] if turns else None
+        if speaker and last and last[0] == speaker and len(last[1]) + len(text) < _MAX_TURN_CHARS:
+            last[1] = f"{last[1]} {text}"
+            continue
+        turns.append([speaker, text])
+    return "\n".join(f"{speaker}: {text}" if speaker else text for speaker, text in turns)
+
+
+def for_prompt(transcript: str, record: bool = True) -> str:
+    """
+    preprocess() when enabled. With `record`, the time taken and the prompt tokens before/after
+    go to metrics, and the compression ratio to the sampled debug log (off for re-derivations of
+    the same text).
+    """
+    if not enabled() or not transcript:
+        return transcript
+    start = time.perf_counter()
+    out = preprocess(transcript)
+    if record:
+        metrics.observe("preprocess_seconds", time.perf_counter() - start)
+        before, after = count_tokens(transcript), count_tokens(out)
+        metrics.inc("preprocess_tokens_total", before, stage="before")
+        metrics.inc("preprocess_tokens_total", after, stage="after")
+        metrics.sample_debug("preprocess", f"{before:,} → {after:,} tokens ({after / max(1, before):.0%})")
+    return out
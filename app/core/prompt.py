@@ -1,26 +1,18 @@
-SUMMARY_PROMPT = """
-You are an intelligent meeting summarizer AI.
-Your task is to read a meeting or conversation transcript and return a structured summary **in pure JSON format**.
+# Sent once per request as the system message. The JSON shape itself is not spelled out here:
+# it goes in `response_format` (built from models.MeetingResult, see models.response_schema),
+# or is appended via SCHEMA_HINT for providers that don't support structured output.
+SYSTEM_PROMPT = """
+You are an intelligent meeting summarizer.
+Read a meeting or conversation transcript and return a structured summary as pure JSON.
 Do not include explanations, markdown, or text outside the JSON.
 
-### Your ONLY output must strictly follow this JSON schema:
-{
-  "summary": "string",
-  "decisions": ["string"],
-  "action_items": [
-    {"assignee": "string", "task": "string", "due_date": "string or '—'"}
-  ],
-  "important_dates": ["string"],
-  "other_notes": ["string"]
-}
-
 ### CRITICAL RULES:
-1. Output must be valid JSON.
+1. Output must be valid JSON with exactly the requested fields.
 2. Use participant names exactly as they appear (e.g., "Tom", "Samir", "Will").
-3. Detect both explicit and **implied** action items.  
+3. Detect both explicit and **implied** action items.
    - Example: "We look forward to feedback" → task: "Collect user feedback".
    - Example: "Program is in beta and will soon be released" → task: "Prepare for public release".
-4. If no person is mentioned, use `"assignee": "Unassigned"`.
+4. If no person is mentioned, use `"assignee": "Unassigned"`; if there is no due date, use `"due_date": "—"`.
 5. Include approximate or vague time phrases ("soon", "next week", "in Q2") under `"important_dates"`.
 6. Use concise professional language for the summary (3–6 sentences max).
 7. Separate:
@@ -34,16 +26,31 @@ Transcript:
 Alice: The product is in beta. We’ll launch soon. Bob: Let’s collect feedback and schedule the next demo.
 
 ### Example Output:
-{
-  "summary": "The team discussed the product’s beta phase and agreed to prepare for launch. Feedback collection and demo scheduling were planned.",
-  "decisions": ["Prepare for launch from beta."],
-  "action_items": [
-    {"assignee": "Bob", "task": "Collect user feedback", "due_date": "—"},
-    {"assignee": "Unassigned", "task": "Schedule next demo", "due_date": "—"}
-  ],
-  "important_dates": ["Soon"],
-  "other_notes": []
-}
-
-Now, summarize the following transcript accurately:
+{"summary": "The team discussed the product’s beta phase and agreed to prepare for launch. Feedback collection and demo scheduling were planned.", "decisions": ["Prepare for launch from beta."], "action_items": [{"assignee": "Bob", "task": "Collect user feedback", "due_date": "—"}, {"assignee": "Unassigned", "task": "Schedule next demo", "due_date": "—"}], "important_dates": ["Soon"], "other_notes": []}
+""".strip()
+
+# Appended to the system message when the schema can't be sent as `response_format`.
+SCHEMA_HINT = "\n\nReturn ONLY a JSON object matching this JSON schema:\n{schema}"
+
+# User message prefixes: the transcript (or partial summaries) follow directly.
+SUMMARY_PROMPT = "Transcript:\n"
+
+# System message and user prefix for the reduce step of chunked summarization.
+REDUCE_SYSTEM_PROMPT = """
+You are merging partial summaries of consecutive sections of ONE long meeting.
+Write a single concise professional summary of the whole meeting (4–8 sentences) that
+covers the main topics in the order they were discussed. Do not repeat points, do not
+mention "parts" or "sections", and never invent facts that are not in the partial summaries.
+
+Return ONLY a JSON object with a single "summary" field.
+""".strip()
+
+REDUCE_PROMPT = "Partial summaries, in meeting order:\n"
+
+# Targeted re-ask: only the fields that were missing or invalid in the first answer are
+# requested again (with a schema restricted to them), instead of the whole summary.
+REASK_PROMPT = """
+Your previous answer for the transcript below was incomplete: the fields {fields} were missing
+or invalid. Return ONLY a JSON object with exactly these fields, following the same rules.
+
 """
@@ -0,0 +1,334 @@
+import re
+import json
+import time
+import asyncio
+from collections import Counter, deque
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+from . import metrics
+from .chunking import estimate_tokens
+from .dates import WEEKDAYS, MONTHS
+from .models import SUMMARY_FIELDS
+from .prompt import SUMMARY_PROMPT, REDUCE_PROMPT
+
+# LLM backends behind one interface (see llm.get_provider for how they are configured):
+# - Provider.chat(payload) takes an OpenAI-style chat payload and returns a chat completion body
+# - Provider.stream(payload) yields content deltas
+# - HedgedProvider races a backup provider against a slow or failing primary
+
+
+def content_of(data: Dict[str, Any]) -> str:
+    """Message text of a chat completion body."""
+    try:
+        return data["choices"][0]["message"]["content"] or ""
+    except (KeyError, IndexError, TypeError):
+        return (data.get("choices") or [{}])[0].get("text", "") or ""
+
+
+class Provider:
+    """Base class: subclasses implement chat(); stream() defaults to the whole answer as one delta."""
+
+    name = "provider"
+
+    async def chat(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    async def stream(self, payload: Dict[str, Any]) -> AsyncIterator[str]:
+        content = content_of(await self.chat(payload))
+        if content:
+            yield content
+
+    async def aclose(self):
+        pass
+
+
+# --- Deterministic offline mock: extractive summary straight from the transcript ---
+_TURN_RE = re.compile(r"^([A-Z][\w'\-]*(?: [A-Z0-9][\w'\-]*){0,3}):\s*(.*)$")
+# A label after a sentence end starts a new turn on the same line ("... ship. Bob: I will ...")
+_INLINE_TURN_RE = re.compile(r"(?<=[.!?])\s+(?=[A-Z][\w'\-]*(?: [A-Z0-9][\w'\-]*){0,3}:\s)")
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+_NUMBERED_RE = re.compile(r"^\d+\.\s+")
+_WORD_RE = re.compile(r"[a-z][a-z'\-]+")
+_DECISION_RE = re.compile(r"\b(decided|decide|agreed|agree|approved|approve|go with|settled on|sign(?:ed)? off)\b", re.I)
+_ACTION_RE = re.compile(
+    r"(?:(?i:\b(?:i'll|i will|we'll|we will|need to|let's|please|action item|todo|follow up)\b)|"
+    r"\b(?P<name>[A-Z][a-z]+)(?: will| is going to| needs to| should|'ll)\b)\s*(?P<task>.*)"
+)
+_NOT_NAMES = frozenset("It That This There We They He She You Who What Which Everyone Someone Somebody Nobody".split())
+_DATE_PATTERN = (
+    r"(?:(?:next|this) (?:week|month|quarter|" + "|".join(WEEKDAYS) + r")|"
+    + "|".join(WEEKDAYS) + r"|tomorrow|today|tonight|end of (?:the )?(?:day|week|month|quarter|year)|eod|eow|"
+    r"q[1-4]|soon|in \d+ (?:days?|weeks?|months?)|\d{4}-\d{1,2}-\d{1,2}|\d{1,2}/\d{1,2}(?:/\d{2,4})?|"
+    r"(?:" + "|".join(sorted(MONTHS, key=len, reverse=True)) + r")\.? \d{1,2}(?:st|nd|rd|th)?)"
+)
+_DATE_RE = re.compile(r"\b" + _DATE_PATTERN + r"\b", re.I)
+_DUE_RE = re.compile(r"\b(?:by|on|before|until|due|no later than)\s+(" + _DATE_PATTERN + r")\b", re.I)
+_STOPWORDS = frozenset(
+    "the a an and or but if so to of in on at for with from by as is are was were be been it this that "
+    "we you they he she i me my our your their its not no yes do does did have has had will would can "
+    "could should just also then than there here what which who when how all any some about into out up "
+    "let's okay ok yeah um uh like really think going get got".split()
+)
+
+
+def _turns(text: str) -> List[Tuple[str, str]]:
+    """
+    (speaker, text) per turn: each non-empty line, split again where a label follows a sentence
+    end (flattened transcripts); text without a speaker label keeps the previous speaker.
+    """
+    turns, speaker = [], "Unassigned"
+    for line in text.splitlines():
+        line = _NUMBERED_RE.sub("", line.strip())
+        for part in _INLINE_TURN_RE.split(line) if line else []:
+            m = _TURN_RE.match(part)
+            if m:
+                speaker, part = m.group(1), m.group(2)
+            turns.append((speaker, part))
+    return turns
+
+
+def _sentences(turns: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    return [(speaker, s.strip()) for speaker, text in turns for s in _SENTENCE_RE.split(text) if s.strip()]
+
+
+def _dedupe(items: List[str], limit: int) -> List[str]:
+    seen, out = set(), []
+    for item in items:
+        key = item.lower()
+        if key not in seen:
+            seen.add(key)
+            out.append(item)
+    return out[:limit]
+
+
+def _extractive_summary(sentences: List[Tuple[str, str]], max_sentences: int) -> str:
+    """Top sentences by content-word frequency, in transcript order."""
+    words = [[w for w in _WORD_RE.findall(s.lower()) if w not in _STOPWORDS] for _, s in sentences]
+    freq = Counter(w for ws in words for w in ws)
+    scored = sorted(
+        range(len(sentences)),
+        key=lambda i: (-sum(freq[w] for w in words[i]) / (len(words[i]) ** 0.5 if words[i] else 1), i),
+    )
+    keep = sorted(scored[:max_sentences])
+    return " ".join(sentences[i][1] for i in keep)
+
+
+def _action_item(speaker: str, sentence: str) -> Optional[Dict[str, str]]:
+    m = _ACTION_RE.search(sentence)
+    if not m:
+        return None
+    task = m.group("task").strip().rstrip(".!?")
+    if len(task.split()) < 2 or m.group("name") in _NOT_NAMES:  # "It will be fine" is no commitment
+        return None
+    opener = m.group(0).split()[0].lower()
+    if m.group("name"):
+        assignee = m.group("name")
+    elif opener in ("i'll", "i"):
+        assignee = speaker
+    else:
+        assignee = "Unassigned"
+    due = _DUE_RE.search(sentence)
+    return {"assignee": assignee, "task": task[0].upper() + task[1:], "due_date": due.group(1) if due else "—"}
+
+
+def mock_answer(text: str, fields: Sequence[str] = SUMMARY_FIELDS) -> Dict[str, Any]:
+    """
+    Deterministic stand-in for the model: the same transcript always gives the same answer.
+    - summary: the highest-scoring sentences (content-word frequency), in order
+    - decisions / action items: sentences with agreement or commitment phrases;
+      the assignee is the named person, the speaker for "I'll ...", otherwise "Unassigned"
+    - important_dates: date phrases ("Friday", "next week", "Oct 3", "Q2"); other_notes: open questions
+    """
+    sentences = _sentences(_turns(text))
+    answer: Dict[str, Any] = {}
+    if "summary" in fields:
+        answer["summary"] = _extractive_summary(sentences, max(2, min(5, len(sentences) // 8)))
+    if "decisions" in fields:
+        answer["decisions"] = _dedupe([s for _, s in sentences if _DECISION_RE.search(s)], 10)
+    if "action_items" in fields:
+        items = [ai for ai in (_action_item(sp, s) for sp, s in sentences) if ai]
+        seen, answer["action_items"] = set(), []
+        for ai in items:
+            key = (ai["assignee"].lower(), ai["task"].lower())
+            if key not in seen and len(seen) < 15:
+                seen.add(key)
+                answer["action_items"].append(ai)
+    if "important_dates" in fields:
+        answer["important_dates"] = _dedupe([m.group(0) for _, s in sentences for m in _DATE_RE.finditer(s)], 10)
+    if "other_notes" in fields:
+        answer["other_notes"] = _dedupe([f"Open question: {s}" for _, s in sentences if s.endswith("?")], 3)
+    return answer
+
+
+class MockProvider(Provider):
+    """
+    Offline provider (LLM_PROVIDER=mock): answers from the transcript itself via mock_answer,
+    honouring the requested schema fields. `latency` simulates a slow model (seconds).
+    """
+
+    name = "mock"
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+
+    def _answer(self, payload: Dict[str, Any]) -> str:
+        prompt = payload["messages"][-1]["content"]
+        for prefix in (SUMMARY_PROMPT, REDUCE_PROMPT):
+            if prefix in prompt:
+                prompt = prompt.split(prefix, 1)[1]
+        fmt = payload.get("response_format") or {}
+        fields = list(((fmt.get("json_schema") or {}).get("schema") or {}).get("properties") or SUMMARY_FIELDS)
+        return json.dumps(mock_answer(prompt, fields), ensure_ascii=False)
+
+    async def chat(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        content = self._answer(payload)
+        prompt_tokens = sum(estimate_tokens(m["content"]) for m in payload["messages"])
+        return {
+            "choices": [{"message": {"role": "assistant", "content": content}}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": estimate_tokens(content)},
+        }
+
+    async def stream(self, payload: Dict[str, Any]) -> AsyncIterator[str]:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        content = self._answer(payload)
+        for i in range(0, len(content), 32):
+            yield content[i:i + 32]
+
+
+# --- Hedging / failover ---
+class _Latency:
+    """Recent latencies of one provider, for the adaptive hedge delay."""
+
+    def __init__(self, window: int = 200):
+        self.samples: deque = deque(maxlen=window)
+
+    def add(self, seconds: float):
+        self.samples.append(seconds)
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class HedgedProvider(Provider):
+    """
+    Primary + backup provider:
+    - Hedging: if the primary hasn't answered after `hedge_after` seconds (None = its recent
+      `quantile` latency, once `min_samples` are known; `initial_delay` before that), the same
+      request goes to the backup too and the first successful answer wins; the other is cancelled
+    - Failover: if the primary fails, the backup is asked right away
+    - Streams hedge on time to first delta; once a delta has been yielded there is no switching
+    """
+
+    def __init__(
+        self,
+        primary: Provider,
+        backup: Provider,
+        hedge_after: Optional[float] = None,
+        quantile: float = 0.95,
+        min_delay: float = 0.25,
+        initial_delay: float = 5.0,
+        min_samples: int = 20,
+        hedging: bool = True,
+    ):
+        self.primary = primary
+        self.backup = backup
+        self.name = f"{primary.name}+{backup.name}"
+        self.hedge_after = hedge_after
+        self.quantile = quantile
+        self.min_delay = min_delay
+        self.initial_delay = initial_delay
+        self.min_samples = min_samples
+        self.hedging = hedging
+        self._latency = {"chat": _Latency(), "stream": _Latency()}
+
+    def hedge_delay(self, kind: str = "chat") -> Optional[float]:
+        """Seconds to wait for the primary before hedging (None = failover only)."""
+        if not self.hedging:
+            return None
+        if self.hedge_after is not None:
+            return self.hedge_after
+        latency = self._latency[kind]
+        if len(latency.samples) < self.min_samples:
+            return self.initial_delay
+        return max(self.min_delay, latency.quantile(self.quantile))
+
+    async def _race(self, kind: str, start_primary, start_backup, discard=None):
+        """
+        Run start_primary(); add start_backup() when the hedge delay passes or the primary fails.
+        Returns (provider, result) of the first success; raises the primary's error if both fail.
+        `discard` is awaited with the result of a request that also succeeded but lost.
+        """
+        t0 = time.perf_counter()
+        primary = asyncio.ensure_future(start_primary())
+        tasks = {primary: self.primary}
+        try:
+            await asyncio.wait({primary}, timeout=self.hedge_delay(kind))
+            if primary.done() and primary.exception() is None:
+                self._latency[kind].add(time.perf_counter() - t0)
+                return self.primary, primary.result()
+            reason = "error" if primary.done() else "slow"
+            metrics.inc("llm_hedges_total", reason=reason)
+            if reason == "error":
+                print(f"⚠️ {self.primary.name} failed ({primary.exception()!r}), failing over to {self.backup.name}")
+            backup = asyncio.ensure_future(start_backup())
+            tasks[backup] = self.backup
+            pending = {t for t in tasks if not t.done()} | {backup}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                winners = [t for t in sorted(done, key=lambda t: t is not primary) if t.exception() is None]
+                if winners:
+                    if winners[0] is primary:
+                        self._latency[kind].add(time.perf_counter() - t0)
+                    for loser in winners[1:]:
+                        if discard is not None:
+                            await discard(loser.result())
+                    metrics.inc("llm_hedge_winner_total", provider=tasks[winners[0]].name)
+                    return tasks[winners[0]], winners[0].result()
+            raise primary.exception()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                    if task is primary:
+                        # A cancelled primary was at least this slow; keeps the quantile honest
+                        self._latency[kind].add(time.perf_counter() - t0)
+
+    async def chat(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        _, data = await self._race("chat", lambda: self.primary.chat(payload), lambda: self.backup.chat(payload))
+        return data
+
+    async def stream(self, payload: Dict[str, Any]) -> AsyncIterator[str]:
+        async def first_delta(provider: Provider):
+            agen = provider.stream(payload)
+            try:
+                return agen, await agen.__anext__()
+            except StopAsyncIteration:
+                return agen, None
+            except BaseException:
+                await agen.aclose()
+                raise
+
+        async def discard(result):
+            await result[0].aclose()
+
+        _, (agen, first) = await self._race(
+            "stream", lambda: first_delta(self.primary), lambda: first_delta(self.backup), discard
+        )
+        try:
+            if first is None:
+                return
+            yield first
+            async for delta in agen:
+                yield delta
+        finally:
+            await agen.aclose()
+
+    async def aclose(self):
+        await self.primary.aclose()
+        await self.backup.aclose()
@@ -0,0 +1,220 @@
+import os
+import time
+import importlib
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from . import metrics
+
+# Process-wide registry for expensive resources (ML models, heavy optional modules):
+# - Nothing is loaded at import time; get(name) loads on first use, once, even under concurrency
+# - warm_up() loads ahead of time (optionally in a background thread), unload() frees a resource
+# - Resources registered with an idle TTL are unloaded by a janitor thread once nobody has
+#   used them for that long (use() marks a resource busy so it is never evicted mid-call)
+# - Framework-agnostic: the same registry serves Streamlit, the CLI and spawned worker
+#   processes (each process has its own registry and registers its loaders on import)
+
+_MISSING = object()
+
+
+class _Resource:
+    __slots__ = ("loader", "unloader", "idle_ttl", "value", "lock", "last_used", "in_use")
+
+    def __init__(
+        self,
+        loader: Callable[[], Any],
+        unloader: Optional[Callable[[Any], None]],
+        idle_ttl: float,
+    ):
+        self.loader = loader
+        self.unloader = unloader
+        self.idle_ttl = idle_ttl
+        self.value = _MISSING
+        self.lock = threading.Lock()
+        self.last_used = time.monotonic()
+        self.in_use = 0
+
+
+_resources: Dict[str, _Resource] = {}
+_registry_lock = threading.Lock()
+
+
+def register(
+    name: str,
+    loader: Callable[[], Any],
+    unloader: Optional[Callable[[Any], None]] = None,
+    idle_ttl: float = 0,
+):
+    """
+    Declare how to load (and optionally release) a resource. Registering a name again replaces
+    its loader and drops any value loaded with the old one (e.g. a worker changing model settings).
+    With idle_ttl > 0 (seconds), the resource is unloaded after being idle that long.
+    """
+    with _registry_lock:
+        old = _resources.get(name)
+        _resources[name] = _Resource(loader, unloader, idle_ttl)
+    if old is not None and old.value is not _MISSING and old.unloader:
+        old.unloader(old.value)
+
+
+def _get_entry(name: str) -> _Resource:
+    try:
+        return _resources[name]
+    except KeyError:
+        raise KeyError(f"Unknown resource {name!r}; registered: {sorted(_resources)}") from None
+
+
+def get(name: str) -> Any:
+    """Return the resource, loading it on first use. A loader's return value (even None) is cached."""
+    entry = _get_entry(name)
+    entry.last_used = time.monotonic()
+    value = entry.value
+    if value is not _MISSING:
+        return value
+    with entry.lock:
+        if entry.value is _MISSING:
+            start = time.perf_counter()
+            entry.value = entry.loader()
+            metrics.observe("resource_load_seconds", time.perf_counter() - start, resource=name)
+            if entry.idle_ttl > 0:
+                _start_janitor()
+        return entry.value
+
+
+@contextmanager
+def use(name: str) -> Iterator[Any]:
+    """get() for the duration of a block; the resource is not evicted while the block runs."""
+    entry = _get_entry(name)
+    with entry.lock:
+        entry.in_use += 1
+    try:
+        yield get(name)
+    finally:
+        with entry.lock:
+            entry.in_use -= 1
+            entry.last_used = time.monotonic()
+
+
+def is_loaded(name: str) -> bool:
+    entry = _resources.get(name)
+    return entry is not None and entry.value is not _MISSING
+
+
+def registered() -> List[str]:
+    return sorted(_resources)
+
+
+def loaded() -> List[str]:
+    return [name for name in registered() if is_loaded(name)]
+
+
+def unload(name: str) -> bool:
+    """Release a loaded resource (calls its unloader); the next get() loads it again."""
+    entry = _get_entry(name)
+    with entry.lock:
+        if entry.value is _MISSING:
+            return False
+        value, entry.value = entry.value, _MISSING
+    if entry.unloader:
+        entry.unloader(value)
+    print(f"♻️ Unloaded {name}")
+    return True
+
+
+def unload_all():
+    for name in loaded():
+        unload(name)
+
+
+# --- Idle eviction ---
+_janitor_started = False
+
+
+def evict_idle(now: Optional[float] = None) -> List[str]:
+    """Unload every resource whose idle TTL has passed and that is not in use; returns their names."""
+    now = time.monotonic() if now is None else now
+    evicted = []
+    for name, entry in list(_resources.items()):
+        if entry.idle_ttl > 0 and entry.value is not _MISSING and not entry.in_use:
+            if now - entry.last_used >= entry.idle_ttl:
+                with entry.lock:
+                    # re-check under the lock: a use() may have started meanwhile
+                    if entry.in_use or entry.value is _MISSING:
+                        continue
+                    value, entry.value = entry.value, _MISSING
+                if entry.unloader:
+                    entry.unloader(value)
+                metrics.inc("resource_evictions_total", resource=name)
+                print(f"♻️ Unloaded {name} (idle for {now - entry.last_used:.0f}s)")
+                evicted.append(name)
+    return evicted
+
+
+def _start_janitor():
+    global _janitor_started
+    with _registry_lock:
+        if _janitor_started:
+            return
+        _janitor_started = True
+
+    def loop():
+        while True:
+            ttls = [e.idle_ttl for e in list(_resources.values()) if e.idle_ttl > 0]
+            time.sleep(max(1.0, min(ttls + [60.0]) / 4))
+            try:
+                evict_idle()
+            except Exception as e:
+                print("⚠️ Idle eviction failed:", e)
+
+    threading.Thread(target=loop, name="resource-janitor", daemon=True).start()
+
+
+def warm_up(names: Optional[Iterable[str]] = None, background: bool = False) -> Optional[threading.Thread]:
+    """
+    Load resources ahead of first use (all registered ones when `names` is None).
+    With background=True the loads run in a daemon thread, which is returned.
+    Failures are logged, not raised: a resource that can't warm up still loads (or fails) on use.
+    """
+    names = list(names) if names is not None else registered()
+
+    def run():
+        for name in names:
+            try:
+                get(name)
+            except Exception as e:
+                print(f"⚠️ Warm-up of {name} failed:", e)
+
+    if not background:
+        run()
+        return None
+    thread = threading.Thread(target=run, name="warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
+_env_warm_up_started = False
+
+
+def warm_up_from_env(default: str = "") -> Optional[threading.Thread]:
+    """
+    Background warm-up of the comma-separated PRELOAD_RESOURCES (e.g. "pypdf,docx,whisper"),
+    or of `default` when the variable is unset. Only the first call per process does anything,
+    so it is safe on every Streamlit rerun.
+    """
+    global _env_warm_up_started
+    names = [n.strip() for n in os.getenv("PRELOAD_RESOURCES", default).split(",") if n.strip()]
+    with _registry_lock:
+        if _env_warm_up_started or not names:
+            return None
+        _env_warm_up_started = True
+    print(f"🔥 Warming up {', '.join(names)}")
+    return warm_up(names, background=True)
+
+
+def optional_import(module: str) -> Optional[Any]:
+    """Import a module, or return None if it (or one of its native dependencies) is unavailable."""
+    try:
+        return importlib.import_module(module)
+    except Exception:
+        return None
@@ -0,0 +1,301 @@
+import os
+import re
+import shutil
+import zlib
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from . import metrics
+
+try:
+    import fcntl
+except ImportError:  # Windows: the in-process lock still serializes one server's writers
+    fcntl = None
+
+# Local semantic index over meeting summaries, decisions and action items:
+# - embed(): hashed bag-of-words vectors (unigrams + bigrams, signed feature hashing), CPU-only,
+#   no model download; similar wording → high cosine similarity
+# - VectorIndex: one append-only file next to the DB (semantic/vectors-<dim>-<dtype>.idx),
+#   memory-mapped for queries; a fixed-size record per item: kind, alive flag, item id,
+#   meeting id, scale and the vector (int8 with a per-row scale, or float32)
+#   updates mark a meeting's old rows dead and append new ones, so nothing is rewritten;
+#   rebuild() compacts dead rows away and swaps the file in atomically
+# - search(): exact top-k by dot product over the mapped file, converted block by block
+KINDS = ("summary", "decision", "action_item")
+_BLOCK_ROWS = 1024  # rows converted to float32 at a time (fits in cache)
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be been but by can do for from has have i if in into is it its of on or our "
+    "so that the their them then there these they this to up was we were what when which will with "
+    "you your also just about should would could need needs let lets ok okay yes no".split()
+)
+_BIGRAM_WEIGHT = 0.5
+
+
+def settings() -> Dict[str, Any]:
+    dtype = os.getenv("SEMANTIC_INDEX_DTYPE", "int8").strip().lower()
+    if dtype not in ("int8", "float32"):
+        raise ValueError(f"SEMANTIC_INDEX_DTYPE must be int8 or float32 (got {dtype!r})")
+    return {
+        "enabled": os.getenv("SEMANTIC_INDEX", "1") != "0",
+        "dim": int(os.getenv("SEMANTIC_DIM", "256")),
+        "dtype": dtype,
+    }
+
+
+def _terms(text: str) -> List[str]:
+    words = []
+    for w in _TOKEN_RE.findall(text.lower()):
+        if w in _STOPWORDS:
+            continue
+        for suffix in ("ing", "ed", "es", "s", "e"):  # crude stemming: "prices"/"priced"/"pricing" → "pric"
+            if len(w) > len(suffix) + 3 and w.endswith(suffix):
+                w = w[: -len(suffix)]
+                break
+        words.append(w)
+    return words
+
+
+def embed(texts: Sequence[str], dim: Optional[int] = None) -> np.ndarray:
+    """Unit-length float32 vectors (len(texts), dim); an empty text gives a zero vector."""
+    dim = dim or settings()["dim"]
+    out = np.zeros((len(texts), dim), dtype=np.float32)
+    for row, text in enumerate(texts):
+        words = _terms(text or "")
+        features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+        if not features:
+            continue
+        h = np.fromiter((zlib.crc32(f.encode()) for f in features), dtype=np.uint32, count=len(features))
+        weights = np.where(np.arange(len(features)) < len(words), 1.0, _BIGRAM_WEIGHT).astype(np.float32)
+        signs = np.where(h & 0x80000000, -1.0, 1.0).astype(np.float32)
+        np.add.at(out[row], h % dim, signs * weights)
+    norms = np.linalg.norm(out, axis=1, keepdims=True)
+    return out / np.maximum(norms, 1e-8)
+
+
+def _record(dim: int, dtype: str) -> np.dtype:
+    return np.dtype([
+        ("kind", "u1"), ("alive", "u1"), ("item", "<i8"), ("meeting", "<i8"), ("scale", "<f4"),
+        ("vec", dtype, (dim,)),
+    ])
+
+
+def _quantize(vectors: np.ndarray, dtype: str) -> Tuple[np.ndarray, np.ndarray]:
+    if dtype == "float32":
+        return vectors.astype(np.float32), np.ones(len(vectors), dtype=np.float32)
+    peak = np.abs(vectors).max(axis=1) if len(vectors) else np.zeros(0, dtype=np.float32)
+    scale = np.where(peak > 0, peak / 127.0, 1.0).astype(np.float32)
+    return np.round(vectors / scale[:, None]).astype(np.int8), scale
+
+
+class VectorIndex:
+    """Append-only, memory-mapped vector index (see module comment). Safe across threads and processes."""
+
+    def __init__(self, directory: str, dim: int, dtype: str = "int8"):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, f"vectors-{dim}-{dtype}.idx")
+        self._lock_path = self.path + ".lock"
+        self.dim, self.dtype = dim, dtype
+        self._record = _record(dim, dtype)
+        self._lock = threading.Lock()
+        self._state: Tuple[int, int] = (-1, -1)  # (inode, rows) currently mapped
+        self._rows: np.ndarray = np.zeros(0, dtype=self._record)
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        with self._lock, open(self._lock_path, "a") as f:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            yield
+
+    def _refresh(self) -> np.ndarray:
+        """Current rows, re-mapped when another writer (thread or process) appended or rebuilt the file."""
+        try:
+            st = os.stat(self.path)
+            state = (st.st_ino, st.st_size // self._record.itemsize)  # a torn last record is ignored
+        except FileNotFoundError:
+            state = (0, 0)
+        if state != self._state:
+            self._state = state
+            self._rows = (
+                np.memmap(self.path, dtype=self._record, mode="r+", shape=(state[1],))
+                if state[1] else np.zeros(0, dtype=self._record)
+            )
+        return self._rows
+
+    def __len__(self) -> int:
+        return int(self._refresh()["alive"].sum())
+
+    def _append(self, kinds: Sequence[int], items: Sequence[int], meetings: Sequence[int], vectors: np.ndarray):
+        q, scale = _quantize(vectors, self.dtype)
+        rec = np.zeros(len(q), dtype=self._record)
+        rec["kind"], rec["alive"], rec["item"], rec["meeting"], rec["scale"], rec["vec"] = (
+            kinds, 1, items, meetings, scale, q
+        )
+        with open(self.path, "ab") as f:
+            f.truncate(self._state[1] * self._record.itemsize)  # drop a record torn by a crashed writer
+            f.write(rec.tobytes())
+
+    def add(self, kinds: Sequence[int], items: Sequence[int], meetings: Sequence[int], vectors: np.ndarray):
+        """Append rows (KINDS index, item id, meeting id, unit vector)."""
+        with self._locked():
+            self._refresh()
+            self._append(kinds, items, meetings, vectors)
+
+    def replace_meeting(self, meeting_id: int, kinds: Sequence[int], items: Sequence[int], vectors: np.ndarray):
+        """Mark a meeting's rows dead and append its new ones, under one lock."""
+        with self._locked():
+            rows = self._refresh()
+            dead = rows["meeting"] == meeting_id if len(rows) else None
+            if dead is not None and dead.any():
+                rows["alive"][dead] = 0
+                rows.flush()
+            if len(vectors):
+                self._append(kinds, items, [meeting_id] * len(vectors), vectors)
+
+    def remove_meeting(self, meeting_id: int):
+        self.replace_meeting(meeting_id, [], [], np.zeros((0, self.dim), dtype=np.float32))
+
+    def search(
+        self,
+        query: np.ndarray,
+        k: int = 10,
+        kinds: Optional[Iterable[str]] = None,
+        exclude_meeting: Optional[int] = None,
+    ) -> List[Tuple[int, int, int, float]]:
+        """Top-k live rows by dot product with a unit query vector: [(kind, item, meeting, score)], best first."""
+        rows = self._refresh()
+        n = len(rows)
+        if not n or k <= 0:
+            return []
+        kind_codes = np.array([KINDS.index(x) for x in (kinds or KINDS)], dtype=np.uint8)
+        ok = (rows["alive"] == 1) & np.isin(rows["kind"], kind_codes)
+        if exclude_meeting is not None:
+            ok &= rows["meeting"] != exclude_meeting
+        q = query.astype(np.float32)
+        scores = np.full(n, -np.inf, dtype=np.float32)
+        vecs = rows["vec"]
+        buf = np.empty((min(n, _BLOCK_ROWS), self.dim), dtype=np.float32)  # reused, stays in cache
+        for start in range(0, n, _BLOCK_ROWS):
+            stop = min(n, start + _BLOCK_ROWS)
+            if ok[start:stop].any():
+                np.copyto(buf[:stop - start], vecs[start:stop], casting="unsafe")
+                scores[start:stop] = buf[:stop - start] @ q
+        scores *= rows["scale"]
+        scores[~ok] = -np.inf
+        k = min(k, int(ok.sum()))
+        if not k:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [
+            (int(r["kind"]), int(r["item"]), int(r["meeting"]), float(sc))
+            for r, sc in zip(rows[top], scores[top])
+        ]
+
+
+_indexes: Dict[Tuple[str, int, str], VectorIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def index_dir() -> str:
+    from .storage import DB_PATH
+
+    return os.path.join(os.path.dirname(DB_PATH), "semantic")
+
+
+def get_index() -> VectorIndex:
+    """The index for the current DB location and SEMANTIC_DIM / SEMANTIC_INDEX_DTYPE."""
+    cfg = settings()
+    key = (index_dir(), cfg["dim"], cfg["dtype"])
+    with _indexes_lock:
+        if key not in _indexes:
+            _indexes[key] = VectorIndex(*key)
+        return _indexes[key]
+
+
+def meeting_entries(
+    title: str,
+    summary: str,
+    decisions: Sequence[Tuple[int, str]],
+    action_items: Sequence[Tuple[int, str]],
+) -> Tuple[List[int], List[int], List[str]]:
+    """(kinds, item ids, texts) to index for one meeting; the summary row uses item id 0."""
+    kinds, items, texts = [], [], []
+    if (summary or "").strip():
+        kinds.append(0), items.append(0), texts.append(f"{title}\n{summary}")
+    for item_id, text in decisions:
+        kinds.append(1), items.append(item_id), texts.append(text)
+    for item_id, text in action_items:
+        kinds.append(2), items.append(item_id), texts.append(text)
+    return kinds, items, texts
+
+
+def index_meeting(
+    meeting_id: int,
+    title: str,
+    summary: str,
+    decisions: Sequence[Tuple[int, str]],
+    action_items: Sequence[Tuple[int, str]],
+):
+    """(Re)index one meeting: replaces whatever was indexed for it before."""
+    kinds, items, texts = meeting_entries(title, summary, decisions, action_items)
+    index = get_index()
+    with metrics.timer("semantic_index_seconds"):
+        index.replace_meeting(meeting_id, kinds, items, embed(texts, index.dim))
+    for kind in kinds:
+        metrics.inc("semantic_index_items_total", kind=KINDS[kind])
+
+
+def search(
+    text: str,
+    k: int = 10,
+    kinds: Optional[Iterable[str]] = None,
+    exclude_meeting: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Most similar indexed items to `text`: [{"kind", "item_id", "meeting_id", "score"}], best first."""
+    index = get_index()
+    with metrics.timer("semantic_search_seconds"):
+        hits = index.search(embed([text], index.dim)[0], k, kinds, exclude_meeting)
+    return [{"kind": KINDS[kind], "item_id": item, "meeting_id": meeting, "score": score}
+            for kind, item, meeting, score in hits]
+
+
+def rebuild(meetings: Iterable[Tuple[int, str, str, Sequence[Tuple[int, str]], Sequence[Tuple[int, str]]]]) -> int:
+    """
+    Write a fresh index from (meeting_id, title, summary, decisions, action_items) tuples
+    (dead rows are dropped) and swap it in; returns the number of rows.
+    """
+    cfg = settings()
+    directory = index_dir()
+    tmp = VectorIndex(os.path.join(directory, "rebuild"), cfg["dim"], cfg["dtype"])
+    if os.path.exists(tmp.path):
+        os.remove(tmp.path)
+    rows = 0
+    batch: Tuple[List[int], List[int], List[int], List[str]] = ([], [], [], [])
+
+    def flush():
+        if batch[0]:
+            tmp.add(batch[0], batch[1], batch[2], embed(batch[3], tmp.dim))
+        for part in batch:
+            part.clear()
+
+    for meeting_id, title, summary, decisions, action_items in meetings:
+        kinds, items, texts = meeting_entries(title, summary, decisions, action_items)
+        batch[0].extend(kinds), batch[1].extend(items), batch[2].extend([meeting_id] * len(kinds)), batch[3].extend(texts)
+        rows += len(kinds)
+        if len(batch[0]) >= 5000:
+            flush()
+    flush()
+    live = get_index()
+    with live._locked():
+        if os.path.exists(tmp.path):
+            os.replace(tmp.path, live.path)  # atomic; readers remap on the new inode
+        elif os.path.exists(live.path):
+            os.remove(live.path)
+    shutil.rmtree(os.path.dirname(tmp.path), ignore_errors=True)
+    print(f"🧭 Rebuilt semantic index: {rows} items")
+    return rows
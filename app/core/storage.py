@@ -1,93 +1,904 @@
-import os, json, sqlite3
-from typing import List, Dict, Any
+import os, re, json, sqlite3, threading
+from datetime import date, datetime
+from typing import Callable, List, Dict, Any, Optional, Tuple, Union
 from .models import MeetingResult, ActionItem
+from .dates import parse_due_date, reference_date
+from . import blobs, metrics
 
-DB_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "meetings.db")
+# DATA_DIR: where the DB, job uploads, result cache and semantic index live (e.g. a volume
+# shared by several API worker processes on one host)
+DB_PATH = os.path.join(os.getenv("DATA_DIR") or os.path.join(os.path.dirname(__file__), "..", "data"), "meetings.db")
 
-def init_db():
-    os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
-    with sqlite3.connect(DB_PATH) as con:
-        cur = con.cursor()
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS meetings (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT,
-                transcript TEXT,
-                summary TEXT,
-                decisions TEXT,
-                action_items TEXT,
-                important_dates TEXT,
-                other_notes TEXT,
-                created_at TEXT
-            )
-            """
+# Applied on every new connection. WAL lets readers run alongside the single writer.
+PRAGMAS = [
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA foreign_keys=ON",
+    "PRAGMA busy_timeout=30000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA mmap_size=268435456",
+]
+
+ACTION_ITEM_STATUSES = ("open", "done", "cancelled")
+
+
+def _backfill_meeting_items(con: sqlite3.Connection):
+    """Migration 5 data step: normalize the JSON lists of every existing meeting."""
+    rows = con.execute(
+        "SELECT id, decisions, action_items, important_dates, created_at FROM meetings"
+    ).fetchall()
+    for meeting_id, decisions, action_items, important_dates, created_at in rows:
+        _insert_items(
+            con,
+            meeting_id,
+            created_at,
+            json.loads(decisions) if decisions else [],
+            [ActionItem(**ai) for ai in json.loads(action_items)] if action_items else [],
+            json.loads(important_dates) if important_dates else [],
+        )
+
+
+def _move_transcripts_to_blobs(con: sqlite3.Connection):
+    """Migration 7 data step: compress every transcript into transcript_blobs (identical ones stored once)."""
+    for meeting_id, transcript in con.execute("SELECT meeting_id, transcript FROM meeting_transcripts").fetchall():
+        con.execute(
+            "INSERT INTO meeting_transcripts_new (meeting_id, hash) VALUES (?, ?)",
+            (meeting_id, blobs.put(con, transcript or "")),
+        )
+
+
+# Versioned schema migrations; PRAGMA user_version records how many have been applied.
+# A step is SQL text or a callable taking the connection (for data backfills).
+# Never edit an entry once released — append a new one instead.
+MIGRATIONS: List[List[Union[str, Callable[[sqlite3.Connection], None]]]] = [
+    # 1: original schema
+    [
+        """
+        CREATE TABLE IF NOT EXISTS meetings (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT,
+            transcript TEXT,
+            summary TEXT,
+            decisions TEXT,
+            action_items TEXT,
+            important_dates TEXT,
+            other_notes TEXT,
+            created_at TEXT
+        )
+        """,
+    ],
+    # 2: background jobs
+    [
+        """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            title TEXT,
+            text_input TEXT,
+            status TEXT,
+            stage TEXT,
+            progress REAL,
+            partial TEXT,
+            meeting_id INTEGER,
+            error TEXT,
+            created_at TEXT,
+            updated_at TEXT
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, created_at)",
+    ],
+    # 3: move transcripts out of `meetings` so listing never touches large TEXT pages
+    [
+        """
+        CREATE TABLE meeting_transcripts (
+            meeting_id INTEGER PRIMARY KEY REFERENCES meetings(id) ON DELETE CASCADE,
+            transcript TEXT
+        )
+        """,
+        "INSERT INTO meeting_transcripts (meeting_id, transcript) SELECT id, transcript FROM meetings",
+        """
+        CREATE TABLE meetings_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT,
+            summary TEXT,
+            decisions TEXT,
+            action_items TEXT,
+            important_dates TEXT,
+            other_notes TEXT,
+            created_at TEXT
+        )
+        """,
+        """
+        INSERT INTO meetings_new (id, title, summary, decisions, action_items, important_dates, other_notes, created_at)
+        SELECT id, title, summary, decisions, action_items, important_dates, other_notes, created_at FROM meetings
+        """,
+        "DROP TABLE meetings",
+        "ALTER TABLE meetings_new RENAME TO meetings",
+        "CREATE INDEX idx_meetings_created_at ON meetings(created_at, id)",
+    ],
+    # 4: full-text search index (rowid = meetings.id); transcripts are indexed only on request
+    [
+        """
+        CREATE VIRTUAL TABLE meetings_fts USING fts5(
+            title, summary, decisions, action_items, transcript,
+            tokenize = 'porter unicode61'
         )
+        """,
+        """
+        INSERT INTO meetings_fts (rowid, title, summary, decisions, action_items, transcript)
+        SELECT m.id, m.title, m.summary,
+               (SELECT group_concat(value, char(10)) FROM json_each(m.decisions)),
+               (SELECT group_concat(
+                    coalesce(json_extract(value, '$.assignee'), '') || ': ' || coalesce(json_extract(value, '$.task'), ''),
+                    char(10))
+                FROM json_each(m.action_items)),
+               ''
+        FROM meetings m
+        """,
+        # default ranking: bm25 weighted title > summary > decisions/action items > transcript
+        "INSERT INTO meetings_fts (meetings_fts, rank) VALUES ('rank', 'bm25(10.0, 5.0, 3.0, 3.0, 1.0)')",
+    ],
+    # 5: action items, decisions and dates as indexed rows for cross-meeting queries
+    [
+        """
+        CREATE TABLE action_items (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            meeting_id INTEGER NOT NULL REFERENCES meetings(id) ON DELETE CASCADE,
+            position INTEGER NOT NULL,
+            assignee TEXT COLLATE NOCASE,
+            task TEXT NOT NULL,
+            due_date TEXT,
+            due_on TEXT,
+            status TEXT NOT NULL DEFAULT 'open',
+            created_at TEXT NOT NULL,
+            updated_at TEXT
+        )
+        """,
+        "CREATE INDEX idx_action_items_meeting ON action_items(meeting_id, position)",
+        "CREATE INDEX idx_action_items_assignee ON action_items(assignee, status, due_on)",
+        "CREATE INDEX idx_action_items_due ON action_items(status, due_on)",
+        "CREATE INDEX idx_action_items_created ON action_items(created_at)",
+        """
+        CREATE TABLE decisions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            meeting_id INTEGER NOT NULL REFERENCES meetings(id) ON DELETE CASCADE,
+            position INTEGER NOT NULL,
+            text TEXT NOT NULL,
+            created_at TEXT NOT NULL
+        )
+        """,
+        "CREATE INDEX idx_decisions_meeting ON decisions(meeting_id, position)",
+        "CREATE INDEX idx_decisions_created ON decisions(created_at)",
+        """
+        CREATE TABLE meeting_dates (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            meeting_id INTEGER NOT NULL REFERENCES meetings(id) ON DELETE CASCADE,
+            position INTEGER NOT NULL,
+            text TEXT NOT NULL,
+            date_on TEXT
+        )
+        """,
+        "CREATE INDEX idx_meeting_dates_meeting ON meeting_dates(meeting_id, position)",
+        "CREATE INDEX idx_meeting_dates_on ON meeting_dates(date_on)",
+        _backfill_meeting_items,
+    ],
+    # 6: content-hashed transcript segments (partial results only, text stays in meeting_transcripts)
+    #    and jobs that update an existing meeting instead of creating one
+    [
+        """
+        CREATE TABLE meeting_segments (
+            meeting_id INTEGER NOT NULL REFERENCES meetings(id) ON DELETE CASCADE,
+            position INTEGER NOT NULL,
+            hash TEXT NOT NULL,
+            tokens INTEGER NOT NULL,
+            partial TEXT,
+            PRIMARY KEY (meeting_id, position)
+        )
+        """,
+        "ALTER TABLE jobs ADD COLUMN target_meeting_id INTEGER",
+        "ALTER TABLE jobs ADD COLUMN update_mode TEXT",
+    ],
+    # 7: transcripts as compressed, content-addressed blobs (see blobs.py); run compact_db()
+    #    afterwards to give the freed pages back to the filesystem
+    [
+        """
+        CREATE TABLE transcript_blobs (
+            hash TEXT PRIMARY KEY,
+            codec TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            data BLOB NOT NULL
+        )
+        """,
+        """
+        CREATE TABLE meeting_transcripts_new (
+            meeting_id INTEGER PRIMARY KEY REFERENCES meetings(id) ON DELETE CASCADE,
+            hash TEXT
+        )
+        """,
+        _move_transcripts_to_blobs,
+        "DROP TABLE meeting_transcripts",
+        "ALTER TABLE meeting_transcripts_new RENAME TO meeting_transcripts",
+        "CREATE INDEX idx_meeting_transcripts_hash ON meeting_transcripts(hash)",
+    ],
+    # 8: job leases: the claiming worker's token, a heartbeat it refreshes while the job runs,
+    #    and how many times the job was started
+    [
+        "ALTER TABLE jobs ADD COLUMN owner TEXT",
+        "ALTER TABLE jobs ADD COLUMN heartbeat_at TEXT",
+        "ALTER TABLE jobs ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0",
+    ],
+]
+
+_local = threading.local()
+_init_lock = threading.Lock()
+_initialized = False
+
+
+def get_connection() -> sqlite3.Connection:
+    """
+    Reusable connection for the current thread (sqlite3 connections are not thread-safe).
+    Re-created after fork so child processes never share a parent's handle.
+    """
+    con = getattr(_local, "con", None)
+    if con is None or getattr(_local, "pid", None) != os.getpid():
+        os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+        con = sqlite3.connect(DB_PATH, timeout=30)
+        for pragma in PRAGMAS:
+            con.execute(pragma)
+        _local.con, _local.pid = con, os.getpid()
+    return con
+
+
+def _migrate(con: sqlite3.Connection):
+    version = con.execute("PRAGMA user_version").fetchone()[0]
+    if version >= len(MIGRATIONS):
+        return
+    # Table rebuilds must not cascade deletes; foreign_keys can only change outside a transaction.
+    con.execute("PRAGMA foreign_keys=OFF")
+    # IMMEDIATE takes the write lock, so concurrent processes migrate one at a time
+    con.execute("BEGIN IMMEDIATE")
+    try:
+        version = con.execute("PRAGMA user_version").fetchone()[0]
+        for i in range(version, len(MIGRATIONS)):
+            for stmt in MIGRATIONS[i]:
+                if callable(stmt):
+                    stmt(con)
+                else:
+                    con.execute(stmt)
+            con.execute(f"PRAGMA user_version = {i + 1}")
+            print(f"🗃️ Applied DB migration {i + 1}")
         con.commit()
+    except Exception:
+        con.rollback()
+        raise
+    finally:
+        con.execute("PRAGMA foreign_keys=ON")
 
-def save_meeting_result(m: MeetingResult) -> int:
-    with sqlite3.connect(DB_PATH) as con:
-        cur = con.cursor()
-        cur.execute(
-            """
-            INSERT INTO meetings (
-                title, transcript, summary, decisions, action_items,
-                important_dates, other_notes, created_at
+
+def init_db():
+    """Create/migrate the schema once per process; later calls are no-ops."""
+    global _initialized
+    if _initialized:
+        return
+    with _init_lock:
+        if not _initialized:
+            _migrate(get_connection())
+            _initialized = True
+
+
+def _insert_meeting(con: sqlite3.Connection, m: MeetingResult) -> int:
+    """Insert a meeting with its transcript and search entry; call inside a transaction."""
+    cur = con.execute(
+        """
+        INSERT INTO meetings (
+            title, summary, decisions, action_items,
+            important_dates, other_notes, created_at
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        """,
+        (
+            m.title,
+            m.summary,
+            json.dumps(m.decisions or []),
+            json.dumps([ai.model_dump() for ai in m.action_items] if m.action_items else []),
+            json.dumps(m.important_dates or []),
+            json.dumps(m.other_notes or []),
+            m.created_at,
+        ),
+    )
+    con.execute(
+        "INSERT INTO meeting_transcripts (meeting_id, hash) VALUES (?, ?)",
+        (cur.lastrowid, blobs.put(con, m.transcript)),
+    )
+    _insert_items(con, cur.lastrowid, m.created_at, m.decisions or [], m.action_items or [], m.important_dates or [])
+    _index_meeting(con, cur.lastrowid, m)
+    return cur.lastrowid
+
+
+def _insert_items(
+    con: sqlite3.Connection,
+    meeting_id: int,
+    created_at: str,
+    decisions: List[str],
+    action_items: List[ActionItem],
+    important_dates: List[str],
+):
+    """Normalized rows for one meeting; free-text dates are resolved against the meeting date."""
+    ref = reference_date(created_at)
+    con.executemany(
+        """
+        INSERT INTO action_items (meeting_id, position, assignee, task, due_date, due_on, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        """,
+        [
+            (meeting_id, i, (ai.assignee or "").strip() or None, ai.task, ai.due_date,
+             parse_due_date(ai.due_date, ref), created_at)
+            for i, ai in enumerate(action_items)
+        ],
+    )
+    con.executemany(
+        "INSERT INTO decisions (meeting_id, position, text, created_at) VALUES (?, ?, ?, ?)",
+        [(meeting_id, i, d, created_at) for i, d in enumerate(decisions)],
+    )
+    con.executemany(
+        "INSERT INTO meeting_dates (meeting_id, position, text, date_on) VALUES (?, ?, ?, ?)",
+        [(meeting_id, i, d, parse_due_date(d, ref)) for i, d in enumerate(important_dates)],
+    )
+
+
+def save_meeting_result(m: MeetingResult, segments: Optional[List[Dict[str, Any]]] = None) -> int:
+    init_db()
+    con = get_connection()
+    with metrics.timer("db_write_seconds", op="save_meeting"), con:
+        meeting_id = _insert_meeting(con, m)
+        if segments:
+            _replace_segments(con, meeting_id, segments)
+    _index_semantic(meeting_id)
+    return meeting_id
+
+
+def update_meeting_result(meeting_id: int, m: MeetingResult, segments: List[Dict[str, Any]]):
+    """
+    Overwrite a meeting in place after an incremental re-summarization.
+    Keeps the id and created_at; action items that survive (same assignee + task) keep their status.
+    """
+    init_db()
+    con = get_connection()
+    with metrics.timer("db_write_seconds", op="update_meeting"), con:
+        statuses = {
+            ((r[0] or "").strip().lower(), r[1].strip().lower()): (r[2], r[3])
+            for r in con.execute(
+                "SELECT assignee, task, status, updated_at FROM action_items WHERE meeting_id = ? AND status != 'open'",
+                (meeting_id,),
             )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        }
+        created_at = con.execute("SELECT created_at FROM meetings WHERE id = ?", (meeting_id,)).fetchone()[0]
+        con.execute(
+            """
+            UPDATE meetings SET title = ?, summary = ?, decisions = ?, action_items = ?,
+                   important_dates = ?, other_notes = ?
+            WHERE id = ?
             """,
             (
                 m.title,
-                m.transcript,
                 m.summary,
                 json.dumps(m.decisions or []),
                 json.dumps([ai.model_dump() for ai in m.action_items] if m.action_items else []),
                 json.dumps(m.important_dates or []),
                 json.dumps(m.other_notes or []),
-                m.created_at,
+                meeting_id,
             ),
         )
-        con.commit()
-        return cur.lastrowid
+        old_hash = con.execute("SELECT hash FROM meeting_transcripts WHERE meeting_id = ?", (meeting_id,)).fetchone()
+        con.execute(
+            "INSERT OR REPLACE INTO meeting_transcripts (meeting_id, hash) VALUES (?, ?)",
+            (meeting_id, blobs.put(con, m.transcript)),
+        )
+        if old_hash:
+            blobs.release(con, old_hash[0])
+        for table in ("action_items", "decisions", "meeting_dates"):
+            con.execute(f"DELETE FROM {table} WHERE meeting_id = ?", (meeting_id,))
+        _insert_items(con, meeting_id, created_at, m.decisions or [], m.action_items or [], m.important_dates or [])
+        for ai in m.action_items or []:
+            kept = statuses.get(((ai.assignee or "").strip().lower(), ai.task.strip().lower()))
+            if kept:
+                con.execute(
+                    "UPDATE action_items SET status = ?, updated_at = ? "
+                    "WHERE meeting_id = ? AND coalesce(assignee, '') = ? AND task = ?",
+                    (*kept, meeting_id, (ai.assignee or "").strip(), ai.task),
+                )
+        _index_meeting(con, meeting_id, m)
+        _replace_segments(con, meeting_id, segments)
+    _index_semantic(meeting_id)
+
+
+def _replace_segments(con: sqlite3.Connection, meeting_id: int, segments: List[Dict[str, Any]]):
+    con.execute("DELETE FROM meeting_segments WHERE meeting_id = ?", (meeting_id,))
+    con.executemany(
+        "INSERT INTO meeting_segments (meeting_id, position, hash, tokens, partial) VALUES (?, ?, ?, ?, ?)",
+        [
+            (meeting_id, i, seg["hash"], seg["tokens"],
+             json.dumps(seg["partial"]) if seg.get("partial") is not None else None)
+            for i, seg in enumerate(segments)
+        ],
+    )
+
 
-def list_meetings(limit: int = 50) -> List[Dict[str, Any]]:
-    with sqlite3.connect(DB_PATH) as con:
+def get_segment_partials(meeting_id: int) -> Dict[str, Dict[str, Any]]:
+    """{segment hash: partial result} for a meeting's already-summarized segments."""
+    init_db()
+    rows = get_connection().execute(
+        "SELECT hash, partial FROM meeting_segments WHERE meeting_id = ? AND partial IS NOT NULL",
+        (meeting_id,),
+    ).fetchall()
+    return {h: json.loads(p) for h, p in rows}
+
+
+def list_meetings(limit: int = 50, before: Optional[Tuple[str, int]] = None) -> List[Dict[str, Any]]:
+    """
+    Most recent meetings first (id, title, created_at only).
+    Keyset pagination: pass `before=(row["created_at"], row["id"])` of the last row to get the next page.
+    """
+    init_db()
+    con = get_connection()
+    if before is None:
         rows = con.execute(
             """
-            SELECT id, title, created_at, summary
+            SELECT id, title, created_at
             FROM meetings
-            ORDER BY id DESC
+            ORDER BY created_at DESC, id DESC
             LIMIT ?
             """,
             (limit,),
         ).fetchall()
-    return [
-        {"id": r[0], "title": r[1], "created_at": r[2], "summary": r[3] or ""}
-        for r in rows
-    ]
-
-def get_meeting(meeting_id: int) -> Dict[str, Any]:
-    with sqlite3.connect(DB_PATH) as con:
-        row = con.execute(
+    else:
+        rows = con.execute(
             """
-            SELECT id, title, transcript, summary, decisions, action_items,
-                   important_dates, other_notes, created_at
+            SELECT id, title, created_at
             FROM meetings
-            WHERE id = ?
+            WHERE (created_at, id) < (?, ?)
+            ORDER BY created_at DESC, id DESC
+            LIMIT ?
             """,
-            (meeting_id,),
-        ).fetchone()
+            (before[0], before[1], limit),
+        ).fetchall()
+    return [{"id": r[0], "title": r[1], "created_at": r[2]} for r in rows]
+
+
+def get_meeting(meeting_id: int, with_transcript: bool = False) -> Dict[str, Any]:
+    """
+    One meeting's summary fields. The transcript is only read and decompressed when
+    `with_transcript` is set (then under "transcript"); see also get_transcript().
+    """
+    init_db()
+    row = get_connection().execute(
+        """
+        SELECT m.id, m.title, m.summary, m.decisions, m.action_items,
+               m.important_dates, m.other_notes, m.created_at
+        FROM meetings m
+        WHERE m.id = ?
+        """,
+        (meeting_id,),
+    ).fetchone()
     if not row:
         return {}
-    return {
+    # Normalized rows carry id/status; the JSON column is kept for older readers
+    items = _action_item_rows(
+        "WHERE a.meeting_id = ? ORDER BY a.position", (meeting_id,)
+    )
+    meeting = {
         "id": row[0],
         "title": row[1],
-        "transcript": row[2],
-        "summary": row[3],
-        "decisions": json.loads(row[4]) if row[4] else [],
-        "action_items": json.loads(row[5]) if row[5] else [],
-        "important_dates": json.loads(row[6]) if row[6] else [],
-        "other_notes": json.loads(row[7]) if row[7] else [],
-        "created_at": row[8],
+        "summary": row[2],
+        "decisions": json.loads(row[3]) if row[3] else [],
+        "action_items": items or (json.loads(row[4]) if row[4] else []),
+        "important_dates": json.loads(row[5]) if row[5] else [],
+        "other_notes": json.loads(row[6]) if row[6] else [],
+        "created_at": row[7],
+    }
+    if with_transcript:
+        meeting["transcript"] = get_transcript(meeting_id)
+    return meeting
+
+
+def get_transcript(meeting_id: int) -> str:
+    """A meeting's full transcript ("" if it has none)."""
+    init_db()
+    con = get_connection()
+    with metrics.timer("transcript_load_seconds"):
+        row = con.execute("SELECT hash FROM meeting_transcripts WHERE meeting_id = ?", (meeting_id,)).fetchone()
+        return blobs.get(con, row[0]) if row else ""
+
+
+def compact_db() -> Dict[str, Any]:
+    """
+    Maintenance: drop transcript blobs no meeting refers to, recompress blobs written with
+    another codec than TRANSCRIPT_CODEC, then VACUUM so the file shrinks. Needs exclusive
+    use of the database for the VACUUM (stop the app first on large databases).
+    """
+    init_db()
+    con = get_connection()
+    con.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    before = os.path.getsize(DB_PATH)
+    with con:
+        removed = blobs.collect_garbage(con)
+    recompressed = blobs.recompress(con)
+    con.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    con.execute("VACUUM")
+    after = os.path.getsize(DB_PATH)
+    print(f"🗃️ Compacted {DB_PATH}: {before / 1e6:.1f} MB → {after / 1e6:.1f} MB "
+          f"({removed} unused transcripts removed, {recompressed} recompressed)")
+    return {"bytes_before": before, "bytes_after": after, "blobs_removed": removed, "blobs_recompressed": recompressed}
+
+
+# --- Action items / decisions / dates across meetings ---
+def _action_item_rows(where: str, params: tuple) -> List[Dict[str, Any]]:
+    rows = get_connection().execute(
+        f"""
+        SELECT a.id, a.meeting_id, m.title, a.assignee, a.task, a.due_date, a.due_on,
+               a.status, a.created_at, a.updated_at
+        FROM action_items a
+        JOIN meetings m ON m.id = a.meeting_id
+        {where}
+        """,
+        params,
+    ).fetchall()
+    return [
+        {
+            "id": r[0],
+            "meeting_id": r[1],
+            "meeting_title": r[2],
+            "assignee": r[3],
+            "task": r[4],
+            "due_date": r[5],
+            "due_on": r[6],
+            "status": r[7],
+            "created_at": r[8],
+            "updated_at": r[9],
+        }
+        for r in rows
+    ]
+
+
+def list_action_items(
+    assignee: Optional[str] = None,
+    status: Optional[str] = "open",
+    due_before: Optional[str] = None,
+    limit: int = 100,
+) -> List[Dict[str, Any]]:
+    """
+    Action items across all meetings, soonest due first (undated items last).
+    - assignee: case-insensitive exact match
+    - status: "open" / "done" / "cancelled", or None for any
+    - due_before: ISO date; only items with a parsed due date on or before it
+    """
+    init_db()
+    clauses, params = [], []
+    if assignee:
+        clauses.append("a.assignee = ?")
+        params.append(assignee.strip())
+    if status:
+        clauses.append("a.status = ?")
+        params.append(status)
+    if due_before:
+        clauses.append("a.due_on <= ?")
+        params.append(due_before)
+    where = ("WHERE " + " AND ".join(clauses)) if clauses else ""
+    return _action_item_rows(
+        f"{where} ORDER BY a.due_on IS NULL, a.due_on, a.id LIMIT ?", (*params, limit)
+    )
+
+
+def overdue_action_items(today: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
+    """Open items whose parsed due date is before `today` (ISO date, default: today)."""
+    init_db()
+    return _action_item_rows(
+        "WHERE a.status = 'open' AND a.due_on < ? ORDER BY a.due_on, a.id LIMIT ?",
+        (today or date.today().isoformat(), limit),
+    )
+
+
+def recent_action_items(limit: int = 50, since: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Most recently created action items (optionally only those created at/after `since`)."""
+    init_db()
+    if since:
+        return _action_item_rows(
+            "WHERE a.created_at >= ? ORDER BY a.created_at DESC, a.id DESC LIMIT ?", (since, limit)
+        )
+    return _action_item_rows("ORDER BY a.created_at DESC, a.id DESC LIMIT ?", (limit,))
+
+
+def set_action_item_status(item_id: int, status: str) -> bool:
+    """Mark an action item open/done/cancelled. Returns False if the item doesn't exist."""
+    if status not in ACTION_ITEM_STATUSES:
+        raise ValueError(f"Unknown status {status!r}; expected one of {ACTION_ITEM_STATUSES}")
+    init_db()
+    con = get_connection()
+    with metrics.timer("db_write_seconds", op="action_item_status"), con:
+        cur = con.execute(
+            "UPDATE action_items SET status = ?, updated_at = ? WHERE id = ?",
+            (status, datetime.utcnow().isoformat(), item_id),
+        )
+    return cur.rowcount == 1
+
+
+def list_assignees() -> List[Dict[str, Any]]:
+    """Assignees with their open item counts (for dashboard filters)."""
+    init_db()
+    rows = get_connection().execute(
+        """
+        SELECT assignee, COUNT(*) FROM action_items
+        WHERE status = 'open' AND assignee IS NOT NULL
+        GROUP BY assignee ORDER BY COUNT(*) DESC, assignee
+        """
+    ).fetchall()
+    return [{"assignee": r[0], "open": r[1]} for r in rows]
+
+
+def recent_decisions(limit: int = 50) -> List[Dict[str, Any]]:
+    init_db()
+    rows = get_connection().execute(
+        """
+        SELECT d.id, d.meeting_id, m.title, d.text, d.created_at
+        FROM decisions d JOIN meetings m ON m.id = d.meeting_id
+        ORDER BY d.created_at DESC, d.id DESC LIMIT ?
+        """,
+        (limit,),
+    ).fetchall()
+    return [
+        {"id": r[0], "meeting_id": r[1], "meeting_title": r[2], "text": r[3], "created_at": r[4]}
+        for r in rows
+    ]
+
+
+def upcoming_dates(start: Optional[str] = None, end: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
+    """Important dates with a parsed date in [start, end] (default: from today on)."""
+    init_db()
+    rows = get_connection().execute(
+        """
+        SELECT d.id, d.meeting_id, m.title, d.text, d.date_on
+        FROM meeting_dates d JOIN meetings m ON m.id = d.meeting_id
+        WHERE d.date_on >= ? AND d.date_on <= ?
+        ORDER BY d.date_on, d.id LIMIT ?
+        """,
+        (start or date.today().isoformat(), end or "9999-12-31", limit),
+    ).fetchall()
+    return [
+        {"id": r[0], "meeting_id": r[1], "meeting_title": r[2], "text": r[3], "date_on": r[4]}
+        for r in rows
+    ]
+
+
+# --- Full-text search ---
+def _index_transcripts() -> bool:
+    return os.getenv("SEARCH_INDEX_TRANSCRIPTS", "0") == "1"
+
+
+def _index_meeting(con: sqlite3.Connection, meeting_id: int, m: MeetingResult):
+    """(Re)index one meeting in meetings_fts; call inside the write transaction."""
+    con.execute("DELETE FROM meetings_fts WHERE rowid = ?", (meeting_id,))
+    con.execute(
+        """
+        INSERT INTO meetings_fts (rowid, title, summary, decisions, action_items, transcript)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """,
+        (
+            meeting_id,
+            m.title,
+            m.summary,
+            "\n".join(m.decisions or []),
+            "\n".join(f"{ai.assignee or ''}: {ai.task}" for ai in m.action_items or []),
+            m.transcript if _index_transcripts() else "",
+        ),
+    )
+
+
+def _fts_query(query: str) -> str:
+    """
+    Turn free text into a safe FTS5 query: every word must match, the last one as a prefix
+    (so results update while typing). Quoting stops user input being parsed as FTS syntax.
+    """
+    words = ["".join(ch for ch in w if ch.isalnum() or ch in "'-_") for w in query.split()]
+    words = [w for w in words if w]
+    if not words:
+        return ""
+    terms = [f'"{w}"' for w in words]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+def search_meetings(query: str, limit: int = 20, offset: int = 0) -> List[Dict[str, Any]]:
+    """
+    Ranked (bm25) full-text search over title, summary, decisions, action items
+    (and transcripts when SEARCH_INDEX_TRANSCRIPTS=1). Paginate with limit/offset.
+    Matches are ranked in windows of SEARCH_RANK_WINDOW, newest first: the most recent window
+    by bm25, then the next older one, and so on. Every match is reachable by paging, and a
+    page costs about the same however large the database grows.
+    """
+    init_db()
+    match = _fts_query(query)
+    if not match:
+        return []
+    con = get_connection()
+    window = max(1, int(os.getenv("SEARCH_RANK_WINDOW", "1000")))
+
+    ranked: List[Tuple[int, float]] = []
+    tier, skip = divmod(offset, window)
+    upper = None  # rowid bound (exclusive) of the window being ranked; rowid order is insertion order
+    if tier:
+        row = con.execute(
+            "SELECT rowid FROM meetings_fts WHERE meetings_fts MATCH ? ORDER BY rowid DESC LIMIT 1 OFFSET ?",
+            (match, tier * window - 1),
+        ).fetchone()
+        if not row:
+            return []
+        upper = row[0]
+    while len(ranked) < limit:
+        # oldest match inside this window
+        row = con.execute(
+            "SELECT rowid FROM meetings_fts WHERE meetings_fts MATCH ? AND rowid < ? "
+            "ORDER BY rowid DESC LIMIT 1 OFFSET ?",
+            (match, upper if upper is not None else 2 ** 63 - 1, window - 1),
+        ).fetchone()
+        lower = row[0] if row else 0
+        ranked += con.execute(
+            """
+            SELECT rowid, rank FROM meetings_fts
+            WHERE meetings_fts MATCH ? AND rowid >= ? AND rowid < ?
+            ORDER BY rank
+            LIMIT ? OFFSET ?
+            """,
+            (match, lower, upper if upper is not None else 2 ** 63 - 1, limit - len(ranked), skip),
+        ).fetchall()
+        if not row:
+            break  # that was the last (partial) window
+        upper, skip = lower, 0
+    if not ranked:
+        return []
+
+    # Titles and snippets only for the page being returned
+    ids = [r[0] for r in ranked]
+    meta = {
+        r[0]: r[1:]
+        for r in con.execute(
+            f"SELECT id, title, created_at, summary FROM meetings WHERE id IN ({','.join('?' * len(ids))})", ids
+        )
     }
+    results = []
+    for meeting_id, rank in ranked:
+        title, created_at, summary = meta.get(meeting_id, ("", "", ""))
+        results.append({
+            "id": meeting_id,
+            "title": title,
+            "created_at": created_at,
+            "snippet": _snippet(summary or "", query),
+            "score": rank,
+        })
+    return results
+
+
+def _snippet(text: str, query: str, width: int = 120) -> str:
+    """Short excerpt of `text` around the first query word, with matches in **bold**."""
+    words = [w.lower() for w in query.split() if w]
+    lower = text.lower()
+    hit = min((i for i in (lower.find(w) for w in words) if i >= 0), default=0)
+    start = max(0, hit - width // 3)
+    excerpt = text[start:start + width]
+    for w in words:
+        excerpt = re.sub(f"({re.escape(w)}\\w*)", r"**\1**", excerpt, flags=re.IGNORECASE)
+    return ("…" if start else "") + excerpt + ("…" if start + width < len(text) else "")
+
+
+def rebuild_search_index():
+    """Re-index every meeting (e.g. after turning SEARCH_INDEX_TRANSCRIPTS on)."""
+    init_db()
+    con = get_connection()
+    ids = [r[0] for r in con.execute("SELECT id FROM meetings").fetchall()]
+    with con:
+        for meeting_id in ids:
+            _index_meeting(con, meeting_id, MeetingResult(**get_meeting(meeting_id, with_transcript=True)))
+
+
+# --- Semantic search (local embedding index, see semantic.py) ---
+def _semantic_enabled() -> bool:
+    return os.getenv("SEMANTIC_INDEX", "1") != "0"
+
+
+def _semantic_entry(con: sqlite3.Connection, meeting_id: int, title: str, summary: str):
+    """(meeting_id, title, summary, [(decision id, text)], [(action item id, task)]) for semantic.index_meeting."""
+    decisions = con.execute(
+        "SELECT id, text FROM decisions WHERE meeting_id = ? ORDER BY position", (meeting_id,)
+    ).fetchall()
+    tasks = con.execute(
+        "SELECT id, task FROM action_items WHERE meeting_id = ? ORDER BY position", (meeting_id,)
+    ).fetchall()
+    return meeting_id, title or "", summary or "", decisions, tasks
+
+
+def _index_semantic(meeting_id: int):
+    """Embed a saved meeting into the semantic index; a failure never fails the save."""
+    if not _semantic_enabled():
+        return
+    try:
+        from . import semantic
+
+        con = get_connection()
+        title, summary = con.execute("SELECT title, summary FROM meetings WHERE id = ?", (meeting_id,)).fetchone()
+        semantic.index_meeting(*_semantic_entry(con, meeting_id, title, summary))
+    except Exception as e:
+        print(f"⚠️ Semantic indexing failed for meeting {meeting_id} (rebuild_semantic_index() repairs it):", e)
+
+
+def related_meetings(text: str, limit: int = 10, exclude_meeting_id: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Meetings whose summary or decisions are closest in meaning to `text` (e.g. a decision),
+    best first: id, title, created_at, score (cosine, 0–1) and `match` (the decision that matched,
+    or the summary).
+    """
+    init_db()
+    from . import semantic
+
+    hits = semantic.search(text, limit * 3, kinds=("summary", "decision"), exclude_meeting=exclude_meeting_id)
+    best: Dict[int, Dict[str, Any]] = {}
+    for h in hits:  # best first, so the first hit per meeting is its best match
+        if h["score"] > 0:
+            best.setdefault(h["meeting_id"], h)
+    if not best:
+        return []
+    con = get_connection()
+    ids = list(best)
+    meta = {
+        r[0]: r[1:]
+        for r in con.execute(
+            f"SELECT id, title, created_at, summary FROM meetings WHERE id IN ({','.join('?' * len(ids))})", ids
+        )
+    }
+    decision_ids = [h["item_id"] for h in best.values() if h["kind"] == "decision"]
+    decisions = dict(con.execute(
+        f"SELECT id, text FROM decisions WHERE id IN ({','.join('?' * len(decision_ids))})", decision_ids
+    ).fetchall()) if decision_ids else {}
+    results = []
+    for meeting_id, h in best.items():
+        if meeting_id not in meta:  # deleted since it was indexed
+            continue
+        title, created_at, summary = meta[meeting_id]
+        match = decisions.get(h["item_id"]) if h["kind"] == "decision" else summary
+        if match is None:
+            continue
+        results.append({"id": meeting_id, "title": title, "created_at": created_at,
+                        "score": round(h["score"], 4), "match": match})
+    return results[:limit]
+
+
+def similar_action_items(item_id: int, limit: int = 5, min_score: float = 0.7) -> List[Dict[str, Any]]:
+    """
+    Likely duplicates of an action item in other meetings: action item rows (as in list_action_items)
+    with a `score` of at least `min_score`, most similar first.
+    """
+    init_db()
+    from . import semantic
+
+    row = get_connection().execute("SELECT task, meeting_id FROM action_items WHERE id = ?", (item_id,)).fetchone()
+    if not row:
+        return []
+    hits = [
+        h for h in semantic.search(row[0], limit * 2, kinds=("action_item",), exclude_meeting=row[1])
+        if h["score"] >= min_score
+    ]
+    if not hits:
+        return []
+    scores = {h["item_id"]: h["score"] for h in hits}
+    items = _action_item_rows(f"WHERE a.id IN ({','.join('?' * len(scores))})", tuple(scores))
+    for item in items:
+        item["score"] = round(scores[item["id"]], 4)
+    return sorted(items, key=lambda i: -i["score"])[:limit]
+
+
+def rebuild_semantic_index() -> int:
+    """Re-embed every meeting into a fresh semantic index (after changing SEMANTIC_DIM/DTYPE, or to drop dead rows)."""
+    init_db()
+    from . import semantic
 
+    con = get_connection()
+    rows = con.execute("SELECT id, title, summary FROM meetings ORDER BY id").fetchall()
+    return semantic.rebuild(_semantic_entry(con, *r) for r in rows)
@@ -0,0 +1,122 @@
+import json
+from typing import Any, List, Optional, Tuple
+
+# Event kinds emitted by IncrementalJSONParser.feed():
+#   ("partial", key, text)  – a top-level string value is still streaming; text decoded so far
+#   ("field", key, value)   – a top-level value is complete
+#   ("item", key, value)    – one element of a top-level array is complete
+Event = Tuple[str, str, Any]
+
+
+class IncrementalJSONParser:
+    """
+    Incremental parser for the summarizer's flat JSON object.
+    Feed it model output as it streams in; it reports each top-level field
+    (and each element of top-level arrays) as soon as its closing delimiter arrives.
+    Text before the first "{" (e.g. a ```json fence) and after the closing "}" is ignored.
+    """
+
+    def __init__(self):
+        self.buf = ""
+        self.pos = 0
+        self.stack: List[str] = []
+        self.in_str = False
+        self.esc = False
+        self.str_start = 0
+        self.key: Optional[str] = None
+        self.value_start: Optional[int] = None
+        self.item_start: Optional[int] = None
+        self.done = False
+
+    def _loads(self, start: int, end: int) -> Tuple[bool, Any]:
+        raw = self.buf[start:end].strip()
+        if not raw:
+            return False, None
+        try:
+            return True, json.loads(raw)
+        except ValueError:
+            return False, None
+
+    def _end_field(self, i: int, events: List[Event]):
+        ok, value = self._loads(self.value_start, i)
+        if ok and self.key is not None:
+            events.append(("field", self.key, value))
+        self.key, self.value_start = None, None
+
+    def _end_item(self, i: int, events: List[Event]):
+        ok, value = self._loads(self.item_start, i)
+        if ok and self.key is not None:
+            events.append(("item", self.key, value))
+
+    def feed(self, text: str) -> List[Event]:
+        events: List[Event] = []
+        if self.done:
+            return events
+        self.buf += text
+        buf = self.buf
+        i = self.pos
+        while i < len(buf):
+            c = buf[i]
+            depth = len(self.stack)
+            if self.in_str:
+                if self.esc:
+                    self.esc = False
+                elif c == "\\":
+                    self.esc = True
+                elif c == '"':
+                    self.in_str = False
+                    if depth == 1 and self.value_start is None:
+                        ok, key = self._loads(self.str_start, i + 1)
+                        self.key = key if ok else None
+            elif depth == 0:
+                if c == "{":
+                    self.stack.append("{")
+            elif c == '"':
+                self.in_str = True
+                self.str_start = i
+            elif c == ":" and depth == 1 and self.value_start is None:
+                self.value_start = i + 1
+            elif c == ",":
+                if depth == 1 and self.value_start is not None:
+                    self._end_field(i, events)
+                elif depth == 2 and self.stack[-1] == "[" and self.item_start is not None:
+                    self._end_item(i, events)
+                    self.item_start = i + 1
+            elif c in "{[":
+                if depth == 1 and c == "[" and self.value_start is not None:
+                    self.item_start = i + 1
+                self.stack.append(c)
+            elif c in "}]":
+                if depth == 2 and c == "]" and self.item_start is not None:
+                    self._end_item(i, events)
+                    self.item_start = None
+                elif depth == 1 and c == "}":
+                    if self.value_start is not None:
+                        self._end_field(i, events)
+                    self.stack.pop()
+                    self.done = True
+                    i += 1
+                    break
+                self.stack.pop()
+            i += 1
+        self.pos = i
+
+        # Surface the in-progress top-level string so the UI can render it as it types.
+        if self.in_str and len(self.stack) == 1 and self.value_start is not None and self.key is not None:
+            partial = self._partial_string()
+            if partial is not None:
+                events.append(("partial", self.key, partial))
+        return events
+
+    def _partial_string(self) -> Optional[str]:
+        """Decode an unterminated string, dropping a dangling escape sequence."""
+        raw = self.buf[self.str_start:]
+        if self.esc:
+            raw = raw[:-1]
+        cut = raw.rfind("\\u")
+        if cut != -1 and len(raw) - cut < 6:
+            raw = raw[:cut]
+        try:
+            return json.loads(raw + '"')
+        except ValueError:
+            return None
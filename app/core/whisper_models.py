@@ -0,0 +1,120 @@
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from . import metrics, resources
+
+# Whisper model manager:
+# - WHISPER_MODEL, WHISPER_COMPUTE_TYPE, WHISPER_CPU_THREADS and WHISPER_BEAM_SIZE choose the model
+# - WHISPER_FAST_MODEL (default "tiny") replaces it for very long recordings or when audio
+#   work queues up, trading some accuracy for throughput; set it empty to always use WHISPER_MODEL
+# - Both live in the resource registry ("whisper", "whisper_fast"): loaded on first use or
+#   preloaded (PRELOAD_RESOURCES), and unloaded after WHISPER_IDLE_TTL_SECONDS without use
+PRIMARY = "whisper"
+FAST = "whisper_fast"
+
+_depth = 0
+_depth_lock = threading.Lock()
+
+
+def settings() -> Dict[str, Any]:
+    return {
+        "model": os.getenv("WHISPER_MODEL", "base"),
+        "fast_model": os.getenv("WHISPER_FAST_MODEL", "tiny"),
+        "device": os.getenv("WHISPER_DEVICE", "cpu"),
+        "compute_type": os.getenv("WHISPER_COMPUTE_TYPE", "int8"),
+        "cpu_threads": int(os.getenv("WHISPER_CPU_THREADS", "0")),
+        "beam_size": int(os.getenv("WHISPER_BEAM_SIZE", "1")),
+        "idle_ttl": float(os.getenv("WHISPER_IDLE_TTL_SECONDS", "900")),
+        "fast_queue_depth": int(os.getenv("WHISPER_FAST_QUEUE_DEPTH", "3")),
+        "fast_min_seconds": float(os.getenv("WHISPER_FAST_MIN_SECONDS", "7200")),
+    }
+
+
+def _load(size: str, cpu_threads: int, num_workers: int):
+    """Load one faster-whisper model (num_workers = transcriptions it can run concurrently)."""
+    from faster_whisper import WhisperModel
+
+    cfg = settings()
+    print(f"🎧 Loading Whisper model ({size}, {cfg['compute_type']})...")
+    return WhisperModel(
+        size,
+        device=cfg["device"],
+        compute_type=cfg["compute_type"],
+        cpu_threads=cpu_threads,
+        num_workers=num_workers,
+    )
+
+
+def register_models(cpu_threads: int = 0, idle_ttl: Optional[float] = None, num_workers: int = 0):
+    """
+    (Re-)register the primary and fast models. In-process models can serve INGEST_AUDIO_FILES
+    recordings at once; worker processes call this with their share of the cores, one
+    transcription at a time and no TTL (their whole pool is evicted instead, see ingest.py).
+    """
+    cfg = settings()
+    threads = cpu_threads or cfg["cpu_threads"]
+    ttl = cfg["idle_ttl"] if idle_ttl is None else idle_ttl
+    workers = num_workers or max(1, int(os.getenv("INGEST_AUDIO_FILES", "1")))
+    resources.register(PRIMARY, lambda: _load(cfg["model"], threads, workers), idle_ttl=ttl)
+    resources.register(FAST, lambda: _load(cfg["fast_model"] or cfg["model"], threads, workers), idle_ttl=ttl)
+
+
+def beam_size() -> int:
+    return max(1, settings()["beam_size"])
+
+
+@contextmanager
+def track() -> Iterator[None]:
+    """Count a recording as queued/in-progress audio work for the duration of the block."""
+    global _depth
+    with _depth_lock:
+        _depth += 1
+    try:
+        yield
+    finally:
+        with _depth_lock:
+            _depth -= 1
+
+
+def queue_depth() -> int:
+    return _depth
+
+
+def choose_model(duration_seconds: float, depth: Optional[int] = None) -> str:
+    """
+    Pick the registry key for a recording: the fast model when it is very long
+    (>= WHISPER_FAST_MIN_SECONDS) or when at least WHISPER_FAST_QUEUE_DEPTH recordings
+    are waiting or running (this one included), otherwise the primary model.
+    """
+    cfg = settings()
+    depth = queue_depth() if depth is None else depth
+    key = PRIMARY
+    if cfg["fast_model"] and cfg["fast_model"] != cfg["model"]:
+        if (cfg["fast_min_seconds"] > 0 and duration_seconds >= cfg["fast_min_seconds"]) or (
+            cfg["fast_queue_depth"] > 0 and depth >= cfg["fast_queue_depth"]
+        ):
+            key = FAST
+    name = cfg["fast_model"] if key == FAST else cfg["model"]
+    metrics.inc("whisper_model_selected_total", model=name)
+    return key
+
+
+@contextmanager
+def model(key: str = PRIMARY) -> Iterator[Any]:
+    """
+    Hold a model for the block (it won't be evicted meanwhile). If the fast model can't be
+    loaded (e.g. not downloaded on an offline host), the primary one is used instead.
+    """
+    if key != PRIMARY:
+        try:
+            with resources.use(key) as m:
+                yield m
+            return
+        except Exception as e:
+            if resources.is_loaded(key):
+                raise  # failed while transcribing, not while loading
+            print(f"⚠️ Could not load {key}, using the primary model:", e)
+    with resources.use(PRIMARY) as m:
+        yield m
@@ -4,12 +4,28 @@ sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 import streamlit as st
 from dotenv import load_dotenv
 
-from app.core.ingest import extract_text_from_upload, extract_texts_from_uploads
-from app.core.pipeline import summarize_and_extract
-from app.core.storage import init_db, save_meeting_result, list_meetings, get_meeting
-from app.core.models import MeetingResult
+import time
 
 load_dotenv()
+
+# With API_URL set, the page is a thin client of the HTTP API (app/api.py): same functions over
+# HTTP, and no DB, models or job workers in this process
+API_URL = os.getenv("API_URL", "").strip()
+if API_URL:
+    from app.client import (
+        list_meetings, get_meeting, get_transcript, search_meetings, related_meetings,
+        list_action_items, overdue_action_items, list_assignees, set_action_item_status,
+        STAGES, submit_job, get_job,
+    )
+else:
+    from app.core.storage import (
+        init_db, list_meetings, get_meeting, get_transcript, search_meetings, related_meetings,
+        list_action_items, overdue_action_items, list_assignees, set_action_item_status,
+    )
+    from app.core.jobs import STAGES, start_workers, submit_job, get_job
+    from app.core.metrics import serve_from_env
+    from app.core.resources import warm_up_from_env
+
 st.set_page_config(page_title="AI Meeting Summarizer", page_icon="📝", layout="wide")
 
 # --- Helper: render action items nicely (only border, transparent background) ---
@@ -24,10 +40,13 @@ def render_action_items(items):
             assignee = item.get("assignee") or "—"
             task = item.get("task") or "—"
             due = item.get("due_date") or "—"
+            status = item.get("status") or "open"
         else:
             assignee = getattr(item, "assignee", None) or "—"
             task = getattr(item, "task", None) or "—"
             due = getattr(item, "due_date", None) or "—"
+            status = "open"
+        status_line = "" if status == "open" else f"<br><b>Status:</b> {status}"
 
         st.markdown(
             f"""
@@ -40,59 +59,262 @@ def render_action_items(items):
             ">
                 <b>{i}. Assignee:</b> {assignee}<br>
                 <b>Task:</b> {task}<br>
-                <b>Due Date:</b> {due}
+                <b>Due Date:</b> {due}{status_line}
             </div>
             """,
             unsafe_allow_html=True
         )
 
+# --- Helper: render one result section into a placeholder (used while streaming) ---
+def render_section(placeholder, key, value):
+    with placeholder.container():
+        if key == "action_items":
+            st.markdown("### ✅ Action Items")
+            render_action_items(value)
+            return
+        if not value:
+            return
+        header = {
+            "decisions": "### 🧩 Key Decisions",
+            "important_dates": "### 📅 Important Dates",
+            "other_notes": "### 📝 Other Notes",
+        }[key]
+        st.markdown(header)
+        for v in value:
+            st.markdown(f"- {v}")
+
+# --- Helper: render a saved meeting (history view and finished jobs) ---
+def render_meeting(m):
+    st.markdown("### 📝 Summary")
+    st.write(m["summary"] or "—")
+
+    if m["decisions"]:
+        st.markdown("### 🧩 Key Decisions")
+        for d in m["decisions"]:
+            st.markdown(f"- {d}")
+
+    st.markdown("### ✅ Action Items")
+    render_action_items(m.get("action_items") or [])
+
+    if m.get("important_dates"):
+        st.markdown("### 📅 Important Dates")
+        for d in m["important_dates"]:
+            st.markdown(f"- {d}")
+
+    if m.get("other_notes"):
+        st.markdown("### 📝 Other Notes")
+        for n in m["other_notes"]:
+            st.markdown(f"- {n}")
+
+# --- Helper: per-stage progress + partial results of a background job ---
+def render_job(job):
+    current = STAGES.index(job["stage"]) if job["stage"] in STAGES else (len(STAGES) if job["status"] == "done" else -1)
+    for i, stage in enumerate(STAGES):
+        if i < current:
+            st.markdown(f"✅ {stage.capitalize()}")
+        elif i == current:
+            st.markdown(f"⏳ {stage.capitalize()}…")
+            st.progress(min(1.0, job["progress"]))
+        else:
+            st.markdown(f"▫️ {stage.capitalize()}")
+
+    partial = job["partial"]
+    if partial.get("transcript_tail"):
+        st.text(partial["transcript_tail"])
+    if partial.get("summary"):
+        st.markdown("### 📝 Summary")
+        st.write(partial["summary"])
+    for key in ("decisions", "action_items", "important_dates", "other_notes"):
+        if partial.get(key):
+            render_section(st.empty(), key, partial[key])
+
+# --- Helper: open action items across all meetings ---
+def render_action_dashboard():
+    st.subheader("📋 Open Action Items")
+    assignees = [a["assignee"] for a in list_assignees()]
+    cols = st.columns(2)
+    who = cols[0].selectbox("Assignee", ["Everyone"] + assignees)
+    overdue_only = cols[1].checkbox("Overdue only")
+    assignee = None if who == "Everyone" else who
+    if overdue_only:
+        items = [i for i in overdue_action_items() if assignee is None or i["assignee"] == assignee]
+    else:
+        items = list_action_items(assignee=assignee)
+    if not items:
+        st.info("Nothing open. 🎉")
+    for item in items:
+        c1, c2 = st.columns([5, 1])
+        due = item["due_on"] or item["due_date"] or "—"
+        c1.markdown(f"**{item['assignee'] or '—'}** — {item['task']}  \n📅 {due} • _{item['meeting_title']}_")
+        if c2.button("Done", key=f"done-{item['id']}"):
+            set_action_item_status(item["id"], "done")
+            st.rerun()
+
+# --- Background job workers, optional metrics endpoint and model preload (started once per server process) ---
+if not API_URL:
+    init_db()
+    start_workers()
+    serve_from_env()
+    warm_up_from_env(default="whisper")  # avoid a cold Whisper load on the first recording
+
 # --- Sidebar: History ---
 with st.sidebar:
+    if st.button("📋 Open action items"):
+        st.session_state["show_actions"] = True
+        st.session_state.pop("selected_meeting_id", None)
     st.header("📜 History")
-    init_db()
-    meetings = list_meetings()
-    if not meetings:
-        st.caption("No meetings saved yet.")
+    query = st.text_input("🔍 Search meetings", placeholder="title, summary, decisions, assignee…")
+    if query.strip():
+        # Ranked full-text search, paginated 20 at a time
+        search_page_size = 20
+        if st.session_state.get("search_for") != query:
+            st.session_state["search_for"] = query
+            st.session_state["search_offset"] = 0
+        offset = st.session_state["search_offset"]
+        results = search_meetings(query, limit=search_page_size, offset=offset)
+        if not results:
+            st.caption("No matching meetings.")
+        for r in results:
+            if st.button(f"{r['title']} • {r['created_at']}", key=f"s-{r['id']}"):
+                st.session_state["selected_meeting_id"] = r["id"]
+                st.session_state.pop("show_actions", None)
+            if r["snippet"]:
+                st.caption(r["snippet"])
+
+        cols = st.columns(2)
+        if offset and cols[0].button("« Previous"):
+            st.session_state["search_offset"] = max(0, offset - search_page_size)
+            st.rerun()
+        if len(results) == search_page_size and cols[1].button("Next »"):
+            st.session_state["search_offset"] = offset + search_page_size
+            st.rerun()
     else:
-        for m in meetings:
-            if st.button(f"{m['title']} • {m['created_at']}", key=f"m-{m['id']}"):
-                st.session_state["selected_meeting_id"] = m["id"]
+        page_size = 50
+        before = st.session_state.get("history_before")
+        meetings = list_meetings(limit=page_size, before=before)
+        if not meetings:
+            st.caption("No meetings saved yet.")
+        else:
+            for m in meetings:
+                if st.button(f"{m['title']} • {m['created_at']}", key=f"m-{m['id']}"):
+                    st.session_state["selected_meeting_id"] = m["id"]
+                    st.session_state.pop("show_actions", None)
+
+        # Keyset pagination: the next page starts after the last row shown
+        cols = st.columns(2)
+        if before and cols[0].button("« Newest"):
+            st.session_state.pop("history_before", None)
+            st.rerun()
+        if len(meetings) == page_size and cols[1].button("Older »"):
+            st.session_state["history_before"] = (meetings[-1]["created_at"], meetings[-1]["id"])
+            st.rerun()
 
 st.title("📝 AI Meeting Summarizer & Action Tracker")
 
 # --- If a saved meeting is selected, show its details ---
 sel_id = st.session_state.get("selected_meeting_id")
+job_id = st.session_state.get("job_id")
 if sel_id:
     m = get_meeting(sel_id)
     if not m:
         st.warning("Could not load this meeting.")
     else:
         st.subheader(m["title"])
-        st.markdown("### 📝 Summary")
-        st.write(m["summary"] or "—")
-
-        if m["decisions"]:
-            st.markdown("### 🧩 Key Decisions")
-            for d in m["decisions"]:
-                st.markdown(f"- {d}")
+        render_meeting(m)
 
-        st.markdown("### ✅ Action Items")
-        render_action_items(m.get("action_items") or [])
+        # --- Earlier meetings on the same topics (local semantic index) ---
+        if st.toggle("🔗 Related meetings", key=f"related-{m['id']}"):
+            related = related_meetings(f"{m['title']}\n{m['summary']}", limit=5, exclude_meeting_id=m["id"])
+            if not related:
+                st.caption("No related meetings found.")
+            for r in related:
+                st.markdown(f"**{r['title']}** • {r['created_at']}  \n_{r['match'][:200]}_")
 
-        if m.get("important_dates"):
-            st.markdown("### 📅 Important Dates")
-            for d in m["important_dates"]:
-                st.markdown(f"- {d}")
+        # --- Transcript: read and decompressed only when asked for ---
+        if st.toggle("📄 Show transcript", key=f"transcript-{m['id']}"):
+            st.text(get_transcript(m["id"]) or "No transcript saved.")
 
-        if m.get("other_notes"):
-            st.markdown("### 📝 Other Notes")
-            for n in m["other_notes"]:
-                st.markdown(f"- {n}")
+        # --- Append to / edit the transcript; only changed sections are re-summarized ---
+        with st.expander("✏️ Update this meeting"):
+            mode = st.radio(
+                "Update",
+                ["append", "replace"],
+                format_func=lambda v: "Append new transcript" if v == "append" else "Edit full transcript",
+                horizontal=True,
+            )
+            with st.form("update-form"):
+                upd_files = None
+                if mode == "append":
+                    upd_files = st.file_uploader(
+                        "Upload additional transcript files",
+                        type=["txt", "pdf", "docx", "mp3", "wav", "m4a"],
+                        accept_multiple_files=True,
+                    )
+                upd_text = st.text_area(
+                    "New transcript text (append) or the edited transcript (edit)",
+                    get_transcript(m["id"]) if mode == "replace" else "",
+                    height=200,
+                )
+                upd_btn = st.form_submit_button("🔄 Update summary")
+            if upd_btn:
+                if not upd_files and not upd_text.strip():
+                    st.error("Please upload a file or enter transcript text.")
+                    st.stop()
+                try:
+                    st.session_state["job_id"] = submit_job(
+                        m["title"],
+                        [(f.name, f) for f in (upd_files or [])],
+                        upd_text,
+                        meeting_id=m["id"],
+                        mode=mode,
+                    )
+                except RuntimeError as e:  # refused by the API (size limits, busy)
+                    st.error(str(e))
+                    st.stop()
+                st.session_state.pop("selected_meeting_id", None)
+                st.rerun()
 
         st.divider()
         if st.button("← Back"):
             st.session_state.pop("selected_meeting_id", None)
 
+# --- Cross-meeting action item dashboard ---
+elif st.session_state.get("show_actions"):
+    render_action_dashboard()
+    st.divider()
+    if st.button("← Back"):
+        st.session_state.pop("show_actions", None)
+        st.rerun()
+
+# --- A submitted job: poll its status until done ---
+elif job_id:
+    job = get_job(job_id)
+    if not job:
+        st.session_state.pop("job_id", None)
+        st.rerun()
+
+    st.subheader(job["title"])
+    if job["status"] == "done":
+        st.success("Done! Saved to history.")
+        if job["error"]:
+            st.warning(job["error"])
+        render_meeting(get_meeting(job["meeting_id"]))
+    elif job["status"] == "failed":
+        st.error(f"Processing failed: {job['error']}")
+    else:
+        if job["status"] == "queued":
+            st.info("⏳ Queued — waiting for a worker...")
+        render_job(job)
+
+    st.divider()
+    if job["status"] in ("done", "failed"):
+        if st.button("← New meeting"):
+            st.session_state.pop("job_id", None)
+            st.rerun()
+    else:
+        time.sleep(float(os.getenv("JOB_POLL_SECONDS", "0.5")))
+        st.rerun()
+
 # --- Otherwise, show upload/paste form ---
 else:
     with st.form("input-form"):
@@ -102,7 +324,7 @@ else:
             type=["txt", "pdf", "docx", "mp3", "wav", "m4a"],
             accept_multiple_files=True,
         )
-        text_input = st.text_area("…or paste raw transcript text here", height=200)
+        text_input = st.text_area("…or paste raw transcript text here (added after the files when both are given)", height=200)
         run_btn = st.form_submit_button("🚀 Generate Summary & Actions")
 
     if run_btn:
@@ -110,49 +332,14 @@ else:
             st.error("Please upload a file or paste transcript text.")
             st.stop()
 
-        # --- Build transcript ---
-        if uploaded_files:
-            file_name = uploaded_files[0].name.lower()
-
-            if file_name.endswith((".mp3", ".wav", ".m4a")):
-                st.info("🎙️ Transcribing audio... please wait (first run may take ~30 s)")
-                transcript = extract_text_from_upload(uploaded_files[0])
-                st.success("✅ Audio transcription complete.")
-            elif len(uploaded_files) == 1:
-                transcript = extract_text_from_upload(uploaded_files[0])
-            else:
-                transcript = extract_texts_from_uploads(uploaded_files)
-        else:
-            transcript = text_input.strip()
-
-        # --- Summarization ---
-        with st.spinner("🧠 Summarizing..."):
-            result: MeetingResult = summarize_and_extract(
-                title=title or "Untitled Meeting",
-                transcript=transcript,
+        # --- Enqueue; the worker pool does ingest → summarize → save ---
+        try:
+            st.session_state["job_id"] = submit_job(
+                title or "Untitled Meeting",
+                [(f.name, f) for f in (uploaded_files or [])],
+                text_input,
             )
-
-        # --- Persist & display ---
-        save_meeting_result(result)
-        st.success("Done! Saved to history.")
-
-        st.markdown("### 📝 Summary")
-        st.write(result.summary or "—")
-
-        if result.decisions:
-            st.markdown("### 🧩 Key Decisions")
-            for d in result.decisions:
-                st.markdown(f"- {d}")
-
-        st.markdown("### ✅ Action Items")
-        render_action_items(result.action_items)
-
-        if result.important_dates:
-            st.markdown("### 📅 Important Dates")
-            for d in result.important_dates:
-                st.markdown(f"- {d}")
-
-        if result.other_notes:
-            st.markdown("### 📝 Other Notes")
-            for n in result.other_notes:
-                st.markdown(f"- {n}")
+        except RuntimeError as e:  # refused by the API (size limits, busy)
+            st.error(str(e))
+            st.stop()
+        st.rerun()
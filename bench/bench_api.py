@@ -0,0 +1,228 @@
+"""
+The HTTP API (app/api.py) under load, against real `python -m app.api` server processes on a
+throwaway DATA_DIR, with the offline mock LLM (LLM_MOCK_LATENCY_MS per request).
+
+- upload: one large file streamed as multipart (no job workers, so only the upload is
+  measured): throughput and the server's peak RSS growth, which must stay far below the file size
+- jobs: N text jobs submitted at once from concurrent clients, per number of server processes:
+  submit p50/p95, time until all are done, 429s past API_MAX_QUEUED_JOBS, and a check that
+  every accepted job finished exactly once (jobs are claimed across processes)
+- reads: GET /meetings/{id} latency while those jobs run
+
+    python -m bench.bench_api
+    python -m bench.bench_api --processes 1 2 4 --jobs 200 --upload-mb 200
+"""
+import argparse
+import json
+import os
+import socket
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+import httpx
+
+from bench import fixtures
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _pct(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class Server:
+    """`python -m app.api` in a subprocess; stopped on exit."""
+
+    def __init__(self, data_dir: str, processes: int, **env: str):
+        self.port = _free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        self.env = dict(os.environ, DATA_DIR=data_dir, LLM_PROVIDER="mock", PRELOAD_RESOURCES="", **env)
+        self.processes = processes
+
+    def __enter__(self) -> "Server":
+        self.proc = subprocess.Popen(
+            [sys.executable, "-m", "app.api", "--port", str(self.port), "--workers", str(self.processes)],
+            env=self.env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        deadline = time.time() + 30
+        while time.time() < deadline:
+            try:
+                if httpx.get(f"{self.url}/health", timeout=1).status_code == 200:
+                    return self
+            except httpx.HTTPError:
+                time.sleep(0.1)
+        self.__exit__()
+        raise RuntimeError("API server did not start")
+
+    def __exit__(self, *exc):
+        self.proc.terminate()
+        try:
+            self.proc.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+
+    def peak_rss_mb(self) -> float:
+        """Peak RSS of the server process and its workers (VmHWM, Linux)."""
+        pids = [self.proc.pid] + [int(p) for p in subprocess.run(
+            ["pgrep", "-P", str(self.proc.pid)], capture_output=True, text=True).stdout.split()]
+        total = 0.0
+        for pid in pids:
+            try:
+                with open(f"/proc/{pid}/status") as f:
+                    total += next(int(l.split()[1]) for l in f if l.startswith("VmHWM")) / 1024
+            except (OSError, StopIteration):
+                pass
+        return total
+
+
+def bench_upload(args) -> Dict[str, Any]:
+    size = args.upload_mb * 1024 * 1024
+    block = (fixtures.transcript(64 * 1024 // 4) + "\n").encode()[: 1 << 16]
+
+    def body():
+        sent = 0
+        while sent < size:
+            chunk = block[: size - sent]
+            sent += len(chunk)
+            yield chunk
+
+    class Stream:
+        """File-like view over body() so httpx streams the multipart part instead of buffering it."""
+
+        def __init__(self):
+            self._it, self._buf = body(), b""
+
+        def read(self, n: int = -1) -> bytes:
+            while n < 0 or len(self._buf) < n:
+                try:
+                    self._buf += next(self._it)
+                except StopIteration:
+                    break
+            out, self._buf = (self._buf, b"") if n < 0 else (self._buf[:n], self._buf[n:])
+            return out
+
+    with tempfile.TemporaryDirectory() as tmp, Server(tmp, 1, JOB_WORKERS="0", API_MAX_UPLOAD_MB=str(args.upload_mb + 1)) as srv:
+        base_rss = srv.peak_rss_mb()
+        start = time.perf_counter()
+        resp = httpx.post(f"{srv.url}/jobs", data={"title": "Big"}, files=[("files", ("big.txt", Stream()))], timeout=600)
+        elapsed = time.perf_counter() - start
+        assert resp.status_code == 202, resp.text
+        out = {
+            "upload_mb": args.upload_mb,
+            "mb_per_s": round(args.upload_mb / elapsed, 1),
+            "server_rss_growth_mb": round(srv.peak_rss_mb() - base_rss, 1),
+        }
+    print(f"  upload {args.upload_mb} MB: {out['mb_per_s']} MB/s, server peak RSS +{out['server_rss_growth_mb']} MB")
+    return out
+
+
+def bench_jobs(processes: int, args) -> Dict[str, Any]:
+    texts = [fixtures.transcript(args.tokens, seed=i) for i in range(min(args.jobs, 50))]
+    with tempfile.TemporaryDirectory() as tmp, Server(
+        tmp, processes, JOB_WORKERS=str(args.job_workers), LLM_MOCK_LATENCY_MS=str(args.llm_ms),
+        API_MAX_QUEUED_JOBS=str(args.max_queued), LLM_CACHE_ENABLED="0", SEMANTIC_INDEX="0",
+    ) as srv:
+        client = httpx.Client(base_url=srv.url, timeout=60)
+        # one meeting to read while the jobs run
+        seed_id = client.post("/jobs", json={"title": "Seed", "text": texts[0]}).json()["job_id"]
+        while client.get(f"/jobs/{seed_id}").json()["status"] != "done":
+            time.sleep(0.05)
+        meeting_id = client.get(f"/jobs/{seed_id}").json()["meeting_id"]
+
+        submit_ms: List[float] = []
+        statuses: List[int] = []
+        accepted: List[str] = []
+        lock = threading.Lock()
+
+        def submit(i: int):
+            start = time.perf_counter()
+            resp = client.post("/jobs", files=[("files", (f"m{i}.txt", texts[i % len(texts)].encode()))], data={"title": f"M{i}"})
+            with lock:
+                submit_ms.append((time.perf_counter() - start) * 1000)
+                statuses.append(resp.status_code)
+                if resp.status_code == 202:
+                    accepted.append(resp.json()["job_id"])
+
+        read_ms: List[float] = []
+        stop = threading.Event()
+
+        def reader():
+            while not stop.is_set():
+                start = time.perf_counter()
+                client.get(f"/meetings/{meeting_id}")
+                read_ms.append((time.perf_counter() - start) * 1000)
+                time.sleep(0.01)
+
+        reading = threading.Thread(target=reader)
+        reading.start()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(args.clients) as pool:
+            list(pool.map(submit, range(args.jobs)))
+        pending = set(accepted)
+        while pending:
+            pending = {j for j in pending if client.get(f"/jobs/{j}").json()["status"] not in ("done", "failed")}
+            time.sleep(0.1)
+        total = time.perf_counter() - start
+        stop.set()
+        reading.join()
+
+        con = sqlite3.connect(os.path.join(tmp, "meetings.db"))
+        done = con.execute("SELECT COUNT(*), COUNT(DISTINCT meeting_id) FROM jobs WHERE status = 'done'").fetchone()
+        meetings = con.execute("SELECT COUNT(*) FROM meetings").fetchone()[0]
+        con.close()
+
+    out = {
+        "processes": processes,
+        "accepted": len(accepted),
+        "rejected_429": statuses.count(429),
+        "rejected_503": statuses.count(503),
+        "submit_p50_ms": round(statistics.median(submit_ms), 1),
+        "submit_p95_ms": round(_pct(submit_ms, 0.95), 1),
+        "all_done_s": round(total, 2),
+        "jobs_per_s": round(len(accepted) / total, 1),
+        "read_p50_ms": round(statistics.median(read_ms), 1) if read_ms else None,
+        "read_p95_ms": round(_pct(read_ms, 0.95), 1) if read_ms else None,
+        "exactly_once": done[0] == done[1] == meetings == len(accepted) + 1,
+    }
+    print(f"  {processes} process(es): {out['accepted']} accepted, {out['rejected_429']} × 429, {out['rejected_503']} × 503  "
+          f"submit p50 {out['submit_p50_ms']} ms / p95 {out['submit_p95_ms']} ms  "
+          f"all done in {out['all_done_s']} s ({out['jobs_per_s']} jobs/s)  "
+          f"reads p50 {out['read_p50_ms']} ms / p95 {out['read_p95_ms']} ms  exactly once: {out['exactly_once']}")
+    return out
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--processes", type=int, nargs="+", default=[1, 2])
+    ap.add_argument("--jobs", type=int, default=120)
+    ap.add_argument("--max-queued", type=int, default=100, help="API_MAX_QUEUED_JOBS")
+    ap.add_argument("--clients", type=int, default=16, help="concurrent submitting clients")
+    ap.add_argument("--job-workers", type=int, default=2, help="JOB_WORKERS per server process")
+    ap.add_argument("--tokens", type=int, default=2000, help="approximate transcript length per job")
+    ap.add_argument("--llm-ms", type=float, default=200, help="mock LLM latency per request")
+    ap.add_argument("--upload-mb", type=int, default=100)
+    ap.add_argument("--json", help="write results to this file")
+    args = ap.parse_args(argv)
+
+    results: Dict[str, Any] = {"upload": bench_upload(args)}
+    results["jobs"] = [bench_jobs(n, args) for n in args.processes]
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+"""
+Accuracy, throughput and memory of the speaker diarization stage (app.core.diarize) on
+synthetic conversations.
+
+Each synthetic speaker is a voice with its own pitch, vocal-tract length (formant scale) and
+spectral tilt; turns are strings of random vowel syllables separated by short pauses, with
+background noise. Accuracy is the share of speech time whose label maps to the right speaker
+(each predicted label counted as its majority speaker); extra labels are reported separately.
+The memory check streams long recordings through the diarizer and compares peak allocations:
+they must not grow with the duration.
+
+    python -m bench.bench_diarize
+    python -m bench.bench_diarize --speakers 2 4 6 --seeds 5 --minutes 10 60
+"""
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterator, List, Tuple
+
+import numpy as np
+
+from app.core import diarize
+
+SR = diarize.SAMPLE_RATE
+# (F1, F2, F3) of a few vowels, adult average
+_VOWELS = np.array([
+    (730, 1090, 2440), (270, 2290, 3010), (300, 870, 2240), (530, 1840, 2480),
+    (660, 1720, 2410), (490, 1350, 1690), (640, 1190, 2390),
+], dtype=float)
+
+
+def _voices(rng: np.random.Generator, n: int) -> List[Dict[str, float]]:
+    """n voices spread over the usual range of pitch (85–255 Hz) and formant scale."""
+    f0 = rng.permutation(np.geomspace(85, 255, n)) * rng.uniform(0.95, 1.05, n)
+    scale = rng.permutation(np.linspace(0.85, 1.2, n)) * rng.uniform(0.97, 1.03, n)
+    return [
+        {"f0": f0[i], "scale": scale[i], "tilt": rng.uniform(6, 14), "breath": rng.uniform(0.005, 0.03)}
+        for i in range(n)
+    ]
+
+
+def _utterance(rng: np.random.Generator, voice: Dict[str, float], seconds: float) -> np.ndarray:
+    """Additive harmonic synthesis: each syllable is a vowel's formant envelope sampled at the pitch harmonics."""
+    n = int(seconds * SR)
+    out = np.zeros(n, dtype=np.float32)
+    t = 0
+    while t < n:
+        length = int(rng.uniform(0.12, 0.3) * SR)
+        formants = _VOWELS[rng.integers(len(_VOWELS))] * voice["scale"]
+        f0 = voice["f0"] * rng.uniform(0.85, 1.15)
+        harmonics = np.arange(1, int(7800 / f0) + 1) * f0
+        amp = sum(1.0 / (1 + ((harmonics - f) / bw) ** 2) for f, bw in zip(formants, (90, 110, 140)))
+        amp *= 10 ** (-voice["tilt"] * np.log2(harmonics / 100) / 20)
+        phase = rng.uniform(0, 2 * np.pi, len(harmonics))
+        tt = np.arange(length) / SR
+        y = (amp[:, None] * np.sin(2 * np.pi * harmonics[:, None] * tt + phase[:, None])).sum(axis=0)
+        y += rng.normal(0, voice["breath"] * amp.max(), length)
+        y *= np.hanning(length)
+        end = min(n, t + length)
+        out[t:end] += y[:end - t]
+        t += length + int(rng.uniform(0, 0.08) * SR)
+    return out / (np.abs(out).max() + 1e-9) * rng.uniform(0.3, 0.9)
+
+
+def conversation(seed: int, n_speakers: int, seconds: float) -> Iterator[Tuple[Dict[str, Any], np.ndarray]]:
+    """Yield (segment with its true "speaker", segment samples) for a synthetic meeting, one at a time."""
+    rng = np.random.default_rng(seed)
+    voices = _voices(rng, n_speakers)
+    t, previous = 0.0, None
+    while t < seconds:
+        speaker = int(rng.integers(n_speakers))
+        if speaker == previous and n_speakers > 1:
+            continue
+        previous = speaker
+        for _ in range(int(rng.integers(1, 3))):
+            duration = float(rng.uniform(0.8, 6.0))
+            samples = _utterance(rng, voices[speaker], duration)
+            samples += rng.normal(0, 0.003, len(samples)).astype(np.float32)
+            yield {"start": t, "end": t + duration, "text": "…", "true": speaker}, samples
+            t += duration + float(rng.uniform(0.1, 0.8))
+
+
+def _embedded(segments) -> Iterator[Dict[str, Any]]:
+    for seg, samples in segments:
+        seg["embedding"] = diarize.embed(samples)
+        yield seg
+
+
+def accuracy(labelled: List[Dict[str, Any]]) -> Tuple[float, int]:
+    by_label: Dict[int, Counter] = defaultdict(Counter)
+    for seg in labelled:
+        by_label[seg["speaker"]][seg["true"]] += seg["end"] - seg["start"]
+    correct = sum(c.most_common(1)[0][1] for c in by_label.values())
+    total = sum(seg["end"] - seg["start"] for seg in labelled)
+    return correct / total, len(by_label)
+
+
+def run_accuracy(speakers: List[int], seeds: int, seconds: float) -> Dict[str, Any]:
+    results = {}
+    for n in speakers:
+        scores, labels = [], []
+        for seed in range(seeds):
+            acc, n_labels = accuracy(list(diarize.diarize(_embedded(conversation(seed * 100 + n, n, seconds)))))
+            scores.append(acc)
+            labels.append(n_labels)
+        results[n] = {"accuracy": round(float(np.mean(scores)), 3), "worst": round(min(scores), 3),
+                      "labels_mean": round(float(np.mean(labels)), 1)}
+        r = results[n]
+        print(f"  {n} speakers  accuracy {r['accuracy']:.1%} (worst {r['worst']:.1%})  "
+              f"labels found {r['labels_mean']:.1f}")
+    return results
+
+
+def run_scaling(minutes: List[float]) -> Dict[str, Any]:
+    """Embedding + clustering time per audio minute, and peak memory of the clustering alone."""
+    results = {}
+    for m in minutes:
+        segments = list(conversation(7, 4, m * 60))
+        start = time.perf_counter()
+        embedded = list(_embedded(segments))
+        embed_s = time.perf_counter() - start
+        tracemalloc.start()
+        start = time.perf_counter()
+        for _ in diarize.diarize(iter(embedded)):
+            pass
+        cluster_s = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        results[m] = {"embed_ms_per_min": round(embed_s * 1000 / m, 1),
+                      "cluster_ms_per_min": round(cluster_s * 1000 / m, 1),
+                      "cluster_peak_kb": round(peak / 1024, 1)}
+        r = results[m]
+        print(f"  {m:>5.0f} min  embed {r['embed_ms_per_min']:7.1f} ms/min  "
+              f"cluster {r['cluster_ms_per_min']:6.1f} ms/min  peak {r['cluster_peak_kb']:8.1f} KB")
+    return results
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--speakers", type=int, nargs="+", default=[2, 3, 4, 6])
+    ap.add_argument("--seeds", type=int, default=3)
+    ap.add_argument("--seconds", type=float, default=300, help="length of each accuracy conversation")
+    ap.add_argument("--minutes", type=float, nargs="+", default=[5, 20, 60])
+    ap.add_argument("--json", help="write results to this file")
+    args = ap.parse_args(argv)
+
+    print("Accuracy:")
+    results = {"accuracy": run_accuracy(args.speakers, args.seeds, args.seconds)}
+    print("Scaling:")
+    results["scaling"] = run_scaling(args.minutes)
+
+    failures = []
+    peaks = [r["cluster_peak_kb"] for r in results["scaling"].values()]
+    if len(peaks) > 1 and peaks[-1] > 2 * peaks[0] + 256:
+        failures.append(f"clustering memory grows with duration ({peaks[0]:.0f} KB → {peaks[-1]:.0f} KB)")
+    for line in failures:
+        print("❌", line)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""
+Tail latency with and without request hedging (LLM_FALLBACK_PROVIDER), against two local mock servers.
+
+The primary answers fast but a fraction of its requests are slow outliers; the backup is a bit
+slower but steady. Each configuration sends the same requests and reports p50/p95/p99 latency
+and how many extra requests hedging cost.
+
+    python -m bench.bench_hedge
+    python -m bench.bench_hedge --requests 400 --tail-rate 0.05 --tail-ms 3000
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import Dict, List
+
+from bench.mock_llm import MockLLMServer
+
+
+def _pct(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def _run(prompts: List[str], concurrency: int) -> List[float]:
+    from app.core.llm import acall_llm_json
+
+    sem = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+
+    async def one(prompt: str):
+        async with sem:
+            start = time.perf_counter()
+            await acall_llm_json(prompt)
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(one(p) for p in prompts))
+    return latencies
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--requests", type=int, default=200)
+    ap.add_argument("--concurrency", type=int, default=8)
+    ap.add_argument("--latency-ms", type=float, default=100)
+    ap.add_argument("--backup-latency-ms", type=float, default=150)
+    ap.add_argument("--tail-rate", type=float, default=0.08)
+    ap.add_argument("--tail-ms", type=float, default=1500)
+    ap.add_argument("--json", help="write results to this file")
+    args = ap.parse_args(argv)
+
+    primary = MockLLMServer(latency_ms=args.latency_ms, jitter_ms=args.latency_ms * 0.2,
+                            tail_rate=args.tail_rate, tail_ms=args.tail_ms, seed=1).start()
+    backup = MockLLMServer(latency_ms=args.backup_latency_ms, jitter_ms=args.backup_latency_ms * 0.2, seed=2).start()
+    os.environ.update({
+        "LLM_PROVIDER": "cerebras",
+        "CEREBRAS_API_BASE": primary.base_url,
+        "CEREBRAS_API_KEY": "bench",
+        "OPENAI_API_BASE": backup.base_url,
+        "LLM_MAX_IN_FLIGHT": str(args.concurrency * 2),
+        "LLM_REASK_MAX": "0",
+    })
+    from app.core.llm import run_sync
+
+    prompts = [f"Transcript:\nAlice: item {i} is ready. Bob will review it by Friday." for i in range(args.requests)]
+    configs = {
+        "primary only": {"LLM_FALLBACK_PROVIDER": ""},
+        "hedged (p95)": {"LLM_FALLBACK_PROVIDER": "openai", "LLM_HEDGE_AFTER_MS": ""},
+    }
+    results: Dict[str, Dict[str, float]] = {}
+    for name, env in configs.items():
+        os.environ.update(env)
+        run_sync(_run(prompts[:30], args.concurrency))  # warm-up: connections and the hedge quantile
+        before = primary.requests + backup.requests
+        latencies = run_sync(_run(prompts, args.concurrency))
+        sent = primary.requests + backup.requests - before
+        results[name] = {
+            "p50_ms": round(_pct(latencies, 0.50) * 1000, 1),
+            "p95_ms": round(_pct(latencies, 0.95) * 1000, 1),
+            "p99_ms": round(_pct(latencies, 0.99) * 1000, 1),
+            "max_ms": round(max(latencies) * 1000, 1),
+            "extra_requests_pct": round(100.0 * (sent - len(prompts)) / len(prompts), 1),
+        }
+        r = results[name]
+        print(f"  {name:<14} p50={r['p50_ms']:>7.1f}ms  p95={r['p95_ms']:>7.1f}ms  p99={r['p99_ms']:>7.1f}ms  "
+              f"max={r['max_ms']:>7.1f}ms  extra requests {r['extra_requests_pct']:.1f}%")
+
+    primary.stop()
+    backup.stop()
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""
+Import-time budget check for the core modules.
+
+Each module is imported cold in a fresh interpreter (several times, median reported) and must
+stay under its budget without pulling in the heavy dependencies that are meant to load lazily
+(Streamlit, PDF/DOCX parsers, OCR, Whisper). Exit code 1 on any violation, so it can gate CI.
+
+    python -m bench.bench_import
+    python -m bench.bench_import --repeat 9 --scale 1.5    # slower machine: relax every budget
+    python -m bench.bench_import --modules app.core.pipeline=300
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+# Cold-import budgets in milliseconds (measured with headroom on a laptop-class CPU)
+BUDGETS_MS = {
+    "app.core.pipeline": 400,
+    "app.core.ingest": 400,
+    "app.core.jobs": 500,
+    "app.cli": 500,
+}
+
+# Must not be imported as a side effect of importing any core module
+FORBIDDEN = [
+    "streamlit", "pypdf", "docx", "chardet", "pdf2image", "pytesseract", "pandas",
+    "faster_whisper", "ctranslate2", "onnxruntime", "PIL",
+]
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"ms": elapsed * 1000, "modules": [m for m in {forbidden!r} if m in sys.modules]}}))
+"""
+
+
+def measure_import(module: str, repeat: int) -> Dict[str, object]:
+    times: List[float] = []
+    leaked: List[str] = []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(module=module, forbidden=FORBIDDEN)],
+            capture_output=True, text=True, check=True,
+        )
+        probe = json.loads(out.stdout.strip().splitlines()[-1])
+        times.append(probe["ms"])
+        leaked = probe["modules"]
+    return {"median_ms": round(statistics.median(times), 1), "max_ms": round(max(times), 1), "leaked": leaked}
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--scale", type=float, default=1.0, help="multiply every budget (slow CI machines)")
+    ap.add_argument("--modules", help="comma-separated module=budget_ms overrides/additions")
+    ap.add_argument("--json", help="write results to this file")
+    args = ap.parse_args(argv)
+
+    budgets = dict(BUDGETS_MS)
+    for spec in (args.modules or "").split(","):
+        if spec.strip():
+            name, _, ms = spec.partition("=")
+            budgets[name.strip()] = float(ms or 0) or BUDGETS_MS.get(name.strip(), 500)
+
+    results, failures = {}, []
+    for module, budget in budgets.items():
+        r = measure_import(module, args.repeat)
+        r["budget_ms"] = budget * args.scale
+        results[module] = r
+        status = "ok"
+        if r["median_ms"] > r["budget_ms"]:
+            failures.append(f"{module}: {r['median_ms']}ms > {r['budget_ms']:.0f}ms budget")
+            status = "SLOW"
+        if r["leaked"]:
+            failures.append(f"{module}: imports {', '.join(r['leaked'])} eagerly")
+            status = "LEAK"
+        print(f"  {module:<22} {r['median_ms']:>8.1f}ms  (max {r['max_ms']:.1f}, budget {r['budget_ms']:.0f})  {status}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    for line in failures:
+        print("❌", line)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
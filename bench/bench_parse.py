@@ -0,0 +1,136 @@
+"""
+Fuzz and throughput checks for parse.extract_json (the LLM output scanner/repairer).
+
+Fuzz: random answers (quotes, escapes, braces and unicode inside strings) are fed back
+plain, wrapped in prose, fenced, truncated at random points and as random garbage.
+Every case must return without raising; complete answers must round-trip exactly, and a
+truncated answer may only lose data at its end (no invented or reordered values).
+
+Throughput: prose-wrapped and truncated answers from 10 KB to 1 MB; the scan must stay linear.
+
+    python -m bench.bench_parse
+    python -m bench.bench_parse --cases 5000 --seed 7
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from typing import Any, Dict, List
+
+from app.core.parse import extract_json
+from app.core.models import SummaryFields
+
+_ALPHABET = 'abcdefghij KLMNOP 0123 ,.:;-{}[]"\\/\n\té€😀'
+
+
+def _text(rng: random.Random, n: int) -> str:
+    return "".join(rng.choice(_ALPHABET) for _ in range(n))
+
+
+def random_answer(rng: random.Random, n_items: int = 5) -> Dict[str, Any]:
+    return {
+        "summary": _text(rng, rng.randint(0, 200)),
+        "decisions": [_text(rng, rng.randint(1, 40)) for _ in range(rng.randint(0, n_items))],
+        "action_items": [
+            {"assignee": _text(rng, 8), "task": _text(rng, rng.randint(1, 40)), "due_date": rng.choice(["Friday", None, 3])}
+            for _ in range(rng.randint(0, n_items))
+        ],
+        "important_dates": [_text(rng, 12) for _ in range(rng.randint(0, 3))],
+        "other_notes": [],
+    }
+
+
+def _is_prefix_value(got: Any, want: Any) -> bool:
+    """True if `got` could be what remains of `want` after cutting the serialized text short."""
+    if isinstance(want, str):
+        return isinstance(got, str) and want.startswith(got)
+    if isinstance(want, list):
+        if not isinstance(got, list) or len(got) > len(want):
+            return False
+        if any(g != w for g, w in zip(got[:-1], want)):
+            return False
+        return not got or _is_prefix_value(got[-1], want[len(got) - 1])
+    if isinstance(want, dict):
+        keys = list(want)
+        if not isinstance(got, dict) or list(got) != keys[: len(got)]:
+            return False
+        return all(got[k] == want[k] for k in list(got)[:-1]) and (
+            not got or _is_prefix_value(got[keys[len(got) - 1]], want[keys[len(got) - 1]])
+        )
+    return got == want
+
+
+def fuzz(cases: int, seed: int) -> List[str]:
+    rng = random.Random(seed)
+    failures: List[str] = []
+    paths: Dict[str, int] = {}
+
+    def check(label: str, text: str, want: Any = None, exact: bool = False):
+        try:
+            got, path = extract_json(text)
+            SummaryFields.model_validate(got or {})
+        except Exception as e:
+            failures.append(f"{label}: raised {type(e).__name__}: {e} on {text[:80]!r}")
+            return
+        paths[path] = paths.get(path, 0) + 1
+        if want is None:
+            return
+        if exact and got != want:
+            failures.append(f"{label}: {path} result differs on {text[:80]!r}")
+        elif not exact and got is not None and not _is_prefix_value(got, want):
+            failures.append(f"{label}: {path} result is not a prefix of the answer on {text[-80:]!r}")
+
+    for _ in range(cases):
+        answer = random_answer(rng)
+        raw = json.dumps(answer, ensure_ascii=rng.random() < 0.5, indent=rng.choice([None, 2]))
+        check("plain", raw, answer, exact=True)
+        check("prose", f"Here you go: {raw}\nHope that helps {{or not}}.", answer, exact=True)
+        check("fenced", f"```json\n{raw}\n```", answer, exact=True)
+        for _ in range(3):
+            check("truncated", raw[: rng.randint(1, len(raw))], answer)
+        check("garbage", _text(rng, rng.randint(0, 300)))
+    print(f"  fuzz: {cases} answers, paths {dict(sorted(paths.items()))}, {len(failures)} failures")
+    return failures
+
+
+def throughput(repeat: int) -> List[str]:
+    rng = random.Random(0)
+    failures: List[str] = []
+    per_mb = {}
+    for kb in (10, 100, 1000):
+        answer = random_answer(rng, n_items=1)
+        answer["decisions"] = [_text(rng, 100) for _ in range(kb * 10)]
+        raw = json.dumps(answer)
+        for kind, text in (("prose", f"Sure!\n{raw}\nDone."), ("truncated", raw[: len(raw) * 3 // 4])):
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                obj, path = extract_json(text)
+                timings.append(time.perf_counter() - start)
+            best = min(timings)
+            mb = len(text.encode()) / 1e6
+            per_mb.setdefault(kind, {})[kb] = best / mb
+            print(f"  {kind:<10} {kb:>5} KB  {best * 1000:8.2f} ms  {mb / best:7.1f} MB/s  ({path})")
+    for kind, by_size in per_mb.items():
+        # linear scan: cost per MB must not grow with input size (generous 3x margin for noise/caches)
+        if by_size[1000] > 3 * by_size[10]:
+            failures.append(f"{kind}: cost per MB grows with size ({by_size[10]:.4f}s → {by_size[1000]:.4f}s)")
+    return failures
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--cases", type=int, default=2000)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args(argv)
+
+    failures = fuzz(args.cases, args.seed) + throughput(args.repeat)
+    for line in failures[:20]:
+        print("❌", line)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
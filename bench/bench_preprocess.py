@@ -0,0 +1,129 @@
+"""
+Prompt size and extraction quality with transcript preprocessing (app.core.preprocess).
+
+Fixtures are noisy synthetic meetings with known action items and decisions (see
+fixtures.spoken_meeting: diarized whisper output, named speakers, PDF pages with running
+headers/footers, and named turns flattened several per line). Each one goes through the
+summarizer (LLM_PROVIDER=mock, no result cache) as:
+- before: the previous ingest path, every line break collapsed into one line, sent verbatim
+- lines: line breaks kept (current ingest), PREPROCESS=0
+- preprocessed: line breaks kept, PDF boilerplate stripped, PREPROCESS=1
+and is scored against the known answers (action item = same assignee and task, decision =
+same sentence; fuzzy word overlap ≥ 0.8, measurements like "5 mm" kept exactly). Tokens are counted with TOKENIZER when set.
+
+    python -m bench.bench_preprocess
+    python -m bench.bench_preprocess --turns 80 400 --meetings 20
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from typing import Any, Dict, List, Tuple
+
+from app.core import ingest, pipeline, preprocess
+from bench import fixtures
+
+_WORD_RE = re.compile(r"[a-z']+")
+_IGNORED = {"by", "friday"}
+_MEASURE_RE = re.compile(r"\d+ mm\b")
+
+
+def _words(text: str) -> List[str]:
+    return [w for w in _WORD_RE.findall(text.lower()) if w not in _IGNORED]
+
+
+def _overlap(a: str, b: str) -> float:
+    wa, wb = _words(a), _words(b)
+    common = len(set(wa) & set(wb))
+    return 2 * common / (len(set(wa)) + len(set(wb))) if wa and wb else 0.0
+
+
+def _same_decision(predicted: str, truth: str) -> bool:
+    """Fuzzy sentence match, but quantities with their units ("5 mm") must be kept exactly."""
+    return _overlap(predicted, truth) >= 0.8 and _MEASURE_RE.findall(predicted) == _MEASURE_RE.findall(truth)
+
+
+def _match(predicted: List[Any], truth: List[Any], same) -> Tuple[int, int, int]:
+    """(true positives, false positives, false negatives) with each truth item matched once."""
+    left, tp = list(truth), 0
+    for p in predicted:
+        hit = next((t for t in left if same(p, t)), None)
+        if hit is not None:
+            left.remove(hit)
+            tp += 1
+    return tp, len(predicted) - tp, len(left)
+
+
+def _f1(tp: int, fp: int, fn: int) -> float:
+    return round(2 * tp / (2 * tp + fp + fn), 3) if tp else 0.0
+
+
+def _prompt_text(pages: List[str], variant: str) -> str:
+    if variant == "before":
+        return " ".join("\n".join(pages).split())
+    if variant == "preprocessed":
+        pages = preprocess.strip_page_boilerplate(pages)
+    return ingest._clean("\n".join(pages))
+
+
+def run(style: str, turns: int, args) -> Dict[str, Any]:
+    out: Dict[str, Any] = {}
+    meetings = [fixtures.spoken_meeting(turns, style, seed=i) for i in range(args.meetings)]
+    for variant in ("before", "lines", "preprocessed"):
+        os.environ["PREPROCESS"] = "1" if variant == "preprocessed" else "0"
+        tokens_in, tokens_prompt, seconds = 0, 0, 0.0
+        counts = {"action_items": [0, 0, 0], "decisions": [0, 0, 0]}
+        for pages, truth in meetings:
+            text = _prompt_text(pages, variant)
+            tokens_in += preprocess.count_tokens("\n".join(pages))
+            start = time.perf_counter()
+            prompt = preprocess.for_prompt(text, record=False)
+            seconds += time.perf_counter() - start
+            tokens_prompt += preprocess.count_tokens(prompt)
+
+            result = pipeline.summarize_and_extract("Bench", text)
+            items = [(a.assignee, a.task) for a in result.action_items]
+            scores = {
+                "action_items": _match(items, truth["action_items"],
+                                       lambda p, t: p[0] == t[0] and _overlap(p[1], t[1]) >= 0.8),
+                "decisions": _match(result.decisions, truth["decisions"], _same_decision),
+            }
+            for field, s in scores.items():
+                counts[field] = [c + x for c, x in zip(counts[field], s)]
+        out[variant] = {
+            "tokens": tokens_prompt,
+            "ratio": round(tokens_prompt / tokens_in, 3),
+            "preprocess_ms_per_meeting": round(seconds * 1000 / len(meetings), 2),
+            "action_items_f1": _f1(*counts["action_items"]),
+            "decisions_f1": _f1(*counts["decisions"]),
+        }
+    base = out["before"]["tokens"]
+    for variant, r in out.items():
+        print(f"  {style:<8} {turns:>4} turns  {variant:<12} {r['tokens']:>8} tokens ({r['tokens'] / base:.0%})  "
+              f"action items F1 {r['action_items_f1']:.2f}  decisions F1 {r['decisions_f1']:.2f}  "
+              f"preprocess {r['preprocess_ms_per_meeting']:.1f} ms")
+    return out
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--styles", nargs="+", default=["diarized", "named", "pdf", "flattened"])
+    ap.add_argument("--turns", type=int, nargs="+", default=[80, 400])
+    ap.add_argument("--meetings", type=int, default=20, help="fixtures per style and length")
+    ap.add_argument("--json", help="write results to this file")
+    args = ap.parse_args(argv)
+
+    os.environ.update(LLM_PROVIDER="mock", LLM_CACHE_ENABLED="0")
+    tokenizer = os.getenv("TOKENIZER") or "chars/4 estimate"
+    print(f"{args.meetings} meetings per row, tokens: {tokenizer}")
+    results = {f"{style}-{turns}": run(style, turns, args) for style in args.styles for turns in args.turns}
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""
+Full-text search benchmark.
+
+Builds a throwaway database with N synthetic meetings and times search_meetings()
+for a mix of rare, common, multi-word and prefix queries: the first page, and a page deep
+in the results (--deep-offset, past the SEARCH_RANK_WINDOW ranking windows).
+
+    python -m bench.bench_search --meetings 100000 --budget-ms 50
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from app.core import storage
+from app.core.models import ActionItem, MeetingResult
+
+NAMES = ["Samir", "Tom", "Will", "Alice", "Bob", "Priya", "Chen", "Maria", "Jonas", "Aiko"]
+WORDS = (
+    "launch beta feedback roadmap budget hiring pricing migration onboarding security audit "
+    "release customer churn revenue forecast design review sprint backlog incident postmortem "
+    "latency database vendor contract marketing campaign analytics dashboard compliance legal "
+    "partner integration mobile desktop api billing invoice support escalation training offsite"
+).split()
+QUERIES = ["postmortem", "budget forecast", "Samir", "migration database", "launch", "invoi", "security audit legal", "zzzznotfound"]
+
+
+def synthetic_meeting(rng: random.Random, i: int) -> MeetingResult:
+    def sentence(n):
+        return " ".join(rng.choice(WORDS) for _ in range(n)).capitalize() + "."
+
+    return MeetingResult(
+        title=f"{rng.choice(WORDS).capitalize()} sync #{i}",
+        transcript="",
+        summary=" ".join(sentence(rng.randint(8, 16)) for _ in range(4)),
+        decisions=[sentence(6) for _ in range(rng.randint(0, 3))],
+        action_items=[
+            ActionItem(assignee=rng.choice(NAMES), task=sentence(5), due_date="—")
+            for _ in range(rng.randint(0, 4))
+        ],
+        created_at=f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T10:00:00",
+    )
+
+
+def populate(n: int, seed: int = 0):
+    rng = random.Random(seed)
+    storage.init_db()
+    con = storage.get_connection()
+    batch = 5000
+    for start in range(0, n, batch):
+        with con:
+            for i in range(start, min(n, start + batch)):
+                storage._insert_meeting(con, synthetic_meeting(rng, i))
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--meetings", type=int, default=100_000)
+    ap.add_argument("--repeat", type=int, default=20)
+    ap.add_argument("--deep-offset", type=int, default=10_000, help="offset of the deep page that is also timed")
+    ap.add_argument("--budget-ms", type=float, default=50.0, help="fail if any query's first-page p95 exceeds this")
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storage.DB_PATH = os.path.join(tmp, "bench.db")
+        t0 = time.perf_counter()
+        populate(args.meetings)
+        print(f"populated {args.meetings} meetings in {time.perf_counter() - t0:.1f}s "
+              f"({os.path.getsize(storage.DB_PATH) / 1e6:.1f} MB)")
+
+        worst = 0.0
+        for q in QUERIES:
+            timings = []
+            for _ in range(args.repeat):
+                t = time.perf_counter()
+                hits = storage.search_meetings(q, limit=20)
+                timings.append((time.perf_counter() - t) * 1000)
+            p50 = statistics.median(timings)
+            p95 = sorted(timings)[int(0.95 * (len(timings) - 1))]
+            worst = max(worst, p95)
+            deep = []
+            for _ in range(max(1, args.repeat // 4)):
+                t = time.perf_counter()
+                deep_hits = storage.search_meetings(q, limit=20, offset=args.deep_offset)
+                deep.append((time.perf_counter() - t) * 1000)
+            print(f"{q!r:28} hits={len(hits):3d}  p50={p50:7.2f}ms  p95={p95:7.2f}ms  "
+                  f"offset {args.deep_offset}: hits={len(deep_hits):3d} p50={statistics.median(deep):7.2f}ms")
+
+    if worst > args.budget_ms:
+        print(f"FAIL: worst p95 {worst:.2f}ms > budget {args.budget_ms}ms")
+        return 1
+    print(f"OK: worst p95 {worst:.2f}ms <= budget {args.budget_ms}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
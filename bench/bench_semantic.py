@@ -0,0 +1,136 @@
+"""
+Semantic index (app.core.semantic) at 100k+ items: build/append throughput, file size,
+top-k query latency, and recall.
+
+Items are synthetic action items / decisions: short sentences drawn mostly from one of a few
+hundred topics (a topic is a small vocabulary, like "pricing" or "database migration").
+Queries are paraphrases of random items: about a third of the words dropped, two unrelated
+words added, word order shuffled.
+- hit@k: the paraphrased item is among the top k
+- recall@k (int8): overlap of the int8 index's top k with an exact float32 search
+- update: re-indexing one meeting in a full index (marks old rows dead, appends; no rebuild)
+
+    python -m bench.bench_semantic
+    python -m bench.bench_semantic --items 100000 1000000 --queries 300
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+
+from app.core import semantic
+from bench.bench_search import NAMES, WORDS
+
+
+def _vocabulary(rng: random.Random, n: int) -> List[str]:
+    syllables = [c + v for c in "bcdfghklmnprstvz" for v in "aeiou"]
+    words = set(WORDS)
+    while len(words) < n:
+        words.add("".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+def corpus(n: int, seed: int = 0, topics: int = 400) -> List[str]:
+    rng = random.Random(seed)
+    vocab = _vocabulary(rng, 8000)
+    topic_words = [rng.sample(vocab, 25) for _ in range(topics)]
+    texts = []
+    for _ in range(n):
+        topic = topic_words[rng.randrange(topics)]
+        words = [rng.choice(topic) if rng.random() < 0.7 else rng.choice(vocab) for _ in range(rng.randint(6, 12))]
+        texts.append(f"{rng.choice(NAMES)} will " + " ".join(words))
+    return texts
+
+
+def paraphrase(rng: random.Random, text: str, vocab: List[str]) -> str:
+    words = [w for w in text.split() if rng.random() > 0.33] + rng.sample(vocab, 2)
+    rng.shuffle(words)
+    return " ".join(words)
+
+
+def _pct(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def build(directory: str, dtype: str, texts: List[str], dim: int, batch: int = 5000) -> Dict[str, Any]:
+    index = semantic.VectorIndex(directory, dim, dtype)
+    start = time.perf_counter()
+    for lo in range(0, len(texts), batch):
+        ids = list(range(lo, min(len(texts), lo + batch)))
+        index.add([2] * len(ids), ids, [i // 3 for i in ids], semantic.embed(texts[lo:lo + batch], dim))
+    elapsed = time.perf_counter() - start
+    return {"index": index, "build_items_per_s": round(len(texts) / elapsed), "file_mb": round(os.path.getsize(index.path) / 1e6, 1)}
+
+
+def run(n: int, args) -> Dict[str, Any]:
+    texts = corpus(n)
+    rng = random.Random(1)
+    vocab = _vocabulary(random.Random(0), 8000)
+    targets = [rng.randrange(n) for _ in range(args.queries)]
+    queries = semantic.embed([paraphrase(rng, texts[t], vocab) for t in targets], args.dim)
+    out: Dict[str, Any] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        exact: List[List[int]] = []
+        for dtype in ("float32", "int8"):
+            built = build(os.path.join(tmp, dtype), dtype, texts, args.dim)
+            index = built.pop("index")
+            latencies, hits, tops = [], 0, []
+            for t, q in zip(targets, queries):
+                start = time.perf_counter()
+                result = index.search(q, args.k)
+                latencies.append((time.perf_counter() - start) * 1000)
+                top = [item for _, item, _, _ in result]
+                hits += t in top
+                tops.append(top)
+            r = dict(built)
+            r.update({
+                "p50_ms": round(statistics.median(latencies), 2),
+                "p95_ms": round(_pct(latencies, 0.95), 2),
+                f"hit_at_{args.k}": round(hits / len(targets), 3),
+            })
+            if dtype == "float32":
+                exact = tops
+            else:
+                overlap = [len(set(a) & set(b)) / args.k for a, b in zip(tops, exact)]
+                r[f"recall_at_{args.k}_vs_float32"] = round(statistics.mean(overlap), 3)
+            # incremental update of one meeting in the full index
+            update_ms = []
+            for meeting in rng.sample(range(n // 3), 20):
+                start = time.perf_counter()
+                index.replace_meeting(meeting, [2, 2], [n + meeting, n + meeting + 1], semantic.embed(["a", "b"], args.dim))
+                update_ms.append((time.perf_counter() - start) * 1000)
+            r["update_meeting_ms"] = round(statistics.median(update_ms), 2)
+            out[dtype] = r
+            print(f"  {n:>8} items {dtype:<7} build {r['build_items_per_s']:>7}/s  {r['file_mb']:7.1f} MB  "
+                  f"top-{args.k} p50 {r['p50_ms']:7.2f} ms  p95 {r['p95_ms']:7.2f} ms  "
+                  f"hit@{args.k} {r[f'hit_at_{args.k}']:.1%}"
+                  + (f"  recall@{args.k} {r[f'recall_at_{args.k}_vs_float32']:.1%}" if dtype == "int8" else "")
+                  + f"  update {r['update_meeting_ms']:.1f} ms")
+    return out
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--items", type=int, nargs="+", default=[100_000])
+    ap.add_argument("--queries", type=int, default=200)
+    ap.add_argument("--k", type=int, default=10)
+    ap.add_argument("--dim", type=int, default=int(os.getenv("SEMANTIC_DIM", "256")))
+    ap.add_argument("--json", help="write results to this file")
+    args = ap.parse_args(argv)
+
+    results = {n: run(n, args) for n in args.items}
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,390 @@
+"""
+Offline benchmark suite for the ingest, chunking/parse, LLM and storage hot paths.
+
+Each stage runs in a fresh process (so its peak RSS is its own) and reports, per case,
+p50/p95 latency and throughput. Results can be saved as a baseline and later compared
+against it to catch regressions in ingest.py, llm.py, parse.py or storage.py.
+
+    python -m bench.bench_suite                                   # all stages, default sizes
+    python -m bench.bench_suite --stages parse,llm --save-baseline bench/baseline.json
+    python -m bench.bench_suite --compare bench/baseline.json --tolerance 0.25
+    python -m bench.bench_suite --stages storage --db-rows 10000,100000,1000000
+
+Baselines are machine-specific: record one on the machine you compare on.
+"""
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from bench import fixtures
+
+STAGES = ["parse", "ingest", "llm", "storage"]
+
+
+# --- Measurement helpers ---
+def _peak_rss_mb() -> float:
+    """Peak RSS of this process and its (reaped) children, e.g. OCR/whisper pool workers."""
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024  # ru_maxrss is bytes on macOS, KiB on Linux
+    peak = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    return round(peak / scale, 1)
+
+
+def measure(fn: Callable[[], Any], repeat: int, warmup: int = 1, items: float = 1.0, unit: str = "ops/s") -> Dict[str, Any]:
+    """Run fn warmup+repeat times; p50/p95 in ms and throughput as items per second at the median."""
+    for _ in range(warmup):
+        fn()
+    timings = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - t) * 1000)
+    timings.sort()
+    p50 = statistics.median(timings)
+    return {
+        "p50_ms": round(p50, 3),
+        "p95_ms": round(timings[max(0, math.ceil(0.95 * len(timings)) - 1)], 3),  # nearest rank
+        "throughput": round(items / (p50 / 1000), 2) if p50 else None,
+        "unit": unit,
+        "n": repeat,
+    }
+
+
+# --- Stages (each returns {case_name: result}) ---
+def stage_parse(args) -> Dict[str, Any]:
+    from app.core.chunking import split_transcript
+    from app.core.parse import coerce_json
+    from app.core.stream_parse import IncrementalJSONParser
+    from bench.mock_llm import fake_answer
+
+    out = {}
+    for size in args.sizes:
+        text = fixtures.transcript(size)
+        mb = len(text.encode()) / 1e6
+        out[f"split_transcript_{size}tok"] = measure(
+            lambda: split_transcript(text, 3000), args.repeat, items=mb, unit="MB/s"
+        )
+
+    for n_items in (10, 1000):
+        answer = fake_answer("\n".join(f"P{i}: x" for i in range(5)))
+        answer["action_items"] = answer["action_items"] * (n_items // 5 or 1)
+        valid = json.dumps(answer)
+        kb = len(valid) / 1e3
+        variants = {
+            "valid": valid,
+            "prose": f"Sure! Here you go:\n{valid}\nAnything else?",
+            "fenced": f"```json\n{valid}\n```",
+            "truncated": valid[: len(valid) * 2 // 3],
+        }
+        for kind, raw in variants.items():
+            out[f"coerce_json_{kind}_{n_items}items"] = measure(
+                lambda raw=raw: coerce_json(raw), args.repeat * 10, items=kb, unit="KB/s"
+            )
+
+        def stream_feed(raw=valid):
+            parser = IncrementalJSONParser()
+            for i in range(0, len(raw), 16):
+                parser.feed(raw[i:i + 16])
+
+        out[f"stream_parse_{n_items}items"] = measure(stream_feed, args.repeat, items=kb, unit="KB/s")
+    return out
+
+
+class _Upload:
+    """Minimal stand-in for an uploaded file (name + getvalue)."""
+
+    def __init__(self, name: str, data: bytes):
+        self.name = name
+        self._data = data
+
+    def getvalue(self) -> bytes:
+        return self._data
+
+
+def stage_ingest(args) -> Dict[str, Any]:
+    # Offline: a missing whisper model fails fast (audio case is skipped) instead of downloading
+    if not args.allow_download:
+        os.environ.setdefault("HF_HUB_OFFLINE", "1")
+    from app.core.ingest import extract_text_from_upload
+
+    out = {}
+    repeat = max(1, args.repeat // 4)
+
+    for size in args.sizes:
+        data = fixtures.transcript(size).encode()
+        out[f"txt_{size}tok"] = measure(
+            lambda: extract_text_from_upload(_Upload("t.txt", data)), repeat, items=len(data) / 1e6, unit="MB/s"
+        )
+
+    for pages in (5, 60):
+        data = fixtures.text_pdf(pages)
+        out[f"pdf_text_{pages}p"] = measure(
+            lambda: extract_text_from_upload(_Upload("t.pdf", data)), repeat, items=pages, unit="pages/s"
+        )
+
+    has_ocr = bool(shutil.which("tesseract") and shutil.which("pdftoppm"))
+    data = fixtures.scanned_pdf(3)
+    case = measure(lambda: extract_text_from_upload(_Upload("s.pdf", data)), repeat, items=3, unit="pages/s")
+    case["ocr"] = has_ocr  # without tesseract/poppler this only measures the text-layer probe
+    out["pdf_scanned_3p"] = case
+
+    data = fixtures.docx(2000)
+    out["docx_2000para"] = measure(
+        lambda: extract_text_from_upload(_Upload("t.docx", data)), repeat, items=2000, unit="para/s"
+    )
+
+    seconds = args.audio_seconds
+    data = fixtures.wav(seconds)
+    try:
+        out[f"audio_{seconds:.0f}s"] = measure(
+            lambda: extract_text_from_upload(_Upload("a.wav", data)), 1, warmup=1, items=seconds, unit="audio s/s"
+        )
+    except Exception as e:  # e.g. no whisper model available offline
+        out[f"audio_{seconds:.0f}s"] = {"skipped": repr(e)[:200]}
+    return out
+
+
+def stage_llm(args) -> Dict[str, Any]:
+    from bench.mock_llm import MockLLMServer
+
+    server = MockLLMServer(
+        latency_ms=args.llm_latency_ms,
+        jitter_ms=args.llm_jitter_ms,
+        token_ms=args.llm_token_ms,
+        malformed_rate=args.malformed_rate,
+        error_rate=args.error_rate,
+    ).start()
+    os.environ.update({
+        "LLM_PROVIDER": "cerebras",
+        "CEREBRAS_API_BASE": server.base_url,
+        "CEREBRAS_API_KEY": "bench",
+        "LLM_CACHE_ENABLED": "0",
+        "LLM_BACKOFF_BASE": "0.01",
+    })
+    from app.core import metrics
+    from app.core.pipeline import summarize_and_extract, summarize_and_extract_stream
+
+    out = {}
+    repeat = max(1, args.repeat // 4)
+    for size in args.sizes:
+        text = fixtures.transcript(size, seed=size)
+        out[f"summarize_{size}tok"] = measure(
+            lambda: summarize_and_extract("bench", text), repeat, items=size, unit="tok/s"
+        )
+
+    text = fixtures.transcript(args.sizes[0])
+    first = []
+
+    def stream():
+        t = time.perf_counter()
+        for i, _ in enumerate(summarize_and_extract_stream("bench", text)):
+            if i == 0:
+                first.append((time.perf_counter() - t) * 1000)
+
+    out["stream_small"] = measure(stream, repeat, items=1, unit="req/s")
+    out["stream_small"]["first_event_ms"] = round(statistics.median(first), 3)
+
+    n = args.concurrency * 4
+    texts = [fixtures.transcript(args.sizes[0], seed=i) for i in range(n)]
+
+    def burst():
+        with ThreadPoolExecutor(args.concurrency) as pool:
+            list(pool.map(lambda t: summarize_and_extract("bench", t), texts))
+
+    out[f"concurrent_{args.concurrency}x"] = measure(burst, 1, warmup=0, items=n, unit="req/s")
+
+    counters = metrics.snapshot()["counters"]
+    out["_counters"] = {
+        "requests": server.requests,
+        "parse_fallbacks": sum(v for k, v in counters.items() if k.startswith("parse_fallbacks_total")),
+        "retries": sum(v for k, v in counters.items() if k.startswith("llm_retries_total")),
+        "reask_fields": sum(v for k, v in counters.items() if k.startswith("llm_reask_fields_total")),
+        "prompt_tokens": sum(v for k, v in counters.items() if k.startswith("llm_prompt_tokens_total")),
+    }
+    server.stop()
+    return out
+
+
+def stage_storage(args, rows: int) -> Dict[str, Any]:
+    from app.core import storage
+    from app.core.models import ActionItem, MeetingResult
+    from bench.bench_search import populate
+
+    out = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        storage.DB_PATH = os.path.join(tmp, "bench.db")
+        t = time.perf_counter()
+        populate(rows)
+        elapsed = time.perf_counter() - t
+        out["populate"] = {"seconds": round(elapsed, 2), "throughput": round(rows / elapsed, 1), "unit": "rows/s",
+                           "db_mb": round(os.path.getsize(storage.DB_PATH) / 1e6, 1)}
+
+        rng = random.Random(1)
+        newest = storage.list_meetings(limit=1)[0]
+        middle = storage.get_meeting(rows // 2)
+        out["list_meetings_first_page"] = measure(lambda: storage.list_meetings(limit=50), args.repeat)
+        out["list_meetings_deep_page"] = measure(
+            lambda: storage.list_meetings(limit=50, before=(middle["created_at"], middle["id"])), args.repeat
+        )
+        out["get_meeting"] = measure(lambda: storage.get_meeting(rng.randint(1, rows)), args.repeat)
+        out["search_common"] = measure(lambda: storage.search_meetings("launch"), args.repeat)
+        out["search_rare"] = measure(lambda: storage.search_meetings("postmortem escalation"), args.repeat)
+        out["action_items_by_assignee"] = measure(lambda: storage.list_action_items(assignee="Samir", limit=50), args.repeat)
+        out["action_items_overdue"] = measure(lambda: storage.overdue_action_items("2025-06-01", limit=50), args.repeat)
+
+        meeting = MeetingResult(
+            title="Bench insert",
+            transcript=fixtures.transcript(2000),
+            summary="A new meeting about the launch.",
+            decisions=["Ship it"],
+            action_items=[ActionItem(assignee="Samir", task="Write notes", due_date="Friday")],
+            created_at=newest["created_at"],
+        )
+        out["save_meeting"] = measure(lambda: storage.save_meeting_result(meeting), args.repeat)
+    return out
+
+
+# --- Runner ---
+def _run_stage(name: str, args, rows: Optional[int], q):
+    try:
+        result = stage_storage(args, rows) if name == "storage" else globals()[f"stage_{name}"](args)
+        q.put(("ok", result, _peak_rss_mb()))
+    except BaseException as e:
+        q.put(("error", repr(e), _peak_rss_mb()))
+    finally:
+        if "app.core.ingest" in sys.modules:
+            # a child process joins its own children on exit; idle pool workers would block that
+            sys.modules["app.core.ingest"].shutdown_pools()
+
+
+def run_stage(name: str, args, rows: Optional[int] = None) -> Dict[str, Any]:
+    ctx = multiprocessing.get_context("spawn")
+    q = ctx.Queue()
+    p = ctx.Process(target=_run_stage, args=(name, args, rows, q))
+    p.start()
+    status, result, rss = q.get()
+    p.join()
+    if status != "ok":
+        return {"_error": result, "_peak_rss_mb": rss}
+    result["_peak_rss_mb"] = rss
+    return result
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Regressions: p95 (or peak RSS) up, or throughput down, by more than `tolerance`."""
+    problems = []
+    for stage, cases in current.items():
+        base_cases = baseline.get(stage) or {}
+        if "_peak_rss_mb" in cases and base_cases.get("_peak_rss_mb"):
+            if cases["_peak_rss_mb"] > base_cases["_peak_rss_mb"] * (1 + tolerance):
+                problems.append(f"{stage}: peak RSS {base_cases['_peak_rss_mb']} → {cases['_peak_rss_mb']} MB")
+        for case, res in cases.items():
+            base = base_cases.get(case)
+            if case.startswith("_") or not isinstance(res, dict) or not isinstance(base, dict):
+                continue
+            if res.get("p95_ms") and base.get("p95_ms") and res["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+                problems.append(f"{stage}/{case}: p95 {base['p95_ms']:.2f} → {res['p95_ms']:.2f} ms")
+            if res.get("throughput") and base.get("throughput") and res["throughput"] < base["throughput"] * (1 - tolerance):
+                problems.append(f"{stage}/{case}: throughput {base['throughput']} → {res['throughput']} {res.get('unit', '')}")
+    return problems
+
+
+def _print_stage(stage: str, cases: Dict[str, Any]):
+    print(f"\n== {stage} (peak RSS {cases.get('_peak_rss_mb', '?')} MB)")
+    if "_error" in cases:
+        print(f"   ERROR {cases['_error']}")
+    for case, res in cases.items():
+        if case.startswith("_") and case != "_counters":
+            continue
+        if "p50_ms" in res:
+            extra = "".join(f"  {k}={v}" for k, v in res.items() if k in ("first_event_ms", "ocr"))
+            print(f"   {case:34} p50={res['p50_ms']:9.2f}ms  p95={res['p95_ms']:9.2f}ms  "
+                  f"{res['throughput'] or 0:>10} {res['unit']}{extra}")
+        else:
+            print(f"   {case:34} {res}")
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--stages", default=",".join(STAGES), help=f"comma-separated subset of {STAGES}")
+    ap.add_argument("--sizes", default="1000,10000,50000", help="transcript sizes in estimated tokens")
+    ap.add_argument("--db-rows", default="10000", help="comma-separated meeting counts for the storage stage")
+    ap.add_argument("--repeat", type=int, default=20)
+    ap.add_argument("--audio-seconds", type=float, default=30.0)
+    ap.add_argument("--allow-download", action="store_true", help="let faster-whisper download its model")
+    ap.add_argument("--llm-latency-ms", type=float, default=200.0)
+    ap.add_argument("--llm-jitter-ms", type=float, default=50.0)
+    ap.add_argument("--llm-token-ms", type=float, default=0.0, help="delay per streamed delta")
+    ap.add_argument("--malformed-rate", type=float, default=0.1)
+    ap.add_argument("--error-rate", type=float, default=0.0, help="fraction of mock responses that are 429s")
+    ap.add_argument("--concurrency", type=int, default=8)
+    ap.add_argument("--json", help="write results to this file")
+    ap.add_argument("--save-baseline", help="write results as a baseline file")
+    ap.add_argument("--compare", help="compare against a baseline file; exit 1 on regression")
+    ap.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown before flagging")
+    args = ap.parse_args(argv)
+    args.sizes = [int(s) for s in args.sizes.split(",") if s]
+    stages = [s.strip() for s in args.stages.split(",") if s.strip()]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        ap.error(f"unknown stages: {sorted(unknown)}")
+
+    results: Dict[str, Any] = {}
+    for stage in stages:
+        if stage == "storage":
+            for rows in (int(r) for r in args.db_rows.split(",") if r):
+                results[f"storage_{rows}"] = run_stage("storage", args, rows)
+                _print_stage(f"storage_{rows}", results[f"storage_{rows}"])
+        else:
+            results[stage] = run_stage(stage, args)
+            _print_stage(stage, results[stage])
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "args": {k: v for k, v in vars(args).items() if k not in ("json", "save_baseline", "compare")},
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    for path in filter(None, (args.json, args.save_baseline)):
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nwrote {path}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline["meta"].get("platform") != report["meta"]["platform"]:
+            print("⚠️ baseline was recorded on a different platform; comparisons may be noisy")
+        changed = sorted(k for k, v in report["meta"]["args"].items() if baseline["meta"].get("args", {}).get(k) != v)
+        if changed:
+            print(f"⚠️ baseline used different settings for: {', '.join(changed)}")
+        problems = compare(results, baseline["results"], args.tolerance)
+        if problems:
+            print(f"\nREGRESSIONS (tolerance {args.tolerance:.0%}):")
+            for p in problems:
+                print(f"   {p}")
+            return 1
+        print(f"\nOK: no regressions beyond {args.tolerance:.0%} vs {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
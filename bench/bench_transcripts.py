@@ -0,0 +1,109 @@
+"""
+Database size and meeting detail-view latency with compressed, lazily loaded transcripts.
+
+Builds a throwaway database of N meetings with long synthetic transcripts (a share of them
+saved twice, like a re-uploaded recording) once per codec, then times:
+- detail view before: get_meeting() with the transcript read along (TRANSCRIPT_CODEC=none)
+- detail view now: get_meeting() without the transcript
+- get_transcript(): opening the transcript on demand (read + decompress)
+Duplicates are stored once with every codec, so the `none` size already includes the dedup saving.
+
+    python -m bench.bench_transcripts
+    python -m bench.bench_transcripts --meetings 2000 --tokens 20000 --dup-rate 0.1
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+from app.core import blobs, storage
+from app.core.models import ActionItem, MeetingResult
+from bench import fixtures
+
+
+def _timings(fn: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    samples: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {"p50_ms": round(statistics.median(samples), 3), "p95_ms": round(samples[int(0.95 * (len(samples) - 1))], 3)}
+
+
+def _populate(n: int, tokens: int, dup_rate: float, seed: int = 0):
+    rng = random.Random(seed)
+    texts = [fixtures.transcript(tokens, seed=i) for i in range(min(n, 50))]  # varied but cheap to generate
+    storage.init_db()
+    con = storage.get_connection()
+    with con:
+        for i in range(n):
+            if i and rng.random() < dup_rate:
+                text = texts[rng.randrange(len(texts))]  # saved again verbatim
+            else:
+                text = texts[i % len(texts)] + f"\nSamir: Meeting {i} wrap-up."
+            storage._insert_meeting(con, MeetingResult(
+                title=f"Meeting {i}",
+                transcript=text,
+                summary="Discussed the launch and the budget.",
+                decisions=["Ship the beta"],
+                action_items=[ActionItem(assignee="Samir", task="Send notes", due_date="Friday")],
+                created_at=f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T10:00:00",
+            ))
+    con.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+
+def run(codec: str, args) -> Dict[str, Any]:
+    os.environ["TRANSCRIPT_CODEC"] = codec
+    with tempfile.TemporaryDirectory() as tmp:
+        storage.DB_PATH = os.path.join(tmp, "bench.db")
+        storage._initialized = False
+        start = time.perf_counter()
+        _populate(args.meetings, args.tokens, args.dup_rate)
+        out: Dict[str, Any] = {
+            "populate_s": round(time.perf_counter() - start, 2),
+            "db_mb": round(os.path.getsize(storage.DB_PATH) / 1e6, 2),
+        }
+        rng = random.Random(1)
+        pick = lambda: rng.randint(1, args.meetings)  # noqa: E731
+        out["detail_with_transcript"] = _timings(lambda: storage.get_meeting(pick(), with_transcript=True), args.repeat)
+        out["detail_lazy"] = _timings(lambda: storage.get_meeting(pick()), args.repeat)
+        out["get_transcript"] = _timings(lambda: storage.get_transcript(pick()), args.repeat)
+        storage.get_connection().close()
+        storage._local.con = None
+    return out
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--meetings", type=int, default=1000)
+    ap.add_argument("--tokens", type=int, default=15000, help="approximate transcript length (~1 h of talk)")
+    ap.add_argument("--dup-rate", type=float, default=0.1)
+    ap.add_argument("--repeat", type=int, default=200)
+    ap.add_argument("--json", help="write results to this file")
+    args = ap.parse_args(argv)
+
+    codecs = ["none", "zlib"] + (["zstd"] if blobs._zstd() is not None else [])
+    results = {c: run(c, args) for c in codecs}
+    base = results["none"]
+    print(f"{args.meetings} meetings, ~{args.tokens} tokens each, {args.dup_rate:.0%} saved twice")
+    print(f"  before (uncompressed, transcript in detail view): {base['db_mb']:8.1f} MB  "
+          f"detail p50 {base['detail_with_transcript']['p50_ms']:.3f} ms")
+    for c in codecs:
+        r = results[c]
+        print(f"  {c:<5} {r['db_mb']:8.1f} MB ({r['db_mb'] / base['db_mb']:.0%})  "
+              f"detail p50 {r['detail_lazy']['p50_ms']:.3f} ms  "
+              f"open transcript p50 {r['get_transcript']['p50_ms']:.3f} ms / p95 {r['get_transcript']['p95_ms']:.3f} ms")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,228 @@
+"""
+Synthetic inputs for the benchmarks: transcripts, PDFs (text and scanned), DOCX and WAV.
+Everything is generated from a seed so runs are reproducible and nothing is checked in.
+"""
+import io
+import math
+import random
+import struct
+import wave
+from typing import Any, Dict, List, Tuple
+
+from bench.bench_search import NAMES, WORDS
+
+
+def transcript(n_tokens: int, seed: int = 0) -> str:
+    """Speaker-labelled transcript of roughly n_tokens (estimated at ~4 chars/token)."""
+    rng = random.Random(seed)
+    lines, chars = [], 0
+    while chars < n_tokens * 4:
+        words = " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 30)))
+        line = f"{rng.choice(NAMES)}: {words.capitalize()}."
+        if rng.random() < 0.1:
+            line += f" {rng.choice(NAMES)} will follow up by Friday."
+        lines.append(line)
+        chars += len(line) + 1
+    return "\n".join(lines)
+
+
+_TASKS = ["send the {} report", "draft the {} plan", "review the {} contract", "update the {} dashboard",
+          "schedule the {} review", "fix the {} incident", "prepare the {} budget", "call the {} vendor"]
+_FILLERS = ["um", "uh", "erm", "you know", "I mean"]
+
+
+def _disfluent(rng: random.Random, sentence: str) -> str:
+    """Spoken-style noise: fillers at the start or between words, a stuttered word now and then."""
+    words = sentence.split()
+    if rng.random() < 0.4:
+        words[0] = f"{rng.choice(_FILLERS).capitalize()}, {words[0][0].lower()}{words[0][1:]}"
+    if len(words) > 4 and rng.random() < 0.4:
+        i = rng.randrange(1, len(words) - 1)
+        words[i] = f"{words[i]}, {rng.choice(_FILLERS)},"
+    if rng.random() < 0.15:
+        i = rng.randrange(len(words))
+        if len(words[i].strip(".,")) <= 3:
+            words.insert(i, words[i])
+    return " ".join(words)
+
+
+def spoken_meeting(n_turns: int = 80, style: str = "diarized", seed: int = 0) -> Tuple[List[str], Dict[str, Any]]:
+    """
+    A noisy meeting with known answers: (pages, truth). truth = {"action_items": [(assignee, task)],
+    "decisions": [text]}. Styles:
+    - diarized: whisper + diarization output, one "Speaker N: [mm:ss] ..." line per segment,
+      backchannels ("Mm-hmm.", "Mm.") from other speakers, occasionally a segment transcribed
+      twice (same timestamp) or a looped "Thank you." artifact
+    - named: "Name: ..." lines with the same disfluencies, no timestamps
+    - pdf: named lines spread over pages with a running header and "Page i of n" footer
+    - flattened: named turns run together, two to four per line ("Alice: ... ship. Bob: I'll ..."),
+      as in pasted transcripts that lost their line breaks
+    Only the pdf style has more than one page.
+    """
+    rng = random.Random(seed)
+    people = rng.sample(NAMES, 4) if style != "diarized" else [f"Speaker {i}" for i in range(1, 5)]
+    truth: Dict[str, Any] = {"action_items": [], "decisions": []}
+    lines, t, speaker = [], 0, 0
+
+    stamp = ""
+
+    def emit(who: str, text: str, again: bool = False):
+        nonlocal t, stamp
+        if not again:  # a repeated segment keeps the timestamp it was first transcribed with
+            stamp = f"[{t // 60:02d}:{t % 60:02d}] " if style == "diarized" else ""
+            t += rng.randint(2, 9)
+        lines.append(f"{who}: {stamp}{text}")
+
+    for _ in range(n_turns):
+        speaker = rng.choice([i for i in range(len(people)) if i != speaker])
+        who = people[speaker]
+        for _ in range(rng.randint(1, 3)):  # whisper segments of one turn
+            r = rng.random()
+            if r < 0.08:
+                template = rng.choice(_TASKS)
+                task = template.format(rng.choice([w for w in WORDS if w not in template]))
+                owner = rng.choice(people) if style != "diarized" else who
+                sentence = f"I'll {task} by Friday." if owner == who else f"{owner} will {task} by Friday."
+                truth["action_items"].append((owner, task))
+            elif r < 0.12 and rng.random() < 0.3:
+                # units must survive preprocessing ("mm" is not a filler inside a sentence)
+                sentence = f"We agreed to use {rng.randint(2, 12)} mm {rng.choice(WORDS)} bolts, not {rng.randint(13, 20)} mm."
+                truth["decisions"].append(sentence)
+            elif r < 0.12:
+                sentence = f"We agreed to move the {rng.choice(WORDS)} {rng.choice(WORDS)} to the next sprint."
+                truth["decisions"].append(sentence)
+            else:
+                sentence = " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 18))).capitalize() + "."
+            text = _disfluent(rng, sentence)
+            emit(who, text)
+            if style == "diarized" and rng.random() < 0.05:
+                emit(who, text, again=True)  # the same segment twice across a chunk boundary
+            if style == "diarized" and rng.random() < 0.02:
+                emit(who, "Thank you. Thank you. Thank you. Thank you.")
+        if rng.random() < 0.2:
+            emit(people[(speaker + 1) % len(people)], rng.choice(["Mm-hmm.", "Uh-huh.", "Hmm.", "Mm."]))
+
+    if style == "flattened":
+        joined, i = [], 0
+        while i < len(lines):
+            n = rng.randint(2, 4)
+            joined.append(" ".join(lines[i:i + n]))
+            i += n
+        return ["\n".join(joined)], truth
+    if style != "pdf":
+        return ["\n".join(lines)], truth
+    per_page = 40
+    chunks = [lines[i:i + per_page] for i in range(0, len(lines), per_page)]
+    pages = [
+        "\n".join(["ACME Corp - Weekly Sync - Confidential", *chunk, f"Page {i + 1} of {len(chunks)}"])
+        for i, chunk in enumerate(chunks)
+    ]
+    return pages, truth
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def text_pdf(n_pages: int, lines_per_page: int = 45, seed: int = 0) -> bytes:
+    """Minimal multi-page PDF with a real text layer (Helvetica), written by hand."""
+    rng = random.Random(seed)
+    objects: List[bytes] = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    catalog = add(b"")  # filled in once the page tree exists
+    pages = add(b"")
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    kids = []
+    for _ in range(n_pages):
+        rows = [
+            f"{rng.choice(NAMES)}: " + " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 12)))
+            for _ in range(lines_per_page)
+        ]
+        stream = "BT /F1 10 Tf 50 790 Td 16 TL " + " ".join(f"({_pdf_escape(r)}) Tj T*" for r in rows) + " ET"
+        data = stream.encode("latin-1")
+        content = add(b"<< /Length %d >>\nstream\n" % len(data) + data + b"\nendstream")
+        kids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>" % (pages, font, content)
+        ))
+    objects[catalog - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % pages
+    objects[pages - 1] = (
+        b"<< /Type /Pages /Kids [" + b" ".join(b"%d 0 R" % k for k in kids) + b"] /Count %d >>" % len(kids)
+    )
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for i, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % i + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for off in offsets:
+        out.write(b"%010d 00000 n \n" % off)
+    out.write(b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog, xref))
+    return out.getvalue()
+
+
+def scanned_pdf(n_pages: int, seed: int = 0) -> bytes:
+    """Image-only PDF (no text layer), like a scanned document; forces the OCR path."""
+    from PIL import Image, ImageDraw
+
+    rng = random.Random(seed)
+    images = []
+    for _ in range(n_pages):
+        img = Image.new("L", (1240, 1754), 255)  # A4 at 150 dpi
+        draw = ImageDraw.Draw(img)
+        for row in range(40):
+            text = f"{rng.choice(NAMES)}: " + " ".join(rng.choice(WORDS) for _ in range(8))
+            draw.text((80, 80 + row * 40), text, fill=0)
+        images.append(img)
+    buf = io.BytesIO()
+    images[0].save(buf, "PDF", save_all=True, append_images=images[1:], resolution=150)
+    return buf.getvalue()
+
+
+def docx(n_paragraphs: int, seed: int = 0) -> bytes:
+    from docx import Document
+
+    rng = random.Random(seed)
+    doc = Document()
+    for _ in range(n_paragraphs):
+        doc.add_paragraph(f"{rng.choice(NAMES)}: " + " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 30))))
+    buf = io.BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+
+def wav(seconds: float, sample_rate: int = 16000, seed: int = 0) -> bytes:
+    """
+    16-bit mono WAV of speech-like bursts (modulated tones, 0.5–3s) separated by silences,
+    so VAD-based splitting has realistic gaps to cut on.
+    """
+    rng = random.Random(seed)
+    n = int(seconds * sample_rate)
+    samples = bytearray()
+    t = 0
+    while t < n:
+        burst = int(rng.uniform(0.5, 3.0) * sample_rate)
+        freq = rng.uniform(120, 300)
+        for i in range(min(burst, n - t)):
+            env = math.sin(math.pi * i / burst)
+            v = env * (0.5 * math.sin(2 * math.pi * freq * i / sample_rate)
+                       + 0.2 * math.sin(2 * math.pi * 3 * freq * i / sample_rate))
+            samples += struct.pack("<h", int(v * 12000))
+        t += burst
+        gap = min(int(rng.uniform(0.3, 1.5) * sample_rate), max(0, n - t))
+        samples += b"\x00\x00" * gap
+        t += gap
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(sample_rate)
+        w.writeframes(bytes(samples))
+    return buf.getvalue()
@@ -0,0 +1,185 @@
+"""
+Local mock of an OpenAI-style `/chat/completions` endpoint for offline benchmarks.
+
+- Configurable latency (mean ± jitter) per request, plus per-delta delay when streaming;
+  a fraction of requests (tail_rate) can take tail_ms longer, to model slow outliers
+- A fraction of answers are malformed (prose-wrapped, fenced or truncated JSON) to exercise
+  the parse fallbacks, and a fraction can be 429s to exercise retries
+- Answers are derived deterministically from the prompt (speaker names → action items) and
+  limited to the fields of a `response_format` JSON schema when one is sent; with
+  structured_output=False such requests get a 400, like endpoints without structured output
+
+    python -m bench.mock_llm --port 8765 --latency-ms 800 --malformed-rate 0.1
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict
+
+_SPEAKER_RE = re.compile(r"^([A-Z][\w'\-]*):", re.MULTILINE)
+
+
+def fake_answer(prompt: str) -> Dict[str, Any]:
+    speakers = list(dict.fromkeys(_SPEAKER_RE.findall(prompt)))[:5]
+    words = prompt.split()
+    return {
+        "summary": " ".join(words[-40:]) if words else "",
+        "decisions": [f"Decision about {w}" for w in words[-3:]],
+        "action_items": [
+            {"assignee": s, "task": f"Follow up on item {i}", "due_date": "Friday"}
+            for i, s in enumerate(speakers)
+        ],
+        "important_dates": ["Oct 3: review"],
+        "other_notes": [],
+    }
+
+
+class MockLLMServer:
+    def __init__(
+        self,
+        port: int = 0,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        token_ms: float = 0.0,
+        malformed_rate: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+        structured_output: bool = True,
+        tail_rate: float = 0.0,
+        tail_ms: float = 0.0,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.token_ms = token_ms
+        self.malformed_rate = malformed_rate
+        self.error_rate = error_rate
+        self.structured_output = structured_output
+        self.tail_rate = tail_rate
+        self.tail_ms = tail_ms
+        self.requests = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._server.daemon_threads = True
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def start(self) -> "MockLLMServer":
+        threading.Thread(target=self._server.serve_forever, name="mock-llm", daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _roll(self):
+        with self._lock:
+            self.requests += 1
+            return self._rng.random(), self._rng.random(), self._rng.uniform(-1, 1), self._rng.random()
+
+    def _content(self, prompt: str, malformed: bool, kind: float, fields=None) -> str:
+        answer = fake_answer(prompt)
+        if fields:
+            answer = {k: answer.get(k, "") for k in fields}
+        text = json.dumps(answer)
+        if not malformed:
+            return text
+        if kind < 1 / 3:
+            return f"Sure! Here is the summary:\n{text}\nLet me know if you need more."
+        if kind < 2 / 3:
+            return f"```json\n{text}\n```"
+        return text[: len(text) * 2 // 3]  # truncated mid-answer
+
+    def _handler(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+                err_roll, bad_roll, jitter, tail_roll = mock._roll()
+                tail = mock.tail_ms if tail_roll < mock.tail_rate else 0.0
+                time.sleep(max(0.0, mock.latency_ms + jitter * mock.jitter_ms + tail) / 1000.0)
+                if err_roll < mock.error_rate:
+                    self._send(429, b'{"error": "rate limited"}', {"Retry-After": "0"})
+                    return
+                fmt = body.get("response_format") or {}
+                if fmt and not mock.structured_output:
+                    self._send(400, b'{"error": "response_format is not supported"}')
+                    return
+                fields = list(((fmt.get("json_schema") or {}).get("schema") or {}).get("properties") or [])
+                prompt = (body.get("messages") or [{}])[-1].get("content", "")
+                content = mock._content(prompt, bad_roll < mock.malformed_rate, (bad_roll * 997) % 1, fields)
+                if body.get("stream"):
+                    self._stream(content)
+                    return
+                out = {
+                    "choices": [{"message": {"role": "assistant", "content": content}}],
+                    "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(content) // 4},
+                }
+                self._send(200, json.dumps(out).encode())
+
+            def _send(self, status: int, data: bytes, headers: Dict[str, str] = None):
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for k, v in (headers or {}).items():
+                    self.send_header(k, v)
+                self.end_headers()
+                try:
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    self.close_connection = True  # the client gave up (e.g. a hedged request lost)
+
+            def _stream(self, content: str):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                for i in range(0, len(content), 16):
+                    delta = {"choices": [{"delta": {"content": content[i:i + 16]}}]}
+                    self.wfile.write(f"data: {json.dumps(delta)}\n\n".encode())
+                    if mock.token_ms:
+                        time.sleep(mock.token_ms / 1000.0)
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.close_connection = True
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--latency-ms", type=float, default=500)
+    ap.add_argument("--jitter-ms", type=float, default=100)
+    ap.add_argument("--token-ms", type=float, default=0)
+    ap.add_argument("--malformed-rate", type=float, default=0.0)
+    ap.add_argument("--error-rate", type=float, default=0.0)
+    ap.add_argument("--no-structured-output", action="store_true", help="reject requests with response_format")
+    ap.add_argument("--tail-rate", type=float, default=0.0, help="fraction of requests that are slow outliers")
+    ap.add_argument("--tail-ms", type=float, default=0.0, help="extra latency of a slow outlier")
+    args = ap.parse_args(argv)
+    server = MockLLMServer(args.port, args.latency_ms, args.jitter_ms, args.token_ms,
+                           args.malformed_rate, args.error_rate,
+                           structured_output=not args.no_structured_output,
+                           tail_rate=args.tail_rate, tail_ms=args.tail_ms).start()
+    print(f"mock /chat/completions on {server.base_url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()